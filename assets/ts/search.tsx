@@ -0,0 +1,399 @@
+interface pageData {
+    path: string,
+    title: string,
+    date: string,
+    permalink: string,
+    content: string,
+    image?: string,
+    preview: string,
+    matchCount: number
+}
+
+/**
+ * Sharded inverted index built by scripts/build-search-index.py
+ * manifest.json: pages (path in content/ + summary) and shard hashes
+ * <prefix>.json: { term: [doc, score, doc, score, ...] }
+ */
+interface indexManifest {
+    prefix_length: number,
+    min_length: number,
+    docs: { path: string, summary: string }[],
+    shards: { [prefix: string]: string }
+}
+
+type indexShard = { [term: string]: number[] };
+
+/// Same normalization as the indexer: lowercase, no accents
+function normalize(str: string) {
+    return str.normalize('NFD').replace(/[\u0300-\u036f]/g, '').toLowerCase();
+}
+
+interface match {
+    start: number,
+    end: number
+}
+
+/**
+ * Escape HTML tags as HTML entities
+ * Edited from:
+ * @link https://stackoverflow.com/a/5499821
+ */
+const tagsToReplace = {
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    '…': '&hellip;'
+};
+
+function replaceTag(tag) {
+    return tagsToReplace[tag] || tag;
+}
+
+function replaceHTMLEnt(str) {
+    return str.replace(/[&<>"]/g, replaceTag);
+}
+
+function escapeRegExp(string) {
+    return string.replace(/[.*+\-?^${}()|[\]\\]/g, '\\$&');
+}
+
+class Search {
+    private data: pageData[];
+    private manifest: indexManifest;
+    private shards: { [prefix: string]: Promise<indexShard> } = {};
+    private form: HTMLFormElement;
+    private input: HTMLInputElement;
+    private list: HTMLDivElement;
+    private resultTitle: HTMLHeadElement;
+    private resultTitleTemplate: string;
+
+    constructor({ form, input, list, resultTitle, resultTitleTemplate }) {
+        this.form = form;
+        this.input = input;
+        this.list = list;
+        this.resultTitle = resultTitle;
+        this.resultTitleTemplate = resultTitleTemplate;
+
+        /// Check if there's already value in the search input
+        if (this.input.value.trim() !== '') {
+            this.doSearch(this.input.value.split(' '));
+        }
+        else {
+            this.handleQueryString();
+        }
+
+        this.bindQueryStringChange();
+        this.bindSearchForm();
+    }
+
+    /**
+     * Processes search matches
+     * @param str original text
+     * @param matches array of matches
+     * @param ellipsis whether to add ellipsis to the end of each match
+     * @param charLimit max length of preview string
+     * @param offset how many characters before and after the match to include in preview
+     * @returns preview string
+     */
+    private static processMatches(str: string, matches: match[], ellipsis: boolean = true, charLimit = 140, offset = 20): string {
+        matches.sort((a, b) => {
+            return a.start - b.start;
+        });
+
+        let i = 0,
+            lastIndex = 0,
+            charCount = 0;
+
+        const resultArray: string[] = [];
+
+        while (i < matches.length) {
+            const item = matches[i];
+
+            /// item.start >= lastIndex (equal only for the first iteration)
+            /// because of the while loop that comes after, iterating over variable j
+
+            if (ellipsis && item.start - offset > lastIndex) {
+                resultArray.push(`${replaceHTMLEnt(str.substring(lastIndex, lastIndex + offset))} [...] `);
+                resultArray.push(`${replaceHTMLEnt(str.substring(item.start - offset, item.start))}`);
+                charCount += offset * 2;
+            }
+            else {
+                /// If the match is too close to the end of last match, don't add ellipsis
+                resultArray.push(replaceHTMLEnt(str.substring(lastIndex, item.start)));
+                charCount += item.start - lastIndex;
+            }
+
+            let j = i + 1,
+                end = item.end;
+
+            /// Include as many matches as possible
+            /// [item.start, end] is the range of the match
+            while (j < matches.length && matches[j].start <= end) {
+                end = Math.max(matches[j].end, end);
+                ++j;
+            }
+
+            resultArray.push(`<mark>${replaceHTMLEnt(str.substring(item.start, end))}</mark>`);
+            charCount += end - item.start;
+
+            i = j;
+            lastIndex = end;
+
+            if (ellipsis && charCount > charLimit) break;
+        }
+
+        /// Add the rest of the string
+        if (lastIndex < str.length) {
+            let end = str.length;
+            if (ellipsis) end = Math.min(end, lastIndex + offset);
+
+            resultArray.push(`${replaceHTMLEnt(str.substring(lastIndex, end))}`);
+
+            if (ellipsis && end != str.length) {
+                resultArray.push(` [...]`);
+            }
+        }
+
+        return resultArray.join('');
+    }
+
+    private async searchKeywords(keywords: string[]) {
+        const rawData = await this.getData();
+        const manifest = this.manifest;
+
+        const terms = Array.from(new Set(keywords
+            .flatMap(keyword => normalize(keyword).match(/[a-z0-9]+/g) || [])
+            .filter(term => term.length >= manifest.min_length)));
+        if (terms.length === 0) return [];
+
+        /// Score per document; a document must match every term (prefix match)
+        let scores: Map<number, number> = null;
+        for (const term of terms) {
+            const shard = await this.getShard(term.substring(0, manifest.prefix_length));
+            const termScores = new Map<number, number>();
+
+            for (const indexed in shard) {
+                if (!indexed.startsWith(term)) continue;
+                /// Exact matches rank above longer words sharing the prefix
+                const boost = indexed === term ? 2 : 1;
+                const postings = shard[indexed];
+                for (let i = 0; i < postings.length; i += 2) {
+                    termScores.set(postings[i], (termScores.get(postings[i]) || 0) + postings[i + 1] * boost);
+                }
+            }
+
+            if (scores === null) {
+                scores = termScores;
+            }
+            else {
+                for (const doc of Array.from(scores.keys())) {
+                    if (termScores.has(doc)) scores.set(doc, scores.get(doc) + termScores.get(doc));
+                    else scores.delete(doc);
+                }
+            }
+            if (scores.size === 0) return [];
+        }
+
+        const byPath = new Map(rawData.map(item => [item.path, item] as [string, pageData]));
+        const regex = new RegExp(terms.map(escapeRegExp).join('|'), 'gi');
+        const results: pageData[] = [];
+
+        for (const [doc, score] of Array.from(scores.entries())) {
+            const indexed = manifest.docs[doc];
+            const item = indexed && byPath.get(indexed.path);
+            /// Pages outside mainSections or hidden are not in search.json
+            if (!item) continue;
+
+            const result = {
+                ...item,
+                content: indexed.summary,
+                preview: '',
+                matchCount: score
+            };
+
+            const titleMatches: match[] = [],
+                contentMatches: match[] = [];
+
+            for (const match of Array.from(normalize(item.title).matchAll(regex))) {
+                titleMatches.push({ start: match.index, end: match.index + match[0].length });
+            }
+            for (const match of Array.from(normalize(indexed.summary).matchAll(regex))) {
+                contentMatches.push({ start: match.index, end: match.index + match[0].length });
+            }
+
+            if (titleMatches.length > 0) result.title = Search.processMatches(result.title, titleMatches, false);
+            if (contentMatches.length > 0) {
+                result.preview = Search.processMatches(result.content, contentMatches);
+            }
+            else {
+                result.preview = replaceHTMLEnt(result.content.substring(0, 140));
+            }
+
+            results.push(result);
+        }
+
+        /// Higher score appears first
+        return results.sort((a, b) => {
+            return b.matchCount - a.matchCount;
+        });
+    }
+
+    private getShard(prefix: string): Promise<indexShard> {
+        const hash = this.manifest.shards[prefix];
+        if (!hash) return Promise.resolve({});
+
+        if (!this.shards[prefix]) {
+            /// Loaded once per page view, only for the prefixes actually typed
+            const indexURL = this.form.dataset.index;
+            this.shards[prefix] = fetch(`${indexURL}${prefix}.json?v=${hash}`)
+                .then(res => res.json())
+                .catch(() => {
+                    delete this.shards[prefix];
+                    return {};
+                });
+        }
+
+        return this.shards[prefix];
+    }
+
+    private async doSearch(keywords: string[]) {
+        const startTime = performance.now();
+
+        const results = await this.searchKeywords(keywords);
+        this.clear();
+
+        for (const item of results) {
+            this.list.append(Search.render(item));
+        }
+
+        const endTime = performance.now();
+
+        this.resultTitle.innerText = this.generateResultTitle(results.length, ((endTime - startTime) / 1000).toPrecision(1));
+    }
+
+    private generateResultTitle(resultLen, time) {
+        return this.resultTitleTemplate.replace("#PAGES_COUNT", resultLen).replace("#TIME_SECONDS", time);
+    }
+
+    public async getData() {
+        if (!this.data) {
+            /// Not fetched yet: page metadata (Hugo) and index manifest, in parallel
+            const jsonURL = this.form.dataset.json;
+            const indexURL = this.form.dataset.index;
+            [this.data, this.manifest] = await Promise.all([
+                fetch(jsonURL).then(res => res.json()),
+                fetch(`${indexURL}manifest.json`, { cache: 'no-cache' }).then(res => res.json())
+            ]);
+        }
+
+        return this.data;
+    }
+
+    private bindSearchForm() {
+        let lastSearch = '';
+
+        const eventHandler = (e) => {
+            e.preventDefault();
+            const keywords = this.input.value.trim();
+
+            Search.updateQueryString(keywords, true);
+
+            if (keywords === '') {
+                lastSearch = '';
+                return this.clear();
+            }
+
+            if (lastSearch === keywords) return;
+            lastSearch = keywords;
+
+            this.doSearch(keywords.split(' '));
+        }
+
+        this.input.addEventListener('input', eventHandler);
+        this.input.addEventListener('compositionend', eventHandler);
+    }
+
+    private clear() {
+        this.list.innerHTML = '';
+        this.resultTitle.innerText = '';
+    }
+
+    private bindQueryStringChange() {
+        window.addEventListener('popstate', (e) => {
+            this.handleQueryString()
+        })
+    }
+
+    private handleQueryString() {
+        const pageURL = new URL(window.location.toString());
+        const keywords = pageURL.searchParams.get('keyword');
+        this.input.value = keywords;
+
+        if (keywords) {
+            this.doSearch(keywords.split(' '));
+        }
+        else {
+            this.clear()
+        }
+    }
+
+    private static updateQueryString(keywords: string, replaceState = false) {
+        const pageURL = new URL(window.location.toString());
+
+        if (keywords === '') {
+            pageURL.searchParams.delete('keyword')
+        }
+        else {
+            pageURL.searchParams.set('keyword', keywords);
+        }
+
+        if (replaceState) {
+            window.history.replaceState('', '', pageURL.toString());
+        }
+        else {
+            window.history.pushState('', '', pageURL.toString());
+        }
+    }
+
+    public static render(item: pageData) {
+        return <article>
+            <a href={item.permalink}>
+                <div class="article-details">
+                    <h2 class="article-title" dangerouslySetInnerHTML={{ __html: item.title }}></h2>
+                    <section class="article-preview" dangerouslySetInnerHTML={{ __html: item.preview }}></section>
+                </div>
+                {item.image &&
+                    <div class="article-image">
+                        <img src={item.image} loading="lazy" />
+                    </div>
+                }
+            </a>
+        </article>;
+    }
+}
+
+declare global {
+    interface Window {
+        searchResultTitleTemplate: string;
+    }
+}
+
+window.addEventListener('load', () => {
+    setTimeout(function () {
+        const searchForm = document.querySelector('.search-form') as HTMLFormElement,
+            searchInput = searchForm.querySelector('input') as HTMLInputElement,
+            searchResultList = document.querySelector('.search-result--list') as HTMLDivElement,
+            searchResultTitle = document.querySelector('.search-result--title') as HTMLHeadingElement;
+
+        new Search({
+            form: searchForm,
+            input: searchInput,
+            list: searchResultList,
+            resultTitle: searchResultTitle,
+            resultTitleTemplate: window.searchResultTitleTemplate
+        });
+    }, 0);
+})
+
+export default Search;
\ No newline at end of file
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Script pour ajouter AUTOMATIQUEMENT un nouveau challenge Root-Me.
-Usage: ./add-challenge.py <URL_DU_CHALLENGE>
+Usage: ./add-challenge.py <URL_DU_CHALLENGE> [--profile[=DOSSIER]]
 
 Ce script va :
 1. Récupérer l'ID et le titre du challenge depuis l'URL
@@ -13,11 +13,16 @@ Ce script va :
 import sys
 import re
 import os
+import contextlib
 import json
 import urllib.request
 import urllib.error
 from pathlib import Path
 import unicodedata
+from records import ScenarioRecord
+from data_store import DataStore
+import front_matter
+from circuit_breaker import BreakerRegistry, print_transition
 
 # Chemins
 SCRIPT_DIR = Path(__file__).parent
@@ -25,6 +30,16 @@ ROOT_DIR = SCRIPT_DIR.parent
 FETCH_SCRIPT = SCRIPT_DIR / "fetch-rootme.py"
 CONTENT_DIR = ROOT_DIR / "content" / "root-me-challenges"
 ENV_FILE = ROOT_DIR / ".env"
+DEFAULT_PROFILE_DIR = ROOT_DIR / ".debug" / "profile" / "add-challenge"
+
+# Profilage par phase (--profile) : PhaseProfiler de profiling.py, sinon None
+PROFILER = None
+
+
+def profile_phase(name):
+    """Délimite une phase pour --profile (sans effet hors profilage)."""
+    return PROFILER.phase(name) if PROFILER else contextlib.nullcontext()
+
 
 def load_env():
     """Charge les variables d'environnement depuis .env s'il existe."""
@@ -57,8 +72,33 @@ def build_rootme_cookies(env):
 ROOTME_COOKIES = build_rootme_cookies(ENV)
 USE_API_DETAILS = (os.environ.get("ROOTME_USE_API_DETAILS") or ENV.get("ROOTME_USE_API_DETAILS", "0")) == "1"
 
-CHALLENGES_FILE = ROOT_DIR / "data" / "rootme_challenges.json"
-SADSERVERS_DATA_FILE = ROOT_DIR / "data" / "sadservers_scenarios.json"
+DATA_DIR = ROOT_DIR / "data"
+# Modifications de frontmatter en attente, appliquées en une passe par fichier (apply_frontmatter_edits)
+FRONTMATTER_EDITS = front_matter.Batch()
+SADSERVERS_DATA_FILE = DATA_DIR / "sadservers_scenarios.json"
+
+# Disjoncteurs par hôte (Root-Me, API, SadServers) : un hôte en panne échoue sans attendre le timeout
+BREAKERS = BreakerRegistry(on_transition=print_transition)
+
+
+def urlopen_guarded(req, timeout=None):
+    """urllib.request.urlopen sous disjoncteur ; lève CircuitOpenError (URLError) si l'hôte est coupé."""
+    breaker = BREAKERS.for_url(req.full_url)
+    breaker.check()
+    try:
+        response = urllib.request.urlopen(req, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        retry_after = e.headers.get("Retry-After") if e.headers is not None else None
+        breaker.record_status(e.code, int(retry_after) if retry_after and retry_after.isdigit() else None)
+        raise
+    except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+        breaker.record_failure(type(e).__name__)
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_status(response.status)
+    return response
 
 # Templates SadServers
 SADSERVERS_TEMPLATE_FR = '''---
@@ -222,13 +262,14 @@ tags: {tags}
 '''
 
 
-def load_challenges():
-    if CHALLENGES_FILE.exists():
-        with open(CHALLENGES_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
+_DATA_STORE = None
 
-ROOTME_CHALLENGES = load_challenges()
+def data_store():
+    """Base locale (data_store.py) : challenges, scénarios et profil, recherches indexées."""
+    global _DATA_STORE
+    if _DATA_STORE is None:
+        _DATA_STORE = DataStore(DATA_DIR)
+    return _DATA_STORE
 
 def strip_html_tags(text):
     """Supprime tous les tags HTML d'un texte."""
@@ -251,12 +292,17 @@ def fetch_sadservers_data(slug):
         req = urllib.request.Request(url)
         req.add_header('User-Agent', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
         
-        with urllib.request.urlopen(req, timeout=30) as response:
+        with urlopen_guarded(req, timeout=30) as response:
             html = response.read().decode('utf-8')
     except urllib.error.URLError as e:
         print(f"❌ Erreur lors de la récupération: {e}")
         return None
     
+    with profile_phase("parse"):
+        return parse_sadservers_html(html, url)
+
+def parse_sadservers_html(html, url):
+    """Extrait un ScenarioRecord depuis le HTML de sadservers.com."""
     scenario = {"url": url}
     
     # Titre (Scenario:)
@@ -312,46 +358,27 @@ def fetch_sadservers_data(slug):
     if time_match:
         scenario["time_to_solve"] = time_match.group(1).strip().rstrip('.')
     
-    return scenario
-
-def update_frontmatter(file_path, key, value):
-    """Met à jour une clé dans le front matter d'un fichier existant."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Check YAML separator
-        if not content.startswith('---'):
-            return False
-
-        # Regex pour trouver la clé dans le bloc YAML
-        pattern = re.compile(f'^{key}:.*$', re.MULTILINE)
-        
-        if pattern.search(content):
-            # Update existing key
-            new_content = pattern.sub(f'{key}: {value}', content)
-        else:
-            # Insert new key after 'draft:' or 'date:'
-            # On cherche la fin du bloc YAML
-            parts = content.split('---', 2)
-            if len(parts) < 3: return False
-            
-            front_matter = parts[1]
-            if f"{key}:" not in front_matter:
-                # Insert before the last line of front matter or specific tag
-                if "draft:" in front_matter:
-                    front_matter = front_matter.replace("draft: false", f"draft: false\n{key}: {value}").replace("draft: true", f"draft: true\n{key}: {value}")
-                else:
-                    front_matter += f"\n{key}: {value}"
-            
-            new_content = '---' + front_matter + '---' + parts[2]
-            
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        return True
-    except Exception as e:
-        print(f"Erreur update frontmatter: {e}")
-        return False
+    return ScenarioRecord.from_dict(scenario)
+
+def queue_frontmatter_edits(path, updates):
+    """Met en attente les mises à jour d'en-tête de `path` (clés autorisées par should_update_frontmatter)."""
+    def apply_updates(fm):
+        changed = []
+        for key, value in updates.items():
+            if should_update_frontmatter(key, fm.raw(key) or ""):
+                if fm.set_raw(key, format_frontmatter_value(key, value)):
+                    changed.append(key)
+        return changed
+    FRONTMATTER_EDITS.edit(path, apply_updates)
+
+
+def apply_frontmatter_edits():
+    """Applique en une passe par fichier les modifications de frontmatter en attente et affiche le bilan."""
+    if not len(FRONTMATTER_EDITS):
+        return
+    result = FRONTMATTER_EDITS.apply()
+    for line in result.lines(root=ROOT_DIR):
+        print(line)
 
 def create_sadservers_content(slug, scenario):
     """Crée les fichiers markdown pour SadServers."""
@@ -362,21 +389,16 @@ def create_sadservers_content(slug, scenario):
     scenario_dir.mkdir(parents=True, exist_ok=True)
     
     # Générer le titre slug-friendly
-    title = scenario.get("titre", slug.replace("-", " ").title())
+    title = scenario.titre or slug.replace("-", " ").title()
     title = title.replace('"', '\\"') # Escape quotes for YAML
     
     from datetime import datetime, timedelta
     # On met la date d'hier pour éviter les soucis de timezone (GitHub Actions en retard = post futur = non publié)
     date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-    tags_str = json.dumps(scenario.get("tags", []))
+    tags_str = json.dumps(scenario.tags or [])
     
     # Reading Time (integer from Time to Solve)
-    reading_time = "5" # default fallback
-    if scenario.get("time_to_solve"):
-        import re
-        m = re.search(r'(\d+)', scenario["time_to_solve"])
-        if m:
-            reading_time = m.group(1)
+    reading_time = str(scenario.minutes) if scenario.minutes else "5" # default fallback
 
     # Fichier FR
     fr_file = scenario_dir / "index.md"
@@ -395,8 +417,8 @@ def create_sadservers_content(slug, scenario):
         print(f"⚠️ Fichier existe déjà: {fr_file}")
         # Update reading_time if missing or different
         if reading_time:
-            update_frontmatter(fr_file, "reading_time", reading_time)
-            print(f"   🔄 Reading time mis à jour: {reading_time}")
+            FRONTMATTER_EDITS.set_raw(fr_file, "reading_time", reading_time, after="draft")
+            print(f"   🔄 Reading time à mettre à jour: {reading_time}")
     
     # Fichier EN
     en_file = scenario_dir / "index.en.md"
@@ -414,21 +436,17 @@ def create_sadservers_content(slug, scenario):
     else:
         print(f"⚠️ Fichier existe déjà: {en_file}")
         if reading_time:
-            update_frontmatter(en_file, "reading_time", reading_time)
-            print(f"   🔄 Reading time mis à jour: {reading_time}")
+            FRONTMATTER_EDITS.set_raw(en_file, "reading_time", reading_time, after="draft")
+            print(f"   🔄 Reading time à mettre à jour: {reading_time}")
 
 def update_sadservers_json(slug, scenario):
-    """Met à jour le fichier sadservers_scenarios.json"""
-    data = {}
-    if SADSERVERS_DATA_FILE.exists():
-        with open(SADSERVERS_DATA_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-    data[slug] = scenario
-    
-    with open(SADSERVERS_DATA_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    print(f"✅ Données sauvegardées dans {SADSERVERS_DATA_FILE}")
+    """Met à jour le scénario dans la base locale puis exporte sadservers_scenarios.json"""
+    store = data_store()
+    store.upsert_scenario(slug, scenario.to_dict())
+    if store.export(["scenarios"]):
+        print(f"✅ Données sauvegardées dans {SADSERVERS_DATA_FILE}")
+    else:
+        print(f"⏭️ {SADSERVERS_DATA_FILE.name} déjà à jour")
 
 
 def get_challenge_info(url):
@@ -441,7 +459,7 @@ def get_challenge_info(url):
     req = urllib.request.Request(url, headers=headers)
     
     try:
-        with urllib.request.urlopen(req) as response:
+        with urlopen_guarded(req) as response:
             html = response.read().decode('utf-8')
             
             # Recherche de l'ID (souvent dans <input type="hidden" name="id_challenge" value="96" /> ou opengraph)
@@ -554,6 +572,9 @@ def get_challenge_info_via_api(slug):
     for search_term in unique_terms:
         print(f"🔍 Recherche API pour : '{search_term}'")
         url = f"https://api.www.root-me.org/challenges?titre={urllib.parse.quote(search_term)}"
+        if BREAKERS.for_url(url).is_open():
+            print("   ⚠️ API coupée (disjoncteur ouvert), recherche abandonnée.")
+            break
         
         # Retry logic for 429/5xx
         max_retries = 2
@@ -571,7 +592,7 @@ def get_challenge_info_via_api(slug):
                     
                 req.add_header("User-Agent", "Mozilla/5.0")
                 
-                with urllib.request.urlopen(req, timeout=10) as response:
+                with urlopen_guarded(req, timeout=10) as response:
                     data = json.loads(response.read().decode("utf-8"))
                     
                     if not data:
@@ -626,6 +647,9 @@ def get_challenge_info_via_api(slug):
                 break # On passe au search_term suivant
                     
             except urllib.error.HTTPError as e:
+                if BREAKERS.for_url(url).is_open():
+                    print(f"   ⚠️ API coupée après {e.code} (disjoncteur ouvert), recherche abandonnée.")
+                    return None
                 if e.code == 429 or e.code >= 500:
                     wait_time = (attempt + 1) * 5
                     print(f"   ⚠️ Rate limit/Erreur serveur ({e.code}). Nouvelle tentative dans {wait_time}s...")
@@ -658,7 +682,7 @@ def get_challenge_info_via_api_by_id(challenge_id):
             
         req.add_header("User-Agent", "Mozilla/5.0")
         
-        with urllib.request.urlopen(req, timeout=10) as response:
+        with urlopen_guarded(req, timeout=10) as response:
             data = json.loads(response.read().decode("utf-8"))
             if isinstance(data, list) and len(data) > 0:
                 data = data[0]
@@ -698,39 +722,6 @@ def should_update_frontmatter(key, current_value):
         return current_value == ""
     return False
 
-def update_frontmatter_file(path, updates):
-    try:
-        text = path.read_text(encoding="utf-8")
-    except Exception:
-        return False
-    m = re.match(r"(?s)^---\n(.*?)\n---\n", text)
-    if not m:
-        return False
-    fm = m.group(1)
-    lines = fm.splitlines()
-    current = {}
-    for line in lines:
-        if ":" in line:
-            k, v = line.split(":", 1)
-            current[k.strip()] = v.strip()
-    new_lines = []
-    for line in lines:
-        if ":" in line:
-            k, _ = line.split(":", 1)
-            key = k.strip()
-            if key in updates and should_update_frontmatter(key, current.get(key, "")):
-                line = f"{key}: {format_frontmatter_value(key, updates[key])}"
-            new_lines.append(line)
-        else:
-            new_lines.append(line)
-    for key, value in updates.items():
-        if key not in current and should_update_frontmatter(key, ""):
-            new_lines.append(f"{key}: {format_frontmatter_value(key, value)}")
-    new_fm = "\n".join(new_lines)
-    new_text = text[:m.start(1)] + new_fm + text[m.end(1):]
-    path.write_text(new_text, encoding="utf-8")
-    return True
-
 def create_content_files(info):
     """Crée les dossiers et fichiers markdown."""
     print("📂 Création des fichiers...")
@@ -785,8 +776,7 @@ Writeup à rédiger...
     
     fr_path = dir_path / "index.md"
     if fr_path.exists():
-        if update_frontmatter_file(fr_path, updates):
-            print(f"✅ Frontmatter mis à jour (contenu conservé) : {fr_path}")
+        queue_frontmatter_edits(fr_path, updates)
     else:
         with open(fr_path, "w", encoding="utf-8") as f:
             f.write(md_fr)
@@ -813,8 +803,7 @@ Writeup to write...
     
     en_path = dir_path / "index.en.md"
     if en_path.exists():
-        if update_frontmatter_file(en_path, updates):
-            print(f"✅ Frontmatter mis à jour (contenu conservé) : {en_path}")
+        queue_frontmatter_edits(en_path, updates)
     else:
         with open(en_path, "w", encoding="utf-8") as f:
             f.write(md_en)
@@ -833,10 +822,11 @@ def run_fetch_script():
         venv_python = venv_dir / "bin" / "python3"
         if not venv_python.exists():
             venv_python = venv_dir / "bin" / "python"
+        profile_arg = f" --profile {PROFILER.out_dir / 'fetch-rootme'}" if PROFILER else ""
         if venv_python.exists():
-            ret = os.system(f"{venv_python} {FETCH_SCRIPT}")
+            ret = os.system(f"{venv_python} {FETCH_SCRIPT}{profile_arg}")
         else:
-            ret = os.system(f"python3 {FETCH_SCRIPT}")
+            ret = os.system(f"python3 {FETCH_SCRIPT}{profile_arg}")
         if ret != 0:
             print("⚠️ La mise à jour des données a échoué (429 ?). Pas de panique, le workflow quotidien s'en chargera demain.")
     except Exception as e:
@@ -895,19 +885,11 @@ def normalize_date_for_frontmatter(value):
 def update_frontmatter_dates(info):
     if not info:
         return
-    if not CHALLENGES_FILE.exists():
-        return
     try:
-        with open(CHALLENGES_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        # Recherche indexée : slug, puis id si le slug du contenu diffère de celui des données
+        entry = data_store().find_challenge(info.get("slug"), info.get("id"))
     except Exception:
         return
-    entry = data.get(info.get("slug"))
-    if not entry:
-        for item in data.values():
-            if str(item.get("id")) == str(info.get("id")):
-                entry = item
-                break
     if not entry:
         return
     date_raw = entry.get("date_publication") or entry.get("date")
@@ -917,27 +899,9 @@ def update_frontmatter_dates(info):
     dir_path = CONTENT_DIR / info["slug"]
     for filename in ("index.md", "index.en.md"):
         path = dir_path / filename
-        if not path.exists():
-            continue
-        text = path.read_text(encoding="utf-8")
-        lines = text.splitlines()
-        replaced = False
-        for i, line in enumerate(lines):
-            if line.startswith("date:"):
-                lines[i] = f"date: {date_norm}"
-                replaced = True
-                break
-        if not replaced:
-            for i, line in enumerate(lines):
-                if line.startswith("title:"):
-                    lines.insert(i + 1, f"date: {date_norm}")
-                    replaced = True
-                    break
-        if replaced:
-            new_text = "\n".join(lines)
-            if text.endswith("\n"):
-                new_text += "\n"
-            path.write_text(new_text, encoding="utf-8")
+        if path.exists():
+            FRONTMATTER_EDITS.set_raw(path, "date", date_norm, after="title")
+    apply_frontmatter_edits()
     print(f"🗓️ Date du challenge mise à jour: {date_norm}")
 
 def main():
@@ -966,13 +930,14 @@ def main():
         print(f"🚀 Analyse de '{slug}'...")
 
         # 1. Récupérer les données
-        scenario = fetch_sadservers_data(slug)
+        with profile_phase("fetch"):
+            scenario = fetch_sadservers_data(slug)
         if not scenario:
             print("❌ Impossible de récupérer les données du scénario.")
             sys.exit(1)
             
         print("\n📋 Données récupérées:")
-        for key, value in scenario.items():
+        for key, value in scenario.to_dict().items():
             if key == "description":
                 print(f"   {key}: {value[:80]}...")
             elif isinstance(value, list):
@@ -980,11 +945,13 @@ def main():
             else:
                 print(f"   {key}: {value}")
                 
-        # 2. Mettre à jour JSON
-        update_sadservers_json(slug, scenario)
-        
-        # 3. Créer contenu
-        create_sadservers_content(slug, scenario)
+        with profile_phase("save"):
+            # 2. Mettre à jour JSON
+            update_sadservers_json(slug, scenario)
+            
+            # 3. Créer contenu
+            create_sadservers_content(slug, scenario)
+            apply_frontmatter_edits()
         
         print("\n🎉 Terminé ! Tu n'as plus qu'à rédiger ton writeup.")
         sys.exit(0)
@@ -1000,7 +967,7 @@ def main():
         
     # 2. Option: Le challenge existe déjà avec des stats valides (cache)
     if not info:
-        existing = ROOTME_CHALLENGES.get(slug)
+        existing = data_store().challenge(slug)
         if existing and existing.get("validations", 0) > 0 and existing.get("titre") != "Inconnu":
             print(f"✅ Le challenge '{slug}' existe déjà avec des données valides ({existing['validations']} validations).")
             print("   Utilisation des données locales (pas de requête API/Scraping).")
@@ -1015,12 +982,14 @@ def main():
             
     # 3. Option: Scraping / API
     if not info:
-        info = get_challenge_info(url)
+        with profile_phase("fetch"):
+            info = get_challenge_info(url)
     
     # Correction API officielle (seulement si pas du cache)
     if USE_API_DETAILS and info and info['id'] and not "PENDING" in str(info['id']) and not info.get("_from_cache"):
         print(f"✅ ID {info['id']} trouvé. Récupération des détails officiels...")
-        official_info = get_challenge_info_via_api_by_id(info['id'])
+        with profile_phase("fetch"):
+            official_info = get_challenge_info_via_api_by_id(info['id'])
         if official_info:
             info = official_info
             info['slug'] = slug # On garde le slug de l'URL
@@ -1063,15 +1032,33 @@ def main():
     if dir_path.exists():
         print(f"⚠️ Le dossier {info['slug']} existe déjà. Mise à jour des fichiers...")
     
-    create_content_files(info)
+    with profile_phase("save"):
+        create_content_files(info)
+        apply_frontmatter_edits()
     
     # Lancement automatique du fetch pour mettre à jour les donnés complètes
-    run_fetch_script()
+    with profile_phase("fetch_script"):
+        run_fetch_script()
     # update_frontmatter_dates(info) <--- Désactivé pour garder la date d'ajout sur le site
         
     print("\n🎉 Terminé ! Tu n'as plus qu'à rédiger ton writeup dans :")
     print(f"   content/root-me-challenges/{info['slug']}/index.md")
     print("⏳ Les stats et infos complètes seront mises à jour automatiquement au prochain cycle (toutes les 4h).")
 
+def pop_profile_arg(argv):
+    """Retire --profile[=DOSSIER] de argv et retourne le dossier (ou None)."""
+    for arg in list(argv[1:]):
+        if arg == "--profile" or arg.startswith("--profile="):
+            argv.remove(arg)
+            return arg.partition("=")[2] or str(DEFAULT_PROFILE_DIR)
+    return None
+
+
 if __name__ == "__main__":
-    main()
+    profile_dir = pop_profile_arg(sys.argv)
+    if profile_dir:
+        import profiling
+        PROFILER = profiling.PhaseProfiler(profile_dir)
+        profiling.run_profiled(main, PROFILER)
+    else:
+        main()
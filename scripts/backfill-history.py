@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Reconstruit l'historique score / rang / validations depuis l'historique git
+de data/rootme.json et data/rootme_challenges.json (ou de ses shards
+data/rootme_challenges/<slug>.json, disposition "sharded").
+
+Aucun checkout : un seul `git log --raw` liste les versions (blobs) de chaque
+fichier, puis `git cat-file --batch` lit en une fois tous les blobs distincts.
+Chaque version n'est décodée qu'une fois, même si elle revient plusieurs fois.
+
+Les snapshots deviennent des tableaux NumPy (un instant par ligne, NaN pour
+les valeurs inconnues) : dédoublonnage des snapshots identiques, puis
+ré-échantillonnage à pas fixe (valeur du dernier snapshot <= chaque instant).
+
+Usage:
+    python3 scripts/backfill-history.py
+    python3 scripts/backfill-history.py --step 1d --since 2024-01-01 --npz history.npz
+    python3 scripts/backfill-history.py --into-store   # complète history/rootme_metrics.jsonl (et son index)
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import metrics_store  # noqa: E402
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PROFILE_PATH = "data/rootme.json"
+CHALLENGES_PATH = "data/rootme_challenges.json"
+SHARDS_PREFIX = "data/rootme_challenges/"
+
+
+def is_challenges_path(path):
+    return path == CHALLENGES_PATH or (path.startswith(SHARDS_PREFIX) and path.endswith(".json"))
+
+
+def git(repo, *args, **kwargs):
+    return subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, **kwargs).stdout
+
+
+def list_versions(repo, paths, since=None):
+    """[(commit ts, {chemin: blob sha})] dans l'ordre chronologique, via un seul git log --raw.
+
+    Un chemin supprimé (shard retiré) a pour sha None.
+    """
+    args = ["log", "--reverse", "--raw", "--no-abbrev", "--no-renames", "--format=%x00%ct"]
+    if since:
+        args.append(f"--since={since}")
+    out = git(repo, *args, "--", *paths).decode("utf-8", errors="replace")
+    versions = []
+    for chunk in out.split("\0")[1:]:
+        lines = chunk.strip().splitlines()
+        if not lines:
+            continue
+        blobs = {}
+        for line in lines[1:]:
+            # :100644 100644 <ancien> <nouveau> M\t<chemin>
+            meta, _, path = line.partition("\t")
+            fields = meta.split()
+            if len(fields) < 5 or not (path == PROFILE_PATH or is_challenges_path(path)):
+                continue
+            blobs[path] = None if set(fields[3]) == {"0"} else fields[3]
+        if blobs:
+            versions.append((int(lines[0]), blobs))
+    return versions
+
+
+def read_blobs(repo, shas):
+    """{sha: bytes} pour tous les blobs, en un seul processus git cat-file --batch."""
+    shas = list(dict.fromkeys(sha for sha in shas if sha))
+    if not shas:
+        return {}
+    out = git(repo, "cat-file", "--batch", input="\n".join(shas).encode() + b"\n")
+    blobs = {}
+    pos = 0
+    for sha in shas:
+        end = out.index(b"\n", pos)
+        header = out[pos:end].split()
+        pos = end + 1
+        if len(header) < 3 or header[1] == b"missing":
+            continue
+        size = int(header[2])
+        blobs[sha] = out[pos:pos + size]
+        pos += size + 1
+    return blobs
+
+
+def decode_profile(raw):
+    data = json.loads(raw)
+    return tuple(data.get(key) if isinstance(data.get(key), int) else None
+                 for key in metrics_store.PROFILE_METRICS)
+
+
+def decode_challenges(raw):
+    """{id: (validations, score)} ; les entrées sans id numérique sont ignorées."""
+    data = json.loads(raw)
+    result = {}
+    for challenge in data.values():
+        if not isinstance(challenge, dict) or not str(challenge.get("id", "")).isdigit():
+            continue
+        result[str(challenge["id"])] = tuple(
+            challenge.get(key) if isinstance(challenge.get(key), int) else None
+            for key in metrics_store.CHALLENGE_METRICS
+        )
+    return result
+
+
+def decode_shard(raw):
+    """Shard data/rootme_challenges/<slug>.json : un seul challenge."""
+    return decode_challenges(b'{"_": ' + raw + b"}")
+
+
+def decode_versions(versions, blobs):
+    """Décode chaque blob une seule fois ; retourne (décodés, nb d'échecs)."""
+    decoded = {}
+    failures = 0
+    for _, paths in versions:
+        for path, sha in paths.items():
+            if sha in decoded or sha not in blobs:
+                continue
+            if path == PROFILE_PATH:
+                decoder = decode_profile
+            elif path == CHALLENGES_PATH:
+                decoder = decode_challenges
+            else:
+                decoder = decode_shard
+            try:
+                decoded[sha] = decoder(blobs[sha])
+            except (ValueError, AttributeError):
+                decoded[sha] = None
+                failures += 1
+    return decoded, failures
+
+
+def build_series(versions, decoded):
+    """Tableaux NumPy : ts (n,), profile (n, 3), challenges (n, c, 2) et les ids des colonnes.
+
+    Chaque ligne est l'état complet après un commit (le fichier non modifié
+    garde sa dernière version) ; NaN pour les valeurs inconnues. Les
+    challenges viennent du fichier unique et/ou des shards présents.
+    """
+    ids = sorted({cid for sha in decoded for cid in (decoded[sha] or {}) if isinstance(decoded[sha], dict)},
+                 key=int)
+    column = {cid: i for i, cid in enumerate(ids)}
+    n = len(versions)
+    ts = np.empty(n, dtype=np.int64)
+    profile = np.full((n, len(metrics_store.PROFILE_METRICS)), np.nan)
+    challenges = np.full((n, len(ids), len(metrics_store.CHALLENGE_METRICS)), np.nan)
+
+    profile_sha = None
+    sources = {}  # chemin (fichier unique ou shard) -> sha courant
+    row = np.full((len(ids), len(metrics_store.CHALLENGE_METRICS)), np.nan)
+    for i, (commit_ts, paths) in enumerate(versions):
+        ts[i] = commit_ts
+        dirty = False
+        for path, sha in paths.items():
+            if path == PROFILE_PATH:
+                if decoded.get(sha) is not None:
+                    profile_sha = sha
+            elif sha is None:
+                dirty |= sources.pop(path, None) is not None
+            elif decoded.get(sha) is not None:
+                sources[path] = sha
+                dirty = True
+        if profile_sha is not None:
+            profile[i] = [np.nan if v is None else v for v in decoded[profile_sha]]
+        if dirty:
+            # Reconstruite seulement quand une source de challenges a changé dans ce commit
+            row = np.full((len(ids), len(metrics_store.CHALLENGE_METRICS)), np.nan)
+            for sha in sources.values():
+                for cid, values in decoded[sha].items():
+                    row[column[cid]] = [np.nan if v is None else v for v in values]
+        challenges[i] = row
+    return ts, profile, challenges, ids
+
+
+def dedupe(ts, profile, challenges):
+    """Retire les snapshots identiques au précédent (NaN == NaN) et garde le dernier d'un même instant."""
+    if len(ts) == 0:
+        return ts, profile, challenges
+    # Même seconde : seule la dernière version compte
+    last = np.concatenate([ts[:-1] != ts[1:], [True]])
+    ts, profile, challenges = ts[last], profile[last], challenges[last]
+    flat = np.concatenate([profile, challenges.reshape(len(ts), -1)], axis=1)
+    same = np.all((flat[1:] == flat[:-1]) | (np.isnan(flat[1:]) & np.isnan(flat[:-1])), axis=1)
+    keep = np.concatenate([[True], ~same])
+    return ts[keep], profile[keep], challenges[keep]
+
+
+def resample(ts, values, step, start=None, end=None):
+    """Grille régulière au pas `step` : valeur du dernier snapshot de chaque intervalle (NaN avant le premier)."""
+    start = int(ts[0] - ts[0] % step) if start is None else start
+    end = int(ts[-1]) if end is None else end
+    grid = np.arange(start, end + 1, step, dtype=np.int64)
+    idx = np.searchsorted(ts, grid + step - 1, side="right") - 1
+    out = np.full((len(grid),) + values.shape[1:], np.nan)
+    valid = idx >= 0
+    out[valid] = values[idx[valid]]
+    return grid, out
+
+
+def analytics(ts, profile, challenges, ids):
+    """Indicateurs rapides calculés sur les tableaux (tout en opérations vectorisées)."""
+    def first_last(column):
+        known = ~np.isnan(column)
+        if not known.any():
+            return None, None
+        values = column[known]
+        return float(values[0]), float(values[-1])
+
+    score = first_last(profile[:, 0])
+    position = profile[:, 1]
+    best = float(np.nanmin(position)) if (~np.isnan(position)).any() else None
+    validations = challenges[:, :, 0]
+    with np.errstate(invalid="ignore"):
+        growth = np.nanmax(validations, axis=0) - np.nanmin(validations, axis=0) if len(ids) else np.array([])
+    order = np.argsort(np.nan_to_num(growth, nan=-1))[::-1][:5]
+    days = (ts[-1] - ts[0]) / 86400 if len(ts) > 1 else 0
+    return {
+        "from": metrics_store.iso(int(ts[0])),
+        "to": metrics_store.iso(int(ts[-1])),
+        "snapshots": int(len(ts)),
+        "challenges": len(ids),
+        "score": {"first": score[0], "last": score[1]},
+        "best_position": best,
+        "validations_growth": {ids[i]: {"total": float(growth[i]),
+                                        "per_day": float(growth[i] / days) if days else None}
+                               for i in order if not np.isnan(growth[i])},
+    }
+
+
+def store_runs(ts, profile, challenges, ids):
+    """Runs pour MetricsStore.backfill : [(ts, {série: valeur}, nb challenges)]."""
+    runs = []
+    for i in range(len(ts)):
+        samples = {}
+        for j, key in enumerate(metrics_store.PROFILE_METRICS):
+            if not np.isnan(profile[i, j]) and profile[i, j] > 0:
+                samples[f"profile.{key}"] = int(profile[i, j])
+        known = ~np.isnan(challenges[i])
+        for c, m in zip(*np.nonzero(known & (np.nan_to_num(challenges[i]) > 0))):
+            samples[f"challenge.{ids[c]}.{metrics_store.CHALLENGE_METRICS[m]}"] = int(challenges[i, c, m])
+        runs.append((int(ts[i]), samples, int(known[:, 0].sum())))
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Historique des métriques reconstruit depuis git")
+    parser.add_argument("--repo", default=str(ROOT_DIR), help="Dépôt git")
+    parser.add_argument("--since", help="Ne lit que les commits depuis cette date (syntaxe git)")
+    parser.add_argument("--step", default="1d", help="Pas de ré-échantillonnage (6h, 1d, 1w...)")
+    parser.add_argument("--npz", help="Écrit les séries (brutes et ré-échantillonnées) dans ce fichier .npz")
+    parser.add_argument("--json", help="Écrit les indicateurs dans ce fichier")
+    parser.add_argument("--into-store", action="store_true",
+                        help="Complète la base d'historique avec les snapshots antérieurs à son premier run")
+    parser.add_argument("--db", default=str(metrics_store.DEFAULT_DB), help="Index SQLite (avec --into-store)")
+    parser.add_argument("--log", default=str(metrics_store.DEFAULT_LOG), help="Journal JSONL (avec --into-store)")
+    args = parser.parse_args()
+
+    if np is None:
+        print("❌ NumPy est requis : pip install numpy", file=sys.stderr)
+        sys.exit(1)
+
+    timings = {}
+    start = time.perf_counter()
+    versions = list_versions(args.repo, (PROFILE_PATH, CHALLENGES_PATH, SHARDS_PREFIX), args.since)
+    timings["git log"] = time.perf_counter() - start
+    if not versions:
+        print("❌ Aucune version des fichiers de données dans l'historique git")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    blobs = read_blobs(args.repo, (sha for _, paths in versions for sha in paths.values()))
+    timings["cat-file"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decoded, failures = decode_versions(versions, blobs)
+    timings["décodage"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ts, profile, challenges, ids = build_series(versions, decoded)
+    raw_count = len(ts)
+    ts, profile, challenges = dedupe(ts, profile, challenges)
+    step = metrics_store.parse_step(args.step)
+    grid, grid_profile = resample(ts, profile, step)
+    _, grid_challenges = resample(ts, challenges, step)
+    timings["séries"] = time.perf_counter() - start
+
+    print(f"📜 {len(versions)} commit(s), {len(blobs)} blob(s) distinct(s) "
+          f"({sum(len(b) for b in blobs.values()) / 1024:.0f} KiB), {failures} illisible(s)")
+    print(f"🧮 {raw_count} snapshot(s) -> {len(ts)} après dédoublonnage -> {len(grid)} point(s) au pas {args.step}, "
+          f"{len(ids)} challenge(s)")
+    print("⏱️ " + " | ".join(f"{name} {secs * 1000:.0f}ms" for name, secs in timings.items()))
+
+    report = analytics(ts, profile, challenges, ids)
+    print(f"📈 {report['from']} → {report['to']} | score {report['score']['first']} → {report['score']['last']} "
+          f"| meilleur rang {report['best_position']}")
+    for cid, growth in report["validations_growth"].items():
+        per_day = f" ({growth['per_day']:.1f}/jour)" if growth["per_day"] is not None else ""
+        print(f"   #{cid:<8} +{growth['total']:.0f} validations{per_day}")
+
+    if args.npz:
+        np.savez_compressed(args.npz, ts=ts, profile=profile, challenges=challenges, ids=np.array(ids),
+                            grid=grid, grid_profile=grid_profile, grid_challenges=grid_challenges,
+                            profile_metrics=np.array(metrics_store.PROFILE_METRICS),
+                            challenge_metrics=np.array(metrics_store.CHALLENGE_METRICS))
+        print(f"💾 Séries écrites dans {args.npz}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"💾 Indicateurs écrits dans {args.json}")
+    if args.into_store:
+        with metrics_store.MetricsStore(args.db, log=args.log) as store:
+            first_run = store.db.execute("SELECT MIN(ts) FROM runs").fetchone()[0]
+            runs = [run for run in store_runs(ts, profile, challenges, ids)
+                    if first_run is None or run[0] < first_run]
+            added = store.backfill(runs)
+        print(f"🗄️ {len(runs)} run(s) et {added} point(s) ajoutés à {args.log}")
+
+
+if __name__ == "__main__":
+    main()
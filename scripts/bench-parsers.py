@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Benchmark hors-ligne des parsers HTML (Root-Me / SadServers).
+
+Rejoue chaque parser sur un corpus de pages enregistrées (par défaut celles
+écrites par debug_dump dans .debug/rootme, fichiers .html et stockage
+captures/) et mesure :
+- le débit (pages/seconde) et le temps moyen par page
+- la mémoire allouée (pic tracemalloc)
+- l'accord champ par champ avec les valeurs attendues (expected.json)
+
+Usage:
+    python3 scripts/bench-parsers.py
+    python3 scripts/bench-parsers.py --corpus .debug/rootme --repeat 20
+    python3 scripts/bench-parsers.py --json bench.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT_DIR = SCRIPT_DIR.parent
+DEFAULT_CORPUS = ROOT_DIR / ".debug" / "rootme"
+
+URL_HEADER = re.compile(r"^<!-- url: (\S+) status: (\S+) -->\n?")
+
+
+def load_script(name, filename):
+    """Charge un script à tiret (fetch-rootme.py, add-challenge.py) comme module."""
+    # Pas de bootstrap venv/pip pendant un benchmark
+    os.environ.setdefault("ROOTME_VENV_BOOTSTRAP", "1")
+    spec = importlib.util.spec_from_file_location(name, SCRIPT_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def detect_kind(url):
+    if not url:
+        return None
+    if "sadservers.com" in url:
+        return "sadservers"
+    if "inc=score" in url:
+        return "profile_score"
+    if "/Challenges/" in url:
+        return "challenge"
+    return "profile"
+
+
+def load_corpus(corpus_dir, expected):
+    """Retourne la liste des pages {file, url, kind, html, expected}."""
+    pages = []
+    for path in sorted(Path(corpus_dir).glob("*.html")):
+        raw = path.read_text(encoding="utf-8", errors="replace")
+        m = URL_HEADER.match(raw)
+        url = m.group(1) if m else None
+        html = raw[m.end():] if m else raw
+        entry = expected.get(path.name, {})
+        kind = entry.get("parser") or detect_kind(url)
+        if not kind:
+            continue
+        pages.append({
+            "file": path.name,
+            "url": url,
+            "kind": kind,
+            "html": html,
+            "expected": entry.get("fields"),
+        })
+    if (Path(corpus_dir) / "captures" / "index.json").exists():
+        from capture_store import CaptureStore
+        store = CaptureStore(Path(corpus_dir) / "captures")
+        for url, entry in store.latest_by_url().items():
+            kind = detect_kind(url)
+            if not kind or entry["kind"] == "error":
+                continue
+            pages.append({
+                "file": f"captures/{entry['hash'][:12]}",
+                "url": url,
+                "kind": kind,
+                "html": store.read(entry),
+                "expected": None,
+            })
+    return pages
+
+
+def build_parsers(fetch, add):
+    """Parsers à mesurer, par type de page."""
+    return {
+        "challenge": {
+            "parse_challenge_html": lambda page: fetch.parse_challenge_html(page["html"]),
+            "parse_challenge_html_regex": lambda page: fetch.parse_challenge_html_regex(page["html"]),
+        },
+        "profile": {
+            "parse_profile_html": lambda page: fetch.parse_profile_html(page["html"]),
+        },
+        "profile_score": {
+            "parse_profile_score_html": lambda page: fetch.parse_profile_score_html(page["html"], {}),
+            "parse_profile_html": lambda page: fetch.parse_profile_html(page["html"]),
+        },
+        "sadservers": {
+            "parse_sadservers_html": lambda page: add.parse_sadservers_html(page["html"], page["url"]).to_dict(),
+        },
+    }
+
+
+def field_agreement(result, expected):
+    """Compare champ par champ ; None attendu = le parser ne doit rien trouver."""
+    matched = 0
+    mismatches = []
+    for key, want in expected.items():
+        got = (result or {}).get(key)
+        if got in ("", 0):
+            got = None
+        if got == want:
+            matched += 1
+        else:
+            mismatches.append((key, want, got))
+    return matched, mismatches
+
+
+def bench_parser(func, pages, repeat):
+    # Débit (sans tracemalloc, qui ralentit fortement)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            func(page)
+    elapsed = time.perf_counter() - start
+    runs = repeat * len(pages)
+
+    # Mémoire : un passage sous tracemalloc
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    results = [func(page) for page in pages]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    matched = total = 0
+    mismatches = {}
+    for page, result in zip(pages, results):
+        if page["expected"] is None:
+            continue
+        ok, miss = field_agreement(result, page["expected"])
+        matched += ok
+        total += len(page["expected"])
+        for key, want, got in miss:
+            mismatches.setdefault(key, []).append({"file": page["file"], "expected": want, "got": got})
+
+    return {
+        "pages": len(pages),
+        "pages_per_s": runs / elapsed if elapsed else 0.0,
+        "mean_ms": elapsed / runs * 1000 if runs else 0.0,
+        "peak_kib": peak / 1024,
+        "fields_matched": matched,
+        "fields_total": total,
+        "agreement": matched / total if total else None,
+        "mismatches": mismatches,
+    }
+
+
+def print_report(report, verbose):
+    print(f"\n{'parser':<28} {'type':<14} {'pages':>5} {'pages/s':>9} {'ms/page':>8} {'pic KiB':>9} {'accord':>8}")
+    print("-" * 86)
+    for row in report:
+        r = row["result"]
+        agreement = f"{r['agreement'] * 100:.1f}%" if r["agreement"] is not None else "n/a"
+        print(f"{row['parser']:<28} {row['kind']:<14} {r['pages']:>5} {r['pages_per_s']:>9.1f} "
+              f"{r['mean_ms']:>8.2f} {r['peak_kib']:>9.1f} {agreement:>8}")
+        for key, misses in r["mismatches"].items():
+            print(f"   ⚠️ {key}: {len(misses)} désaccord(s)")
+            if verbose:
+                for miss in misses:
+                    print(f"      {miss['file']}: attendu {miss['expected']!r}, obtenu {miss['got']!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hors-ligne des parsers HTML")
+    parser.add_argument("--corpus", default=os.environ.get("ROOTME_DEBUG_DIR", str(DEFAULT_CORPUS)),
+                        help="Dossier des pages enregistrées (défaut: .debug/rootme)")
+    parser.add_argument("--expected", help="Valeurs attendues (défaut: <corpus>/expected.json)")
+    parser.add_argument("--repeat", type=int, default=10, help="Passages sur le corpus pour le débit")
+    parser.add_argument("--only", help="Ne mesurer que les parsers dont le nom contient ce texte")
+    parser.add_argument("--json", help="Écrit les résultats bruts dans ce fichier")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Détaille chaque désaccord")
+    args = parser.parse_args()
+
+    expected_path = Path(args.expected) if args.expected else Path(args.corpus) / "expected.json"
+    expected = {}
+    if expected_path.exists():
+        with open(expected_path, "r", encoding="utf-8") as f:
+            expected = json.load(f)
+    else:
+        print(f"⚠️ Pas de valeurs attendues ({expected_path}) : seul le débit sera mesuré.")
+
+    pages = load_corpus(args.corpus, expected)
+    if not pages:
+        print(f"❌ Aucune page trouvée dans {args.corpus}")
+        sys.exit(1)
+
+    fetch = load_script("fetch_rootme", "fetch-rootme.py")
+    add = load_script("add_challenge", "add-challenge.py")
+    if fetch.BeautifulSoup is None:
+        print("⚠️ BeautifulSoup absent : parse_challenge_html mesure le fallback regex.")
+
+    by_kind = {}
+    for page in pages:
+        by_kind.setdefault(page["kind"], []).append(page)
+    print(f"📂 Corpus : {len(pages)} pages ({', '.join(f'{k}={len(v)}' for k, v in by_kind.items())})")
+
+    report = []
+    for kind, parsers in build_parsers(fetch, add).items():
+        kind_pages = by_kind.get(kind)
+        if not kind_pages:
+            continue
+        for name, func in parsers.items():
+            if args.only and args.only not in name:
+                continue
+            report.append({"parser": name, "kind": kind, "result": bench_parser(func, kind_pages, args.repeat)})
+
+    print_report(report, args.verbose)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Résultats écrits dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
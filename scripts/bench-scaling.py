@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark de montée en charge du pipeline fetch-rootme sur catalogues synthétiques.
+
+Pour chaque taille, génère un catalogue (gen-catalogue.py) puis mesure le
+temps et le pic mémoire (tracemalloc) de chaque étape hors réseau :
+- discovery         : lecture du frontmatter (discover_challenges)
+- load              : lecture des challenges de la base locale (-> ChallengeRecord)
+- merge             : fusion cache + données fraîches sur tout le catalogue (+ diff)
+- incremental_save  : upsert de chaque challenge dans la base (comme la boucle de fetch)
+- save              : export final de data/rootme_challenges.json
+- summary           : generate_summary (console + résumé GitHub)
+
+L'exposant de croissance entre deux tailles (log Δt / log Δn) signale les
+étapes super-linéaires (⚠️ au-delà de 1.5).
+
+Usage:
+    python3 scripts/bench-scaling.py
+    python3 scripts/bench-scaling.py --sizes 100,500,1000,5000 --json scaling.json
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import math
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+
+
+def load_script(name, filename):
+    os.environ.setdefault("ROOTME_VENV_BOOTSTRAP", "1")
+    spec = importlib.util.spec_from_file_location(name, SCRIPT_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def measure(func):
+    """Retourne (secondes, pic KiB) : une passe chronométrée puis une sous tracemalloc."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+
+def fresh_copy(challenge, i):
+    """Simule une donnée fraîchement scrapée (champs parfois manquants ou en texte)."""
+    new = dict(challenge)
+    new["validations"] = str(challenge["validations"] + 1) if i % 3 else "?"
+    new["note"] = "0%" if i % 7 == 0 else challenge["note"]
+    new["difficulte"] = "Inconnu" if i % 11 == 0 else challenge["difficulte"]
+    return new
+
+
+def bench_size(size, fetch, gen):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="rootme-scaling-") as tmp:
+        root = Path(tmp)
+        gen.generate(root, size, seed=size)
+        fetch.CONTENT_DIR = root / "content" / "root-me-challenges"
+        fetch.DATA_DIR = root / "data"
+        challenges_file = fetch.DATA_DIR / "rootme_challenges.json"
+
+        results["discovery"] = measure(fetch.discover_challenges)
+
+        store = fetch.data_store()  # import initial de data/*.json dans la base locale
+
+        def load():
+            return fetch.load_challenge_records(store.challenges())
+        results["load"] = measure(load)
+        existing = load()
+        slugs = list(existing)
+        fresh = [fresh_copy(existing[slug].to_dict(), i) for i, slug in enumerate(slugs)]
+
+        def merge():
+            # Comme la boucle de fetch : records frais -> fusion en une passe (+ diff) -> dicts JSON
+            catalogue = fetch.challenge_catalogue_merge(existing)
+            for i, slug in enumerate(slugs):
+                catalogue.add(slug, fetch.ChallengeRecord.from_dict(fresh[i]))
+            records, diff = catalogue.finish()
+            return {slug: record.to_dict() for slug, record in records.items()}, diff
+        results["merge"] = measure(merge)
+        merged, diff = merge()
+
+        def incremental():
+            # Comme la boucle de fetch : un upsert (une transaction) par challenge
+            for slug in slugs:
+                store.upsert_challenges({slug: merged[slug]})
+        results["incremental_save"] = measure(incremental)
+
+        def save():
+            challenges_file.unlink(missing_ok=True)
+            fetch.export_data("challenges")
+        results["save"] = measure(save)
+
+        profile = store.profile()
+        stats = [{"id": c["id"], "name": c["titre"], "status": "OK", "info": f"{c['score']} pts"}
+                 for c in merged.values()]
+        summary_path = root / "summary.md"
+        os.environ["GITHUB_STEP_SUMMARY"] = str(summary_path)
+
+        def summary():
+            summary_path.write_text("", encoding="utf-8")
+            with contextlib.redirect_stdout(io.StringIO()):
+                fetch.generate_summary(profile, merged, stats, duration=0.0, diff=diff)
+        try:
+            results["summary"] = measure(summary)
+        finally:
+            os.environ.pop("GITHUB_STEP_SUMMARY", None)
+    return results
+
+
+def growth_exponent(t1, t2, n1, n2):
+    if t1 <= 0 or t2 <= 0 or n1 == n2:
+        return None
+    return math.log(t2 / t1) / math.log(n2 / n1)
+
+
+def print_report(rows):
+    stages = [k for k in rows[0]["stages"]]
+    print(f"\n{'étape':<18} " + " ".join(f"{str(r['size']) + ' ch.':>22}" for r in rows) + f" {'exposant':>9}")
+    print("-" * (20 + 23 * len(rows) + 10))
+    for stage in stages:
+        cells = []
+        for r in rows:
+            secs, peak = r["stages"][stage]
+            cells.append(f" {secs * 1000:>9.1f}ms {peak / 1024:>7.1f}MiB")
+        exponent = None
+        if len(rows) >= 2:
+            exponent = growth_exponent(rows[-2]["stages"][stage][0], rows[-1]["stages"][stage][0],
+                                       rows[-2]["size"], rows[-1]["size"])
+        flag = "" if exponent is None else f"{exponent:>7.2f}{' ⚠️' if exponent > 1.5 else ''}"
+        print(f"{stage:<18} " + " ".join(f"{c:>22}" for c in cells) + f" {flag:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de montée en charge (catalogues synthétiques)")
+    parser.add_argument("--sizes", default="100,500,1000,5000", help="Tailles de catalogue")
+    parser.add_argument("--json", help="Écrit les résultats bruts dans ce fichier")
+    args = parser.parse_args()
+
+    fetch = load_script("fetch_rootme", "fetch-rootme.py")
+    gen = load_script("gen_catalogue", "gen-catalogue.py")
+
+    rows = []
+    for size in sorted(int(s) for s in args.sizes.split(",") if s.strip()):
+        print(f"🔄 Catalogue de {size} challenges...")
+        rows.append({"size": size, "stages": bench_size(size, fetch, gen)})
+
+    print_report(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([{"size": r["size"],
+                        "stages": {k: {"seconds": v[0], "peak_kib": v[1]} for k, v in r["stages"].items()}}
+                       for r in rows], f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Résultats écrits dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
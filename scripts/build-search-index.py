@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Construit l'index de recherche du site (static/search-index/<langue>/).
+
+Le thème faisait télécharger au navigateur le texte intégral de toutes les
+pages (search.json) puis le parcourait à chaque frappe. Ici, content/** est
+lu une fois et transformé en index inversé : terme normalisé (minuscules,
+sans accents) -> [page, score, page, score, ...], avec un poids plus fort
+pour le titre, les tags et les catégories.
+
+Les termes sont répartis en shards selon leurs PREFIX_LENGTH premiers
+caractères (static/search-index/fr/ft.json pour "ftp", "ftps"...) : le
+client ne charge que les shards des mots tapés et fait la recherche par
+préfixe dans le shard. manifest.json liste les pages (chemin dans content/
+et extrait) et le hash de chaque shard (cache-busting). Titre, permalien et
+image viennent du search.json de Hugo, allégé en conséquence.
+
+Reconstruction incrémentale : seuls les fichiers dont le hash a changé
+depuis le dernier run sont relus (cache dans .store/search-index.json), et
+seuls les shards dont le contenu change sont réécrits.
+
+Usage:
+    python3 scripts/build-search-index.py
+    python3 scripts/build-search-index.py --force   # ignore le cache
+    python3 scripts/build-search-index.py --stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT_DIR = SCRIPT_DIR.parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import front_matter  # noqa: E402
+
+CONTENT_DIR = ROOT_DIR / "content"
+OUTPUT_DIR = ROOT_DIR / "static" / "search-index"
+CACHE_PATH = Path(os.environ.get("SEARCH_INDEX_CACHE") or ROOT_DIR / ".store" / "search-index.json")
+
+DEFAULT_LANGUAGE = "fr"
+# Version du format (index et cache) : à incrémenter si la tokenisation change
+INDEX_VERSION = 2
+PREFIX_LENGTH = 2
+MIN_TERM_LENGTH = 2
+SUMMARY_LENGTH = 200
+WEIGHTS = {"title": 10, "tags": 5, "categories": 5, "body": 1}
+# Plafond par terme du corps de texte (une page qui répète un mot ne doit pas tout écraser)
+MAX_BODY_COUNT = 10
+
+STOPWORDS = frozenset("""
+    au aux avec ce ces cette dans de des du elle en et est il ils je la le les leur lui mais
+    me meme ne nous on ou par pas pour qu que qui sa se ses son sont sur ta te tes ton tu un une
+    vos votre vous ete etre fait plus
+    an and are as at be but by for from has have in is it its of on or that the this to was
+    were will with you your can not
+""".split())
+
+SHORTCODE = re.compile(r"\{\{[<%].*?[%>]\}\}", re.DOTALL)
+HTML_TAG = re.compile(r"<[^>]+>")
+LINK_TARGET = re.compile(r"\]\([^)]*\)")
+MARKUP = re.compile(r"[#*_`>|~\[\]]+|^-{3,}$|^\s*[-+]\s+", re.MULTILINE)
+TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(text):
+    """Minuscules sans accents (même normalisation que assets/ts/search.tsx)."""
+    decomposed = unicodedata.normalize("NFD", text.lower())
+    return "".join(c for c in decomposed if unicodedata.category(c) != "Mn")
+
+
+def tokens(text):
+    return [t for t in TOKEN.findall(normalize(text)) if len(t) >= MIN_TERM_LENGTH and t not in STOPWORDS]
+
+
+def plain_text(body):
+    text = SHORTCODE.sub(" ", body)
+    text = HTML_TAG.sub(" ", text)
+    text = LINK_TARGET.sub("]", text)
+    text = MARKUP.sub(" ", text)
+    return " ".join(text.split())
+
+
+def page_language(path):
+    """index.en.md -> "en" ; index.md -> langue par défaut."""
+    parts = path.name.split(".")
+    return parts[-2] if len(parts) > 2 else DEFAULT_LANGUAGE
+
+
+def index_page(text):
+    """Entrée de cache d'une page : extrait et scores par terme (None si la page est exclue)."""
+    meta, body = front_matter.split(text)
+    if meta.get("draft") is True or meta.get("hidden") is True:
+        return None
+    scores = Counter()
+    for term, count in Counter(tokens(plain_text(body))).items():
+        scores[term] += WEIGHTS["body"] * min(count, MAX_BODY_COUNT)
+    for field in ("title", "tags", "categories"):
+        values = meta.get(field) or []
+        for value in (values if isinstance(values, list) else [values]):
+            for term in set(tokens(str(value))):
+                scores[term] += WEIGHTS[field]
+    summary = plain_text(body)
+    if len(summary) > SUMMARY_LENGTH:
+        summary = summary[:SUMMARY_LENGTH].rsplit(" ", 1)[0] + "…"
+    return {"summary": summary, "terms": dict(sorted(scores.items()))}
+
+
+def content_pages():
+    for path in sorted(CONTENT_DIR.rglob("*.md")):
+        if not path.name.startswith("_index"):
+            yield path
+
+
+def load_cache(force):
+    if force:
+        return {}
+    try:
+        cache = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return cache.get("files", {}) if cache.get("version") == INDEX_VERSION else {}
+
+
+def write_if_changed(path, raw):
+    if path.exists() and path.read_bytes() == raw:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(raw)
+    os.replace(tmp, path)
+    return True
+
+
+def compact(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+def build_language(lang, pages):
+    """pages : [(chemin relatif, entrée de cache)] d'une langue ; retourne (écrits, supprimés, stats)."""
+    out_dir = OUTPUT_DIR / lang
+    shards = {}
+    for doc, (_, entry) in enumerate(pages):
+        for term, score in entry["terms"].items():
+            shards.setdefault(term[:PREFIX_LENGTH], {}).setdefault(term, []).extend((doc, score))
+
+    written, hashes = [], {}
+    for prefix, terms in sorted(shards.items()):
+        raw = compact(terms)
+        hashes[prefix] = hashlib.sha256(raw).hexdigest()[:10]
+        if write_if_changed(out_dir / f"{prefix}.json", raw):
+            written.append(f"{lang}/{prefix}.json")
+    removed = []
+    if out_dir.is_dir():
+        for path in out_dir.glob("*.json"):
+            if path.stem != "manifest" and path.stem not in shards:
+                path.unlink()
+                removed.append(f"{lang}/{path.name}")
+
+    manifest = {
+        "version": INDEX_VERSION,
+        "prefix_length": PREFIX_LENGTH,
+        "min_length": MIN_TERM_LENGTH,
+        "docs": [{"path": rel, "summary": entry["summary"]} for rel, entry in pages],
+        "shards": hashes,
+    }
+    if write_if_changed(out_dir / "manifest.json", compact(manifest)):
+        written.append(f"{lang}/manifest.json")
+    stats = {
+        "docs": len(pages),
+        "terms": sum(len(terms) for terms in shards.values()),
+        "shards": len(shards),
+        "bytes": sum(p.stat().st_size for p in out_dir.glob("*.json")),
+    }
+    return written, removed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index de recherche inversé et shardé de content/**")
+    parser.add_argument("--force", action="store_true", help="Relit toutes les pages (ignore le cache)")
+    parser.add_argument("--stats", action="store_true", help="Affiche la taille de l'index par langue")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    previous = load_cache(args.force)
+    cache, reread = {}, 0
+    for path in content_pages():
+        rel = path.relative_to(CONTENT_DIR).as_posix()
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        cached = previous.get(rel)
+        if cached and cached["sha256"] == digest:
+            cache[rel] = cached
+            continue
+        reread += 1
+        entry = index_page(raw.decode("utf-8"))
+        cache[rel] = {"sha256": digest, "lang": page_language(path), "entry": entry}
+
+    by_lang = {}
+    for rel, cached in cache.items():
+        if cached["entry"] is not None:
+            by_lang.setdefault(cached["lang"], []).append((rel, cached["entry"]))
+    written, removed, stats = [], [], {}
+    for lang, pages in sorted(by_lang.items()):
+        w, r, stats[lang] = build_language(lang, pages)
+        written += w
+        removed += r
+    if OUTPUT_DIR.is_dir():
+        for lang_dir in OUTPUT_DIR.iterdir():
+            if lang_dir.is_dir() and lang_dir.name not in by_lang:
+                for path in lang_dir.glob("*.json"):
+                    path.unlink()
+                    removed.append(f"{lang_dir.name}/{path.name}")
+                lang_dir.rmdir()
+
+    write_if_changed(CACHE_PATH, compact({"version": INDEX_VERSION, "files": cache}))
+    print(f"🔎 {len(cache)} page(s), {reread} relue(s) ; {len(written)} fichier(s) d'index écrit(s)"
+          f"{f', {len(removed)} supprimé(s)' if removed else ''} en {time.perf_counter() - started:.2f}s")
+    if args.stats:
+        for lang, s in stats.items():
+            print(f"   {lang}: {s['docs']} pages, {s['terms']} termes, {s['shards']} shards, {s['bytes'] / 1024:.1f} Ko")
+
+
+if __name__ == "__main__":
+    main()
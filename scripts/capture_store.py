@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Stockage des captures HTML de debug (ROOTME_DEBUG_HTML=1).
+
+Les corps sont dédupliqués par hash (sha256), compressés en gzip et rangés
+dans objects/<2 premiers caractères>/<hash>.html.gz. Un index JSON garde une
+entrée par (url, hash) : kind, ident, status, erreur, première/dernière vue et
+nombre de captures. Au-delà de la taille maximale, les entrées les plus
+anciennes (dernière vue) sont évincées avec les objets qui ne sont plus
+référencés.
+
+Usage:
+    python3 scripts/capture_store.py stats
+    python3 scripts/capture_store.py latest https://www.root-me.org/fr/Challenges/...
+    python3 scripts/capture_store.py import .debug/rootme   # anciens fichiers page_*.html
+    python3 scripts/capture_store.py gc --max-mb 10
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_ROOT = Path(__file__).parent.parent / ".debug" / "rootme" / "captures"
+DEFAULT_MAX_BYTES = int(float(os.environ.get("ROOTME_DEBUG_MAX_MB", "20")) * 1024 * 1024)
+MAX_ENTRIES = 5000
+
+LEGACY_HEADER = re.compile(r"^<!-- url: (\S+) status: (\S+) -->\n?")
+LEGACY_NAME = re.compile(r"^(page|error)_(.+)_(\d{8}-\d{6})$")
+
+
+def now_iso():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class CaptureStore:
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.index_path = self.root / "index.json"
+        self.lock = threading.Lock()
+        self.entries = []
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f).get("entries", [])
+            except (OSError, ValueError):
+                self.entries = []
+
+    def _object_path(self, digest):
+        return self.root / "objects" / digest[:2] / f"{digest}.html.gz"
+
+    def _save_index(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "entries": self.entries}, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, self.index_path)
+
+    def add(self, kind, ident, url, html=None, status=None, error=None, seen=None):
+        """Enregistre une capture ; un corps déjà connu n'est pas réécrit."""
+        seen = seen or now_iso()
+        digest = None
+        size = 0
+        with self.lock:
+            if html is not None:
+                body = html.encode("utf-8")
+                digest = hashlib.sha256(body).hexdigest()
+                path = self._object_path(digest)
+                if not path.exists():
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = path.with_suffix(".tmp")
+                    with gzip.open(tmp, "wb", compresslevel=6) as f:
+                        f.write(body)
+                    os.replace(tmp, path)
+                size = path.stat().st_size
+            error = str(error) if error else None
+            for entry in self.entries:
+                if entry["url"] == url and entry["hash"] == digest and entry["error"] == error:
+                    entry["last_seen"] = max(entry["last_seen"], seen)
+                    entry["first_seen"] = min(entry["first_seen"], seen)
+                    entry["count"] += 1
+                    entry["status"] = status
+                    break
+            else:
+                self.entries.append({
+                    "url": url,
+                    "hash": digest,
+                    "kind": kind,
+                    "ident": str(ident),
+                    "status": status,
+                    "error": error,
+                    "size": size,
+                    "first_seen": seen,
+                    "last_seen": seen,
+                    "count": 1,
+                })
+            self._evict()
+            self._save_index()
+        return digest
+
+    def _evict(self):
+        """Évince les entrées les plus anciennes au-delà de max_bytes / MAX_ENTRIES."""
+        self.entries.sort(key=lambda entry: entry["last_seen"])
+        sizes = {e["hash"]: e["size"] for e in self.entries if e["hash"]}
+        total = sum(sizes.values())
+        refs = {}
+        for entry in self.entries:
+            if entry["hash"]:
+                refs[entry["hash"]] = refs.get(entry["hash"], 0) + 1
+        while self.entries and (total > self.max_bytes or len(self.entries) > MAX_ENTRIES):
+            entry = self.entries.pop(0)
+            digest = entry["hash"]
+            if not digest:
+                continue
+            refs[digest] -= 1
+            if refs[digest] == 0:
+                total -= sizes[digest]
+                try:
+                    self._object_path(digest).unlink()
+                except FileNotFoundError:
+                    pass
+
+    def read(self, entry):
+        """Retourne le HTML d'une entrée (None pour une erreur sans corps)."""
+        if not entry or not entry.get("hash"):
+            return None
+        with gzip.open(self._object_path(entry["hash"]), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def latest(self, url, with_body=True):
+        """Dernière capture avec corps pour `url` : (entrée, html) ou (None, None)."""
+        with self.lock:
+            candidates = [e for e in self.entries if e["url"] == url and e["hash"]]
+        if not candidates:
+            return None, None
+        entry = max(candidates, key=lambda e: e["last_seen"])
+        return entry, self.read(entry) if with_body else None
+
+    def latest_by_url(self, kind=None):
+        """{url: entrée} de la capture la plus récente de chaque URL."""
+        result = {}
+        with self.lock:
+            for entry in self.entries:
+                if not entry["hash"] or (kind and entry["kind"] != kind):
+                    continue
+                current = result.get(entry["url"])
+                if current is None or entry["last_seen"] >= current["last_seen"]:
+                    result[entry["url"]] = entry
+        return result
+
+    def stats(self):
+        with self.lock:
+            hashes = {e["hash"]: e["size"] for e in self.entries if e["hash"]}
+            return {
+                "entries": len(self.entries),
+                "objects": len(hashes),
+                "bytes": sum(hashes.values()),
+                "captures": sum(e["count"] for e in self.entries),
+                "urls": len({e["url"] for e in self.entries}),
+            }
+
+    def gc(self):
+        """Applique la limite et supprime les objets orphelins."""
+        with self.lock:
+            self._evict()
+            self._save_index()
+            live = {e["hash"] for e in self.entries if e["hash"]}
+        removed = 0
+        for path in (self.root / "objects").glob("*/*.html.gz"):
+            if path.name[: -len(".html.gz")] not in live:
+                path.unlink()
+                removed += 1
+        return removed
+
+    def import_legacy(self, directory):
+        """Importe les anciens fichiers <kind>_<ident>_<ts>.html écrits par debug_dump."""
+        imported = 0
+        for path in sorted(Path(directory).glob("*.html")):
+            m = LEGACY_NAME.match(path.stem)
+            raw = path.read_text(encoding="utf-8", errors="replace")
+            header = LEGACY_HEADER.match(raw)
+            if not m or not header:
+                continue
+            kind, ident, ts = m.groups()
+            status = int(header.group(2)) if header.group(2).isdigit() else None
+            seen = datetime.strptime(ts, "%Y%m%d-%H%M%S").isoformat()
+            self.add(kind, ident, header.group(1), html=raw[header.end():], status=status, seen=seen)
+            imported += 1
+        return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Captures HTML de debug (dédupliquées, compressées)")
+    parser.add_argument("--root", default=os.environ.get("ROOTME_CAPTURE_DIR", str(DEFAULT_ROOT)))
+    parser.add_argument("--max-mb", type=float, help="Taille maximale du stockage (Mo)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Résumé du stockage")
+    latest = sub.add_parser("latest", help="Affiche la dernière capture d'une URL")
+    latest.add_argument("url")
+    legacy = sub.add_parser("import", help="Importe les anciens fichiers .html de debug_dump")
+    legacy.add_argument("directory")
+    sub.add_parser("gc", help="Applique la limite de taille et supprime les orphelins")
+    args = parser.parse_args()
+
+    max_bytes = int(args.max_mb * 1024 * 1024) if args.max_mb else DEFAULT_MAX_BYTES
+    store = CaptureStore(args.root, max_bytes)
+
+    if args.command == "stats":
+        s = store.stats()
+        print(f"📦 {s['entries']} entrées, {s['urls']} URL, {s['objects']} objets "
+              f"({s['bytes'] / 1024:.1f} KiB), {s['captures']} captures")
+    elif args.command == "latest":
+        entry, html = store.latest(args.url)
+        if entry is None:
+            print(f"❌ Aucune capture pour {args.url}", file=sys.stderr)
+            sys.exit(1)
+        print(f"<!-- url: {entry['url']} status: {entry['status']} seen: {entry['last_seen']} -->")
+        print(html)
+    elif args.command == "import":
+        print(f"✅ {store.import_legacy(args.directory)} fichier(s) importé(s)")
+    elif args.command == "gc":
+        print(f"🧹 {store.gc()} objet(s) orphelin(s) supprimé(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Agrégats du catalogue Root-Me pour les widgets et pages de section
+(data/rootme_stats.json).
+
+Calculés une fois par run de fetch-rootme.py plutôt qu'en parcourant toutes
+les données de challenges dans les templates à chaque page :
+- total       : nombre de challenges et points cumulés
+- by_rubrique : challenges et points par rubrique (du plus fourni au moins fourni)
+- by_difficulty : challenges et points par difficulté (du plus facile au plus dur)
+- rarest      : challenges résolus les moins validés sur Root-Me
+- recent      : derniers challenges résolus (date du writeup dans le frontmatter)
+"""
+
+from display import DIFFICULTY_EN, DIFFICULTY_LEVELS, RUBRIQUE_EN
+
+TOP_RAREST = 5
+TOP_RECENT = 5
+
+
+def _entry(slug, challenge, **extra):
+    return {
+        "slug": slug,
+        "titre": challenge.get("titre"),
+        "rubrique": challenge.get("rubrique"),
+        "score": challenge.get("score") or 0,
+        "validations": challenge.get("validations") or 0,
+        "url": challenge.get("url"),
+        **extra,
+    }
+
+
+def compute_stats(challenges, solved_dates=None, rarest=TOP_RAREST, recent=TOP_RECENT):
+    """challenges : {slug: challenge (format data/rootme_challenges.json)} ; solved_dates : {slug: "YYYY-MM-DD"}."""
+    solved_dates = solved_dates or {}
+    by_rubrique = {}
+    by_difficulty = {}
+    total_points = 0
+    for challenge in challenges.values():
+        score = challenge.get("score") or 0
+        total_points += score
+        rubrique = challenge.get("rubrique") or "Autre"
+        row = by_rubrique.setdefault(rubrique, {"rubrique": rubrique, "rubrique_en": RUBRIQUE_EN.get(rubrique, rubrique),
+                                                "count": 0, "points": 0})
+        row["count"] += 1
+        row["points"] += score
+        difficulte = challenge.get("difficulte") or "Inconnu"
+        row = by_difficulty.setdefault(difficulte, {"difficulte": difficulte,
+                                                    "difficulte_en": DIFFICULTY_EN.get(difficulte, difficulte),
+                                                    "level": DIFFICULTY_LEVELS.get(difficulte, 0),
+                                                    "count": 0, "points": 0})
+        row["count"] += 1
+        row["points"] += score
+
+    validated = [(slug, c) for slug, c in challenges.items() if (c.get("validations") or 0) > 0]
+    validated.sort(key=lambda item: (item[1]["validations"], item[0]))
+    dated = [(solved_dates[slug], slug) for slug in challenges if solved_dates.get(slug)]
+    dated.sort(reverse=True)
+
+    return {
+        "total": {"challenges": len(challenges), "points": total_points},
+        "by_rubrique": sorted(by_rubrique.values(), key=lambda row: (-row["count"], -row["points"], row["rubrique"])),
+        "by_difficulty": sorted(by_difficulty.values(), key=lambda row: (row["level"] or 99, row["difficulte"])),
+        "rarest": [_entry(slug, challenge) for slug, challenge in validated[:rarest]],
+        "recent": [_entry(slug, challenges[slug], date=date) for date, slug in dated[:recent]],
+    }
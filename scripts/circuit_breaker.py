@@ -0,0 +1,207 @@
+"""
+Disjoncteurs par hôte (api.www.root-me.org, www.root-me.org, sadservers.com).
+
+Chaque hôte a son disjoncteur à trois états :
+- closed    : les requêtes passent ; FAILURE_THRESHOLD échecs consécutifs
+              (429, 5xx, timeout, connexion refusée) l'ouvrent ;
+- open      : les requêtes échouent immédiatement, sans réseau ni pause,
+              pendant la durée de refroidissement (Retry-After si l'hôte en
+              donne un, sinon COOLDOWN, doublée à chaque sonde ratée) ;
+- half_open : à la fin du refroidissement, une seule requête sonde passe ;
+              succès -> closed, échec -> open.
+
+Un 401/429 de l'API ouvre le disjoncteur d'un coup (trip) au lieu de
+désactiver l'API pour tout le run. Les transitions sont affichées au moment
+où elles se produisent et conservées pour le résumé du run.
+
+    breakers = BreakerRegistry(on_transition=print_transition)   # un registre par script
+    breaker = breakers.for_url(url)
+    if not breaker.allow():
+        return None                    # échec immédiat
+    ... requête ...
+    breaker.record_status(503, retry_after=30) / breaker.record_failure("timeout")
+"""
+
+import threading
+import time
+import urllib.error
+from urllib.parse import urlsplit
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+FAILURE_THRESHOLD = 3
+COOLDOWN = 60.0
+MAX_COOLDOWN = 600.0
+
+# Statuts qui ouvrent le disjoncteur dès la première occurrence
+TRIP_STATUSES = ()
+
+# Réglages par hôte (les autres hôtes, ex. stand-in local, prennent les valeurs par défaut)
+HOSTS = {
+    # 401 (clé refusée) et 429 (quota) : inutile d'insister jusqu'à la prochaine sonde
+    "api.www.root-me.org": {"failure_threshold": 2, "cooldown": 120.0, "trip_statuses": (401, 429)},
+    "www.root-me.org": {"failure_threshold": 3, "cooldown": 60.0},
+    "sadservers.com": {"failure_threshold": 3, "cooldown": 60.0},
+}
+
+
+class CircuitOpenError(urllib.error.URLError):
+    """Requête refusée sans réseau : le disjoncteur de l'hôte est ouvert."""
+
+    def __init__(self, host, retry_in):
+        super().__init__(f"circuit ouvert pour {host} (sonde dans {retry_in:.0f}s)")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    def __init__(self, host, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN, max_cooldown=MAX_COOLDOWN,
+                 trip_statuses=TRIP_STATUSES, clock=time.monotonic, on_transition=None):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.trip_statuses = tuple(trip_statuses)
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self.on_transition = on_transition
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.cooldown = cooldown
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.rejected = 0
+        self.transitions = []
+
+    def _move(self, state, reason):
+        previous, self.state = self.state, state
+        event = {"host": self.host, "from": previous, "to": state, "reason": reason,
+                 "at": time.time(), "cooldown_s": self.cooldown if state == OPEN else None}
+        self.transitions.append(event)
+        if self.on_transition:
+            self.on_transition(event)
+
+    def _open(self, reason, retry_after=None):
+        if self.state == HALF_OPEN:
+            # Sonde ratée : refroidissement doublé
+            self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+        if retry_after:
+            self.cooldown = min(self.max_cooldown, max(self.cooldown, float(retry_after)))
+        self.opened_at = self.clock()
+        self.probe_in_flight = False
+        self._move(OPEN, reason)
+
+    def retry_in(self):
+        """Secondes avant la prochaine sonde (0 si le disjoncteur n'est pas ouvert)."""
+        with self.lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self.opened_at + self.cooldown - self.clock())
+
+    def is_open(self):
+        """Vrai si une requête serait refusée maintenant (sans consommer la sonde)."""
+        with self.lock:
+            if self.state == OPEN:
+                return self.clock() - self.opened_at < self.cooldown
+            return self.state == HALF_OPEN and self.probe_in_flight
+
+    def allow(self):
+        """Autorise une requête ; en half-open, une seule sonde à la fois."""
+        with self.lock:
+            if self.state == OPEN:
+                if self.clock() - self.opened_at < self.cooldown:
+                    self.rejected += 1
+                    return False
+                self._move(HALF_OPEN, "fin du refroidissement")
+            if self.state == HALF_OPEN:
+                if self.probe_in_flight:
+                    self.rejected += 1
+                    return False
+                self.probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.probe_in_flight = False
+            if self.state != CLOSED:
+                self.cooldown = self.base_cooldown
+                self._move(CLOSED, "sonde réussie")
+
+    def record_failure(self, reason, retry_after=None, trip=False):
+        """Échec imputable à l'hôte ; `trip` ouvre immédiatement (401, 429)."""
+        with self.lock:
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                self._open(f"sonde ratée ({reason})", retry_after)
+            elif self.state == CLOSED and (trip or self.failures >= self.failure_threshold):
+                self._open(reason if trip else f"{self.failures} échecs consécutifs ({reason})", retry_after)
+            elif self.state == OPEN and retry_after:
+                self.cooldown = min(self.max_cooldown, max(self.cooldown, float(retry_after)))
+
+    def check(self):
+        """Comme allow(), mais lève CircuitOpenError si la requête est refusée."""
+        if not self.allow():
+            raise CircuitOpenError(self.host, self.retry_in())
+
+    def record_status(self, status, retry_after=None):
+        """Verdict d'une réponse HTTP : 429/5xx sont des échecs de l'hôte, le reste prouve qu'il répond."""
+        if status in self.trip_statuses:
+            self.record_failure(str(status), retry_after=retry_after, trip=True)
+        elif status == 429 or status >= 500:
+            self.record_failure(str(status), retry_after=retry_after)
+        else:
+            self.record_success()
+
+    def release(self):
+        """Libère la sonde sans verdict (réponse ni succès ni échec de l'hôte)."""
+        with self.lock:
+            self.probe_in_flight = False
+
+    def summary(self):
+        with self.lock:
+            return {"state": self.state, "failures": self.failures, "rejected": self.rejected,
+                    "transitions": len(self.transitions)}
+
+
+class BreakerRegistry:
+    """Un disjoncteur par hôte, créé à la première requête."""
+
+    def __init__(self, hosts=HOSTS, on_transition=None, clock=time.monotonic):
+        self.hosts = hosts
+        self.on_transition = on_transition
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.breakers = {}
+
+    def get(self, host):
+        host = (host or "").lower()
+        with self.lock:
+            breaker = self.breakers.get(host)
+            if breaker is None:
+                breaker = self.breakers[host] = CircuitBreaker(host, clock=self.clock, on_transition=self.on_transition,
+                                                               **self.hosts.get(host, {}))
+            return breaker
+
+    def for_url(self, url):
+        return self.get(urlsplit(url).hostname)
+
+    def rejected(self):
+        return sum(breaker.rejected for breaker in list(self.breakers.values()))
+
+    def transitions(self):
+        events = [event for breaker in list(self.breakers.values()) for event in breaker.transitions]
+        return sorted(events, key=lambda event: event["at"])
+
+    def summary(self):
+        """{hôte: état} des disjoncteurs qui ont refusé des requêtes ou changé d'état."""
+        return {host: breaker.summary() for host, breaker in sorted(self.breakers.items())
+                if breaker.transitions or breaker.rejected}
+
+
+def print_transition(event):
+    detail = f" — pause {event['cooldown_s']:.0f}s" if event["to"] == OPEN else ""
+    print(f"🔌 {event['host']} : {event['from']} → {event['to']} ({event['reason']}){detail}")
+
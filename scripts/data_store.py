@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Stockage local SQLite des données du site (challenges Root-Me, scénarios
+SadServers, instantanés du profil).
+
+La base est la source de vérité pendant les runs : les scripts y font des
+upserts transactionnels (une ligne par challenge, pas de réécriture de tout
+le catalogue) et des recherches indexées par slug, id ou rubrique. Les
+fichiers data/*.json lus par Hugo sont des exports, réécrits seulement si
+leur contenu change ; challenges et scénarios y reçoivent leurs champs
+d'affichage précalculés (display.py).
+
+En disposition "sharded" (ROOTME_DATA_LAYOUT=sharded ou --layout sharded),
+challenges et scénarios sont exportés à raison d'un fichier par entrée
+(data/rootme_challenges/<slug>.json) : Hugo expose le dossier sous la même
+clé (.Site.Data.rootme_challenges.<slug>), seuls les fichiers modifiés sont
+réécrits et un commit du bot ne touche que les entrées qui ont changé.
+
+Les JSON restent versionnés dans git : à l'ouverture, un fichier dont le hash
+diffère de celui du dernier export (git pull, édition manuelle) est réimporté.
+La base peut donc être supprimée sans perte (.store/ n'est pas versionné).
+
+Usage:
+    python3 scripts/data_store.py stats
+    python3 scripts/data_store.py get ftp-authentification
+    python3 scripts/data_store.py get --id 5
+    python3 scripts/data_store.py export
+    python3 scripts/data_store.py --layout sharded export   # conversion en un fichier par entrée
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from display import with_display
+
+DEFAULT_DATA_DIR = Path(__file__).parent.parent / "data"
+DEFAULT_LAYOUT = os.environ.get("ROOTME_DATA_LAYOUT", "single")
+LAYOUTS = ("single", "sharded")
+
+# Export -> fichier de data/
+FILES = {
+    "profile": "rootme.json",
+    "challenges": "rootme_challenges.json",
+    "scenarios": "sadservers_scenarios.json",
+}
+SHARDABLE = ("challenges", "scenarios")
+# Agrégats calculés par les scripts (pas de table, pas de réimport)
+DERIVED = {
+    "stats": "rootme_stats.json",
+}
+SHARD_NAME = re.compile(r"^[A-Za-z0-9_][A-Za-z0-9_.-]*$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS challenges (
+    slug TEXT PRIMARY KEY,
+    id TEXT,
+    rubrique TEXT,
+    pos INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS challenges_id ON challenges (id);
+CREATE INDEX IF NOT EXISTS challenges_rubrique ON challenges (rubrique);
+CREATE TABLE IF NOT EXISTS scenarios (
+    slug TEXT PRIMARY KEY,
+    niveau TEXT,
+    pos INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profiles (
+    ts REAL PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exports (
+    name TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shards (
+    name TEXT NOT NULL,
+    slug TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (name, slug)
+);
+"""
+
+
+def default_db_path(data_dir):
+    return Path(os.environ.get("ROOTME_STORE_DB") or Path(data_dir).parent / ".store" / "rootme.sqlite")
+
+
+def dumps(data):
+    """Sérialisation des fichiers data/*.json (identique à json.dump(..., indent=2))."""
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def sha256(raw):
+    return hashlib.sha256(raw).hexdigest()
+
+
+def shards_digest(digests):
+    """Hash d'un dossier de shards : {slug: sha256 du fichier} -> sha256 (indépendant de l'ordre)."""
+    return sha256("".join(f"{slug}\0{digest}\n" for slug, digest in sorted(digests.items())).encode())
+
+
+class DataStore:
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, path=None, layout=DEFAULT_LAYOUT):
+        if layout not in LAYOUTS:
+            raise ValueError(f"Disposition inconnue : {layout!r} (attendu : {', '.join(LAYOUTS)})")
+        self.data_dir = Path(data_dir)
+        self.layout = layout
+        self.path = Path(path) if path else default_db_path(self.data_dir)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        # WAL : un upsert par challenge reste peu coûteux (pas de fsync complet à chaque commit)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.imported = self.sync_from_json()
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Synchronisation avec data/*.json ---
+
+    def _export_hash(self, name):
+        row = self.db.execute("SELECT sha256 FROM exports WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_export_hash(self, name, digest):
+        self.db.execute("INSERT OR REPLACE INTO exports (name, sha256) VALUES (?, ?)", (name, digest))
+
+    def shard_dir(self, name):
+        return self.data_dir / Path(FILES[name]).stem
+
+    def _read_source(self, name):
+        """(hash, lecteur, {slug: hash} des shards ou None) de la source actuelle de `name`.
+
+        Si les deux existent (conversion en cours), la disposition configurée l'emporte.
+        """
+        path = self.data_dir / FILES[name]
+        shard_dir = self.shard_dir(name) if name in SHARDABLE else None
+        shards = sorted(shard_dir.glob("*.json")) if shard_dir and shard_dir.is_dir() else []
+        if shards and (self.layout == "sharded" or not path.exists()):
+            raws = {shard.stem: shard.read_bytes() for shard in shards}
+            digests = {slug: sha256(raw) for slug, raw in raws.items()}
+            return (shards_digest(digests),
+                    lambda: {slug: json.loads(raw.decode("utf-8")) for slug, raw in raws.items()}, digests)
+        if path.exists():
+            raw = path.read_bytes()
+            return sha256(raw), lambda: json.loads(raw.decode("utf-8")), None
+        return None, None, None
+
+    def sync_from_json(self):
+        """Réimporte les fichiers data/*.json (ou shards) modifiés hors de la base ; retourne leurs noms."""
+        imported = []
+        for name, filename in FILES.items():
+            digest, read, shard_digests = self._read_source(name)
+            if digest is None or digest == self._export_hash(name):
+                continue
+            try:
+                data = read()
+            except ValueError as e:
+                print(f"⚠️ {filename} illisible, non importé : {e}")
+                continue
+            with self.db:
+                if name == "profile":
+                    self.add_profile(data, commit=False)
+                elif name == "challenges":
+                    self.db.execute("DELETE FROM challenges")
+                    self._upsert_challenges(data)
+                else:
+                    self.db.execute("DELETE FROM scenarios")
+                    self._upsert_scenarios(data)
+                self._set_export_hash(name, digest)
+                self.db.execute("DELETE FROM shards WHERE name = ?", (name,))
+                if shard_digests:
+                    self.db.executemany("INSERT INTO shards (name, slug, sha256) VALUES (?, ?, ?)",
+                                        [(name, slug, d) for slug, d in shard_digests.items()])
+            imported.append(name)
+        return imported
+
+    def export(self, names=None):
+        """Écrit les fichiers data/*.json dont le contenu a changé ; retourne les chemins écrits ou supprimés."""
+        written = []
+        for name in names or FILES:
+            if name in SHARDABLE:
+                data = self.challenges() if name == "challenges" else self.scenarios()
+                # Champs d'affichage localisés recalculés à chaque export (display.py)
+                data = {slug: with_display(item, name) for slug, item in data.items()}
+                if self.layout == "sharded":
+                    written.extend(self._export_shards(name, data))
+                    continue
+                written.extend(self._remove_shards(name))
+            if name == "profile":
+                data = self.profile()
+                if data is None:
+                    continue
+            raw = dumps(data).encode("utf-8")
+            path = self.data_dir / FILES[name]
+            if path.exists() and path.read_bytes() == raw:
+                if self._export_hash(name) != sha256(raw):
+                    with self.db:
+                        self._set_export_hash(name, sha256(raw))
+                continue
+            self._write(path, raw)
+            with self.db:
+                self._set_export_hash(name, sha256(raw))
+            written.append(path)
+        return written
+
+    def export_derived(self, name, data):
+        """Écrit data/<DERIVED[name]> si son contenu change ; retourne le chemin écrit ou None."""
+        raw = dumps(data).encode("utf-8")
+        path = self.data_dir / DERIVED[name]
+        if path.exists() and path.read_bytes() == raw:
+            return None
+        self._write(path, raw)
+        return path
+
+    def _write(self, path, raw):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(raw)
+        os.replace(tmp, path)
+
+    def _export_shards(self, name, data):
+        """Un fichier par entrée ; seuls les shards dont le hash a changé sont réécrits."""
+        shard_dir = self.shard_dir(name)
+        known = dict(self.db.execute("SELECT slug, sha256 FROM shards WHERE name = ?", (name,)))
+        digests = {}
+        changed = []
+        for slug, item in data.items():
+            if not SHARD_NAME.match(slug):
+                print(f"⚠️ Slug {slug!r} inutilisable comme nom de fichier, entrée ignorée")
+                continue
+            raw = dumps(item).encode("utf-8")
+            digest = digests[slug] = sha256(raw)
+            path = shard_dir / f"{slug}.json"
+            if known.get(slug) != digest or not path.exists():
+                self._write(path, raw)
+                changed.append(path)
+        removed = []
+        if shard_dir.is_dir():
+            for path in shard_dir.glob("*.json"):
+                if path.stem not in digests:
+                    path.unlink()
+                    removed.append(path)
+        single = self.data_dir / FILES[name]
+        if single.exists():
+            single.unlink()
+            removed.append(single)
+        with self.db:
+            self.db.execute("DELETE FROM shards WHERE name = ?", (name,))
+            self.db.executemany("INSERT INTO shards (name, slug, sha256) VALUES (?, ?, ?)",
+                                [(name, slug, digest) for slug, digest in digests.items()])
+            self._set_export_hash(name, shards_digest(digests))
+        return changed + removed
+
+    def _remove_shards(self, name):
+        """Retour à la disposition "single" : supprime les shards de `name`."""
+        shard_dir = self.shard_dir(name)
+        if not shard_dir.is_dir():
+            return []
+        removed = list(shard_dir.glob("*.json"))
+        for path in removed:
+            path.unlink()
+        if not any(shard_dir.iterdir()):
+            shard_dir.rmdir()
+        with self.db:
+            self.db.execute("DELETE FROM shards WHERE name = ?", (name,))
+        return removed
+
+    # --- Challenges ---
+
+    def _upsert_challenges(self, challenges):
+        next_pos = self.db.execute("SELECT COALESCE(MAX(pos), -1) + 1 FROM challenges").fetchone()[0]
+        rows = []
+        for i, (slug, data) in enumerate(challenges.items()):
+            rubrique = data.get("rubrique")
+            if isinstance(rubrique, dict):
+                rubrique = rubrique.get("titre")
+            rows.append((slug, str(data.get("id")) if data.get("id") is not None else None, rubrique,
+                         next_pos + i, json.dumps(data, ensure_ascii=False)))
+        # pos n'est fixée qu'à l'insertion : l'ordre des clés du JSON exporté reste stable
+        self.db.executemany(
+            "INSERT INTO challenges (slug, id, rubrique, pos, data) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (slug) DO UPDATE SET id = excluded.id, rubrique = excluded.rubrique, data = excluded.data",
+            rows,
+        )
+
+    def upsert_challenges(self, challenges):
+        """Insère ou met à jour {slug: challenge} en une transaction."""
+        with self.db:
+            self._upsert_challenges(challenges)
+
+    def retain_challenges(self, slugs):
+        """Supprime les challenges absents de `slugs` ; retourne le nombre supprimé."""
+        slugs = set(slugs)
+        existing = [row[0] for row in self.db.execute("SELECT slug FROM challenges")]
+        removed = [(slug,) for slug in existing if slug not in slugs]
+        with self.db:
+            self.db.executemany("DELETE FROM challenges WHERE slug = ?", removed)
+        return len(removed)
+
+    def challenge(self, slug):
+        row = self.db.execute("SELECT data FROM challenges WHERE slug = ?", (slug,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def challenge_by_id(self, challenge_id):
+        """(slug, challenge) pour un id Root-Me, ou (None, None)."""
+        row = self.db.execute("SELECT slug, data FROM challenges WHERE id = ? ORDER BY pos LIMIT 1",
+                              (str(challenge_id),)).fetchone()
+        return (row[0], json.loads(row[1])) if row else (None, None)
+
+    def find_challenge(self, slug=None, challenge_id=None):
+        """Recherche par slug puis, à défaut, par id (les deux indexés)."""
+        data = self.challenge(slug) if slug else None
+        if data is None and challenge_id is not None:
+            _, data = self.challenge_by_id(challenge_id)
+        return data
+
+    def challenges_by_rubrique(self, rubrique):
+        rows = self.db.execute("SELECT slug, data FROM challenges WHERE rubrique = ? ORDER BY pos", (rubrique,))
+        return {slug: json.loads(data) for slug, data in rows}
+
+    def challenges(self):
+        rows = self.db.execute("SELECT slug, data FROM challenges ORDER BY pos")
+        return {slug: json.loads(data) for slug, data in rows}
+
+    # --- Scénarios SadServers ---
+
+    def _upsert_scenarios(self, scenarios):
+        next_pos = self.db.execute("SELECT COALESCE(MAX(pos), -1) + 1 FROM scenarios").fetchone()[0]
+        self.db.executemany(
+            "INSERT INTO scenarios (slug, niveau, pos, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (slug) DO UPDATE SET niveau = excluded.niveau, data = excluded.data",
+            [(slug, data.get("niveau"), next_pos + i, json.dumps(data, ensure_ascii=False))
+             for i, (slug, data) in enumerate(scenarios.items())],
+        )
+
+    def upsert_scenario(self, slug, scenario):
+        with self.db:
+            self._upsert_scenarios({slug: scenario})
+
+    def scenario(self, slug):
+        row = self.db.execute("SELECT data FROM scenarios WHERE slug = ?", (slug,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def scenarios(self):
+        rows = self.db.execute("SELECT slug, data FROM scenarios ORDER BY pos")
+        return {slug: json.loads(data) for slug, data in rows}
+
+    # --- Profil ---
+
+    def add_profile(self, profile, ts=None, commit=True):
+        """Ajoute un instantané du profil (le plus récent est exporté dans rootme.json)."""
+        ts = ts if ts is not None else time.time()
+        last = self.db.execute("SELECT MAX(ts) FROM profiles").fetchone()[0]
+        if last is not None and ts <= last:
+            ts = last + 1e-6
+        query = ("INSERT INTO profiles (ts, data) VALUES (?, ?)", (ts, json.dumps(profile, ensure_ascii=False)))
+        if commit:
+            with self.db:
+                self.db.execute(*query)
+        else:
+            self.db.execute(*query)
+
+    def profile(self):
+        row = self.db.execute("SELECT data FROM profiles ORDER BY ts DESC LIMIT 1").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stats(self):
+        count = lambda table: self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]  # noqa: E731
+        return {
+            "challenges": count("challenges"),
+            "rubriques": self.db.execute("SELECT COUNT(DISTINCT rubrique) FROM challenges").fetchone()[0],
+            "scenarios": count("scenarios"),
+            "profiles": count("profiles"),
+            "bytes": self.path.stat().st_size,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stockage local SQLite des données du site")
+    parser.add_argument("--data-dir", default=str(DEFAULT_DATA_DIR))
+    parser.add_argument("--db", help="Base SQLite (défaut: .store/rootme.sqlite)")
+    parser.add_argument("--layout", choices=LAYOUTS, default=DEFAULT_LAYOUT,
+                        help="Export en fichier unique ou un fichier par entrée (défaut: ROOTME_DATA_LAYOUT)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Résumé de la base")
+    get = sub.add_parser("get", help="Affiche un challenge (par slug ou --id)")
+    get.add_argument("slug", nargs="?")
+    get.add_argument("--id")
+    rubrique = sub.add_parser("rubrique", help="Liste les challenges d'une rubrique")
+    rubrique.add_argument("name")
+    sub.add_parser("export", help="Réécrit les data/*.json modifiés")
+    args = parser.parse_args()
+
+    with DataStore(args.data_dir, args.db, layout=args.layout) as store:
+        if store.imported:
+            print(f"📥 Importé depuis data/ : {', '.join(store.imported)}")
+        if args.command == "stats":
+            s = store.stats()
+            print(f"🗄️ {s['challenges']} challenges ({s['rubriques']} rubriques), {s['scenarios']} scénarios, "
+                  f"{s['profiles']} instantané(s) de profil, {s['bytes'] / 1024:.1f} KiB ({store.path})")
+        elif args.command == "get":
+            data = store.find_challenge(args.slug, args.id)
+            if data is None:
+                print("❌ Challenge introuvable", file=sys.stderr)
+                sys.exit(1)
+            print(dumps(data))
+        elif args.command == "rubrique":
+            for slug, data in store.challenges_by_rubrique(args.name).items():
+                print(f"{slug:<40} #{data.get('id')}  {data.get('titre')}")
+        elif args.command == "export":
+            written = store.export()
+            print(f"✅ {len(written)} fichier(s) réécrit(s) ou supprimé(s)" if written else "⏭️ Aucun changement")
+            for path in written:
+                print(f"   💾 {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Champs d'affichage précalculés pour les shortcodes Hugo.
+
+Les traductions (difficulté, rubrique), le formatage des nombres et des dates
+et les barres de niveau sont calculés une fois à l'export des données plutôt
+qu'à chaque rendu par des chaînes de `if eq` dans les templates. Chaque
+entrée exportée reçoit une clé "display" :
+
+    "display": {
+        "level": 1, "bars_on": "■", "bars_off": "□□□□",
+        "fr": {"difficulte": "Très facile", "rubrique": "Réseau", "validations": "114 301", "date": "30/08/2010"},
+        "en": {"difficulte": "Very Easy", "rubrique": "Network", "validations": "114,301", "date": "Aug 30, 2010"}
+    }
+
+Le template fait alors `index $challenge.display .Site.Language.Lang`.
+"""
+
+from datetime import datetime
+
+LANGUAGES = ("fr", "en")
+
+DIFFICULTY_LEVELS = {
+    "Très facile": 1,
+    "Facile": 2,
+    "Moyen": 3,
+    "Difficile": 4,
+    "Très difficile": 5,
+}
+DIFFICULTY_EN = {
+    "Très facile": "Very Easy",
+    "Facile": "Easy",
+    "Moyen": "Medium",
+    "Difficile": "Hard",
+    "Très difficile": "Very Hard",
+    "Inconnu": "Unknown",
+}
+RUBRIQUE_EN = {
+    "Réseau": "Network",
+    "Programmation": "Programming",
+    "Web - Serveur": "Web - Server",
+    "Web - Client": "Web - Client",
+    "App - Système": "App - System",
+    "App - Script": "App - Script",
+    "Cryptanalyse": "Cryptanalysis",
+    "Forensic": "Forensics",
+    "Cracking": "Cracking",
+    "Réaliste": "Realist",
+    "Stéganographie": "Steganography",
+    "Autre": "Other",
+}
+MONTHS_EN = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+# Couleur du badge de niveau SadServers (ex-chaîne de if dans sadservers-scenario.html)
+SCENARIO_LEVEL_COLORS = {"Easy": "#4caf50", "Medium": "#ff9800", "Hard": "#f44336"}
+DEFAULT_LEVEL_COLOR = "#4caf50"
+
+
+def format_count(value, lang):
+    if not isinstance(value, int):
+        return str(value) if value not in (None, "") else ""
+    grouped = f"{value:,}"
+    return grouped.replace(",", " ") if lang == "fr" else grouped
+
+
+def format_date(value, lang):
+    """"2010-08-30 12:01:34" -> "30/08/2010" (fr) / "Aug 30, 2010" (en) ; inchangé si illisible."""
+    if not value:
+        return ""
+    try:
+        date = datetime.strptime(str(value)[:10], "%Y-%m-%d")
+    except ValueError:
+        return str(value)
+    if lang == "fr":
+        return date.strftime("%d/%m/%Y")
+    return f"{MONTHS_EN[date.month - 1]} {date.day}, {date.year}"
+
+
+def challenge_display(challenge):
+    difficulte = challenge.get("difficulte") or ""
+    rubrique = challenge.get("rubrique") or ""
+    level = DIFFICULTY_LEVELS.get(difficulte, 0)
+    # Difficulté inconnue : une barre pleine, comme l'ancien shortcode ("■□□□□")
+    bars = level or 1
+    display = {"level": level, "bars_on": "■" * bars, "bars_off": "□" * (5 - bars)}
+    for lang in LANGUAGES:
+        display[lang] = {
+            "difficulte": difficulte if lang == "fr" else DIFFICULTY_EN.get(difficulte, difficulte),
+            "rubrique": rubrique if lang == "fr" else RUBRIQUE_EN.get(rubrique, rubrique),
+            "validations": format_count(challenge.get("validations"), lang),
+            "date": format_date(challenge.get("date"), lang),
+        }
+    return display
+
+
+def scenario_display(scenario):
+    return {"color": SCENARIO_LEVEL_COLORS.get(scenario.get("niveau"), DEFAULT_LEVEL_COLOR)}
+
+
+def with_display(item, kind):
+    """Copie de l'entrée avec sa clé "display" recalculée (kind : "challenges" ou "scenarios")."""
+    compute = challenge_display if kind == "challenges" else scenario_display
+    return {**{k: v for k, v in item.items() if k != "display"}, "display": compute(item)}
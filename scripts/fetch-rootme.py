@@ -5,10 +5,17 @@ Script pour récupérer les données Root-Me via l'API.
 - Données des challenges
 
 Usage: python3 fetch-rootme.py
+       python3 fetch-rootme.py --profile [DOSSIER]   # profil CPU/mémoire par phase
+       python3 fetch-rootme.py --trace [FICHIER]     # timeline trace-event (chrome://tracing)
+       ROOTME_CASSETTE=.debug/rootme.cassette.json python3 fetch-rootme.py   # enregistre puis rejoue
 """
 
 import urllib.request
 import urllib.error
+import argparse
+import base64
+import contextlib
+import io
 import json
 import os
 import sys
@@ -16,7 +23,10 @@ import re
 import time
 import subprocess
 import socket
+import threading
+import http.client
 from http.client import IncompleteRead
+from urllib.parse import urlsplit
 from pathlib import Path
 from datetime import datetime
 from html import unescape
@@ -26,6 +36,11 @@ try:
     from bs4 import BeautifulSoup  # type: ignore
 except Exception:
     BeautifulSoup = None
+from catalogue_stats import compute_stats
+from circuit_breaker import BreakerRegistry, CircuitOpenError, print_transition
+from request_memo import RequestMemo, request_key, unique_urls
+import front_matter
+from records import ChallengeRecord, challenge_catalogue_merge, load_challenge_records
 
 # Configuration Root-Me
 ENV_FILE = Path(__file__).parent.parent / ".env"
@@ -60,23 +75,38 @@ def build_rootme_cookies(env):
     return "; ".join(parts)
 
 ROOTME_COOKIES = build_rootme_cookies(ENV)  # Cookies complets (e.g. "spip_session=...; api_key=...")
-ROOTME_PROFILE_URL = ENV.get("ROOTME_PROFILE_URL") or f"https://www.root-me.org/{ENV.get('ROOTME_USER', 'Alexandre-Froissart')}"
+# Bases d'URL (surchargées pour pointer vers un serveur local de test, cf. rootme-standin.py)
+ROOTME_BASE_URL = os.environ.get("ROOTME_BASE_URL", "https://www.root-me.org").rstrip("/")
+ROOTME_API_URL = os.environ.get("ROOTME_API_URL", "https://api.www.root-me.org").rstrip("/")
+ROOTME_PROFILE_URL = ENV.get("ROOTME_PROFILE_URL") or f"{ROOTME_BASE_URL}/{ENV.get('ROOTME_USER', 'Alexandre-Froissart')}"
 
 # Chemins
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR.parent / "data"
-PROFILE_FILE = DATA_DIR / "rootme.json"
-CHALLENGES_FILE = DATA_DIR / "rootme_challenges.json"
 CONTENT_DIR = SCRIPT_DIR.parent / "content" / "root-me-challenges"
+# Début du corps lu avec l'en-tête : le shortcode {{< rootme-challenge ... url="..." >}} suit le frontmatter
+SHORTCODE_LEAD = 1024
 ROOT_DIR = SCRIPT_DIR.parent
 DEFAULT_VENV_DIR = ROOT_DIR / ".venv-rootme"
 
-API_DISABLED = False
+# Disjoncteur par hôte (circuit_breaker.py) : échec immédiat tant qu'un hôte est en panne
+BREAKERS = BreakerRegistry(on_transition=print_transition)
+# Pages déjà récupérées pendant le run (request_memo.py) : une URL + en-têtes = un seul fetch réseau
+REQUEST_MEMO = RequestMemo()
 
 SCRAPE_DELAY_RANGE = (2.0, 4.0)
+API_DELAY = 2.0  # Pause avant chaque appel API (pagination agressive)
+API_MAX_RETRIES = 1  # Retries API sur 5xx/timeout (401/429 ouvrent le disjoncteur de l'API)
 DEBUG_HTML = os.environ.get("ROOTME_DEBUG_HTML", "0") == "1"
 DEBUG_DIR = Path(os.environ.get("ROOTME_DEBUG_DIR", str(ROOT_DIR / ".debug" / "rootme")))
 FORCE_HTML_VALIDATIONS = os.environ.get("ROOTME_FORCE_HTML_VALIDATIONS", "1") == "1"
+HISTORY_ENABLED = os.environ.get("ROOTME_HISTORY", "1") == "1"  # Historique des métriques (journal history/*.jsonl, metrics_store.py)
+# Cassette record/replay : ROOTME_CASSETTE=fichier.json, ROOTME_CASSETTE_MODE=record|replay
+# (défaut : replay si le fichier existe, sinon record)
+CASSETTE_PATH = os.environ.get("ROOTME_CASSETTE")
+CASSETTE_MODE = os.environ.get("ROOTME_CASSETTE_MODE") or (
+    "replay" if CASSETTE_PATH and Path(CASSETTE_PATH).exists() else "record"
+)
 
 # NOTE: On ne définit plus les challenges ici, on les détecte dans /content/root-me-challenges/*/index.md
 # via la clé 'rootme_id' dans le frontmatter.
@@ -120,6 +150,15 @@ CATEGORY_TO_SEGMENT = {
 
 _BS4_WARNED = False
 
+# Profilage par phase (--profile) : PhaseProfiler de profiling.py, sinon None
+PROFILER = None
+# Timeline trace-event (--trace) : TraceRecorder de profiling.py, sinon None
+TRACER = None
+
+# Métriques par requête (rapportées par generate_summary)
+REQUEST_METRICS = []
+PHASE_TIMINGS = {"network": 0.0, "backoff": 0.0, "sleep": 0.0, "parse": 0.0}
+
 
 def _in_venv(target_path):
     try:
@@ -213,7 +252,7 @@ def build_pretty_profile_url(name):
     slug = build_profile_slug(name)
     if not slug:
         return None
-    return f"https://www.root-me.org/{slug}?lang=fr"
+    return f"{ROOTME_BASE_URL}/{slug}?lang=fr"
 
 
 def safe_get_text(node):
@@ -239,26 +278,24 @@ def normalize_category_key(text):
     return raw
 
 
-def _safe_filename(text):
-    return re.sub(r"[^a-zA-Z0-9._-]+", "_", str(text)).strip("_")
+_CAPTURE_STORE = None
+
+
+def capture_store():
+    """Stockage des captures de debug (créé au premier usage)."""
+    global _CAPTURE_STORE
+    if _CAPTURE_STORE is None:
+        from capture_store import CaptureStore
+        _CAPTURE_STORE = CaptureStore(DEBUG_DIR / "captures")
+    return _CAPTURE_STORE
 
 
 def debug_dump(kind, ident, url, html=None, status=None, error=None):
+    """Archive la page (ou l'erreur) dans le stockage de captures si ROOTME_DEBUG_HTML=1."""
     if not DEBUG_HTML:
         return
     try:
-        DEBUG_DIR.mkdir(parents=True, exist_ok=True)
-        ts = datetime.now().strftime("%Y%m%d-%H%M%S")
-        base = _safe_filename(f"{kind}_{ident}_{ts}")
-        if html is not None:
-            path = DEBUG_DIR / f"{base}.html"
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(f"<!-- url: {url} status: {status} -->\n")
-                f.write(html)
-        if error:
-            path = DEBUG_DIR / f"{base}.log"
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(f"url: {url}\nstatus: {status}\nerror: {error}\n")
+        capture_store().add(kind, ident, url, html=html, status=status, error=error)
     except Exception:
         pass
 
@@ -381,12 +418,42 @@ def parse_profile_score_html(html, result):
     return result
 
 
+def profile_headers():
+    """En-têtes des pages de profil (identiques partout pour partager REQUEST_MEMO)."""
+    headers = {"User-Agent": "Mozilla/5.0", "Accept-Encoding": "identity"}
+    if ROOTME_COOKIES:
+        headers["Cookie"] = ROOTME_COOKIES
+    return headers
+
+
+RANK_PATTERNS = (
+    # Format: classement.svg...'/>&nbsp;274734
+    r"classement\.svg[^/]*/>\s*&nbsp;\s*(\d+)",
+    r"classement\.svg[^/]*/>&nbsp;(\d+)",
+    r"classement\.svg[^>]*>\s*&nbsp;\s*(\d+)",
+    r"classement\.svg.*?(\d{4,})",
+)
+
+
+def parse_rank_html(html):
+    """Rang extrait d'une page de profil public (None si absent ou invalide)."""
+    if not html or "classement.svg" not in html:
+        return None
+    for pattern in RANK_PATTERNS:
+        m = re.search(pattern, html, re.IGNORECASE | re.DOTALL)
+        if m:
+            rank = coerce_int(m.group(1))
+            if rank and rank > 0 and rank < 500000:
+                return rank
+    return None
+
+
 def fetch_profile_score_direct(headers):
     """Récupère le bloc score utilisateur via l'endpoint AJAX."""
     urls = [
-        "https://www.root-me.org/user?inc=score&lang=fr",
-        "https://www.root-me.org/User?inc=score&lang=fr",
-        "https://www.root-me.org/?page=user&inc=score&lang=fr",
+        f"{ROOTME_BASE_URL}/user?inc=score&lang=fr",
+        f"{ROOTME_BASE_URL}/User?inc=score&lang=fr",
+        f"{ROOTME_BASE_URL}/?page=user&inc=score&lang=fr",
     ]
     for url in urls:
         html = fetch_url_text(url, headers=headers, timeout=10, max_retries=2, debug_label="profile_score")
@@ -394,7 +461,10 @@ def fetch_profile_score_direct(headers):
             continue
         if is_logged_out(html):
             continue
-        parsed = parse_profile_score_html(html, {})
+        with profile_phase("parse"):
+            parse_start = time.perf_counter()
+            parsed = parse_profile_score_html(html, {})
+            record_parse(url, time.perf_counter() - parse_start)
         score_val = parsed.get("score") or 0
         pos_val = parsed.get("position") or 0
         chall_val = parsed.get("challenges_resolus") or 0
@@ -407,6 +477,9 @@ def fetch_rank_from_leaderboard(username):
     """Récupère le rang réel depuis la page de profil public Root-Me via curl."""
     if not username:
         return None
+    if CASSETTE is not None:
+        # curl échappe à la cassette : on passe par urllib pour enregistrer/rejouer
+        return _fetch_rank_urllib(username)
     
     import subprocess
     
@@ -414,7 +487,13 @@ def fetch_rank_from_leaderboard(username):
     search_name = username.replace(" ", "-").replace("_", "-")
     
     # Construire la commande curl avec les cookies si disponibles
-    profile_url = f"https://www.root-me.org/{search_name}?lang=fr"
+    profile_url = f"{ROOTME_BASE_URL}/{search_name}?lang=fr"
+
+    # Page de profil déjà récupérée pendant le run (scrape_profile_html) : pas de second fetch
+    rank = parse_rank_html(REQUEST_MEMO.peek(request_key(profile_url, profile_headers())))
+    if rank:
+        print(f"✅ Rang trouvé dans la page de profil déjà récupérée: #{rank}")
+        return rank
     
     # Lire les cookies depuis le fichier .env si disponibles
     cookie_str = ""
@@ -450,21 +529,10 @@ def fetch_rank_from_leaderboard(username):
             return None
         
         # Extraire le rang avec pattern regex
-        # Format: classement.svg...'/>&nbsp;274734
-        patterns = [
-            r"classement\.svg[^/]*/>\s*&nbsp;\s*(\d+)",
-            r"classement\.svg[^/]*/>&nbsp;(\d+)",
-            r"classement\.svg[^>]*>\s*&nbsp;\s*(\d+)",
-            r"classement\.svg.*?(\d{4,})",
-        ]
-        
-        for pattern in patterns:
-            m = re.search(pattern, html, re.IGNORECASE | re.DOTALL)
-            if m:
-                rank = coerce_int(m.group(1))
-                if rank and rank > 0 and rank < 500000:
-                    print(f"✅ Rang trouvé via curl: #{rank}")
-                    return rank
+        rank = parse_rank_html(html)
+        if rank:
+            print(f"✅ Rang trouvé via curl: #{rank}")
+            return rank
         
         print(f"⚠️ Pattern rang non trouvé dans le HTML curl")
     except subprocess.TimeoutExpired:
@@ -482,13 +550,9 @@ def fetch_rank_from_leaderboard(username):
 def _fetch_rank_urllib(username):
     """Fallback: récupère le rang via urllib (bloqué par anti-bot)."""
     search_name = username.replace(" ", "-").replace("_", "-")
-    profile_url = f"https://www.root-me.org/{search_name}?lang=fr"
-    
-    headers = {"User-Agent": "Mozilla/5.0", "Accept-Encoding": "identity"}
-    if ROOTME_COOKIES:
-        headers["Cookie"] = ROOTME_COOKIES
+    profile_url = f"{ROOTME_BASE_URL}/{search_name}?lang=fr"
     
-    html = fetch_url_text(profile_url, headers=headers, timeout=15, max_retries=2, debug_label="profile_rank")
+    html = fetch_url_text(profile_url, headers=profile_headers(), timeout=15, max_retries=2, debug_label="profile_rank")
     if not html or "classement.svg" not in html:
         return None
     
@@ -503,42 +567,6 @@ def category_to_segment(category):
     return CATEGORY_TO_SEGMENT.get(key)
 
 
-def parse_frontmatter_categories(content):
-    if not content.startswith("---"):
-        return []
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return []
-    fm = parts[1]
-    categories = []
-    # Inline list: categories: ["Root-Me", "Réseau"]
-    m_inline = re.search(r"^categories:\s*\[(.*?)\]\s*$", fm, re.MULTILINE)
-    if m_inline:
-        raw = m_inline.group(1)
-        for item in raw.split(","):
-            item = item.strip().strip('"').strip("'")
-            if item:
-                categories.append(item)
-        return categories
-    # Multi-line list:
-    lines = fm.splitlines()
-    in_list = False
-    for line in lines:
-        if not in_list:
-            if re.match(r"^categories:\s*$", line.strip()):
-                in_list = True
-            continue
-        # Stop if next key
-        if re.match(r"^\w+:\s*", line.strip()):
-            break
-        m_item = re.match(r"^\s*-\s*(.+)$", line)
-        if m_item:
-            item = m_item.group(1).strip().strip('"').strip("'")
-            if item:
-                categories.append(item)
-    return categories
-
-
 def clean_title(raw_title):
     if not raw_title:
         return ""
@@ -611,45 +639,10 @@ def normalize_difficulty(value, level=None):
 
 
 def merge_challenge_data(new_data, old_data):
+    """Fusionne deux challenges au format JSON (les valeurs connues de new_data l'emportent)."""
     if not old_data:
         return new_data
-    merged = dict(old_data)
-    for key, val in new_data.items():
-        if key in ("validations", "score"):
-            try:
-                if isinstance(val, str) and val.isdigit():
-                    val_int = int(val)
-                elif isinstance(val, int):
-                    val_int = val
-                else:
-                    val_int = None
-                if val_int and val_int > 0:
-                    merged[key] = val_int
-            except Exception:
-                pass
-            continue
-        if key == "note":
-            if val and val != "0%":
-                merged[key] = val
-            continue
-        if key == "date":
-            if val and str(val).strip().lower() not in INVALID_DATES:
-                merged[key] = val
-            continue
-        if key == "difficulte":
-            if val and val != "Inconnu":
-                merged[key] = val
-            continue
-        if isinstance(val, str):
-            if val and val not in ("Inconnu", "Titre Inconnu", "?", "0%"):
-                merged[key] = val
-            continue
-        if val is not None:
-            merged[key] = val
-    # S'assurer que l'URL est la plus complète
-    if new_data.get("url"):
-        merged["url"] = new_data["url"]
-    return merged
+    return ChallengeRecord.from_dict(old_data).merged(ChallengeRecord.from_dict(new_data)).to_dict()
 
 
 def parse_challenge_html_regex(html):
@@ -1005,30 +998,410 @@ def parse_profile_html(html):
     return result
 
 
+_CONNECT_TIMING = threading.local()
+
+
+class _TimedHTTPConnection(http.client.HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _CONNECT_TIMING.seconds = time.perf_counter() - start
+
+
+class _TimedHTTPSConnection(http.client.HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        _CONNECT_TIMING.seconds = time.perf_counter() - start
+
+
+class _TimedHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_TimedHTTPConnection, req)
+
+
+class _TimedHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_TimedHTTPSConnection, req, context=self._context)
+
+
+# Opener unique : mesure le temps de connexion (TCP + TLS) de chaque requête
+HTTP_OPENER = urllib.request.build_opener(_TimedHTTPHandler, _TimedHTTPSHandler)
+
+
+class _CassetteResponse(io.BytesIO):
+    """Réponse HTTP rejouée (interface minimale utilisée par les appelants)."""
+
+    def __init__(self, url, status, headers, body):
+        super().__init__(body)
+        self.url = url
+        self.status = status
+        self.headers = headers
+
+    def getcode(self):
+        return self.status
+
+
+def _cassette_headers(items):
+    headers = http.client.HTTPMessage()
+    for key, value in items:
+        headers[key] = value
+    return headers
+
+
+class Cassette:
+    """Enregistre les échanges HTTP d'un run réel, puis les rejoue hors-ligne.
+
+    Les interactions sont indexées par (méthode, URL) et rejouées dans l'ordre
+    d'enregistrement ; la dernière est resservie si l'URL est demandée plus
+    souvent qu'au moment de l'enregistrement. Les cookies ne sont pas stockés
+    (ni Cookie ni Set-Cookie). En enregistrement, le fichier est écrit une fois,
+    à la fin du run (close()).
+    """
+
+    # En-têtes jamais écrits dans la cassette (elle est faite pour être partagée)
+    PRIVATE_HEADERS = frozenset({"cookie", "set-cookie", "set-cookie2"})
+
+    def __init__(self, path, mode):
+        self.path = Path(path)
+        self.mode = mode
+        self.lock = threading.Lock()
+        self.interactions = []
+        self.cursor = {}
+        self.misses = 0
+        self.dirty = False
+        if mode == "replay":
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.interactions = json.load(f).get("interactions", [])
+        self.by_key = {}
+        for entry in self.interactions:
+            self.by_key.setdefault((entry["method"], entry["url"]), []).append(entry)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "interactions": self.interactions}, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def close(self):
+        """Écrit la cassette si des échanges ont été enregistrés depuis la dernière écriture."""
+        with self.lock:
+            if self.dirty:
+                self.save()
+                self.dirty = False
+
+    def record(self, req, status=None, headers=None, body=b"", error=None):
+        entry = {
+            "method": req.get_method(),
+            "url": req.full_url,
+            "status": status,
+            "headers": [(name, value) for name, value in (headers.items() if headers is not None else [])
+                        if name.lower() not in self.PRIVATE_HEADERS],
+            "body": base64.b64encode(body or b"").decode("ascii"),
+            "error": str(error) if error else None,
+        }
+        with self.lock:
+            self.interactions.append(entry)
+            self.dirty = True
+
+    def play(self, req):
+        """Rejoue l'interaction suivante pour cette requête (lève comme urllib)."""
+        key = (req.get_method(), req.full_url)
+        with self.lock:
+            entries = self.by_key.get(key)
+            if not entries:
+                self.misses += 1
+                raise urllib.error.URLError(f"absent de la cassette: {req.full_url}")
+            idx = self.cursor.get(key, 0)
+            self.cursor[key] = idx + 1
+            entry = entries[min(idx, len(entries) - 1)]
+        if entry["error"] and entry["status"] is None:
+            if "timed out" in entry["error"]:
+                raise socket.timeout(entry["error"])
+            raise urllib.error.URLError(entry["error"])
+        headers = _cassette_headers(entry["headers"])
+        body = base64.b64decode(entry["body"])
+        if entry["status"] and entry["status"] >= 400:
+            raise urllib.error.HTTPError(req.full_url, entry["status"], entry["error"] or "", headers, io.BytesIO(body))
+        return _CassetteResponse(req.full_url, entry["status"], headers, body)
+
+
+CASSETTE = Cassette(CASSETTE_PATH, CASSETTE_MODE) if CASSETTE_PATH else None
+
+
+def is_replaying():
+    return CASSETTE is not None and CASSETTE.mode == "replay"
+
+
+def _open_recorded(req, timeout):
+    """Requête réelle dont la réponse (ou l'erreur) est ajoutée à la cassette."""
+    try:
+        response = HTTP_OPENER.open(req, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        body = read_response_body(e)
+        CASSETTE.record(req, status=e.code, headers=e.headers, body=body, error=e.reason)
+        raise urllib.error.HTTPError(e.url, e.code, e.reason, e.headers, io.BytesIO(body))
+    except (urllib.error.URLError, TimeoutError, socket.timeout) as e:
+        CASSETTE.record(req, error=getattr(e, "reason", e))
+        raise
+    with response:
+        body = read_response_body(response)
+        status = getattr(response, "status", None)
+        CASSETTE.record(req, status=status, headers=response.headers, body=body)
+        return _CassetteResponse(req.full_url, status, response.headers, body)
+
+
+def open_timed(req, timeout):
+    """Ouvre une requête et retourne (réponse, connect_s, ttfb_s).
+
+    Avec une cassette en enregistrement, le corps est lu ici (compté dans ttfb) ;
+    en rejeu, la réponse est servie depuis la cassette sans réseau. Le disjoncteur
+    de l'hôte est consulté avant (CircuitOpenError s'il est ouvert) et informé du
+    résultat.
+    """
+    breaker = BREAKERS.for_url(req.full_url)
+    breaker.check()
+    try:
+        if is_replaying():
+            response = CASSETTE.play(req)
+            breaker.record_status(getattr(response, "status", None) or 200)
+            return response, 0.0, 0.0
+        _CONNECT_TIMING.seconds = 0.0
+        parts = urlsplit(req.full_url)
+        start = time.perf_counter()
+        with span(f"{req.get_method()} {parts.path or '/'}", "http", host=parts.hostname, url=req.full_url):
+            if CASSETTE is not None:
+                response = _open_recorded(req, timeout)
+            else:
+                response = HTTP_OPENER.open(req, timeout=timeout)
+    except urllib.error.HTTPError as e:
+        breaker.record_status(e.code, retry_after=retry_after_seconds(e.headers))
+        raise
+    except (urllib.error.URLError, TimeoutError, socket.timeout, http.client.HTTPException, ConnectionError) as e:
+        breaker.record_failure(type(getattr(e, "reason", e)).__name__)
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_status(getattr(response, "status", None) or 200)
+    elapsed = time.perf_counter() - start
+    connect = getattr(_CONNECT_TIMING, "seconds", 0.0)
+    return response, connect, max(0.0, elapsed - connect)
+
+
+def record_request(kind, url, status=None, attempts=1, backoff=0.0, connect=0.0, ttfb=0.0,
+                   transfer=0.0, nbytes=0, error=None, rejected=False):
+    """Métrique d'une requête ; `rejected` : refusée par le disjoncteur après `attempts` essais réseau."""
+    metric = {
+        "kind": kind,
+        "host": urlsplit(url).hostname or "",
+        "url": url,
+        "status": status,
+        "attempts": attempts,
+        "backoff_s": backoff,
+        "connect_s": connect,
+        "ttfb_s": ttfb,
+        "transfer_s": transfer,
+        "bytes": nbytes,
+        "parse_s": 0.0,
+        "error": str(error) if error else None,
+        "rejected": rejected,
+    }
+    REQUEST_METRICS.append(metric)
+    PHASE_TIMINGS["network"] += connect + ttfb + transfer
+    PHASE_TIMINGS["backoff"] += backoff
+    return metric
+
+
+def record_parse(url, seconds):
+    """Attribue un temps de parsing à la dernière requête vers `url`."""
+    PHASE_TIMINGS["parse"] += seconds
+    for metric in reversed(REQUEST_METRICS):
+        if metric["url"] == url:
+            metric["parse_s"] += seconds
+            break
+
+
+def profile_phase(name):
+    """Délimite une phase pour --profile (sans effet hors profilage)."""
+    return PROFILER.phase(name) if PROFILER else contextlib.nullcontext()
+
+
+def span(name, cat="run", **args):
+    """Span de la timeline --trace (sans effet hors traçage)."""
+    return TRACER.span(name, cat, args) if TRACER else contextlib.nullcontext()
+
+
+_DATA_STORE = None
+
+
+def data_store():
+    """Base locale (data_store.py) des données de DATA_DIR, ouverte à la première utilisation."""
+    global _DATA_STORE
+    if _DATA_STORE is None or _DATA_STORE.data_dir != DATA_DIR:
+        from data_store import DataStore
+        _DATA_STORE = DataStore(DATA_DIR)
+        if _DATA_STORE.imported:
+            print(f"📥 Base locale : importé depuis data/ ({', '.join(_DATA_STORE.imported)})")
+    return _DATA_STORE
+
+
+def export_data(*names):
+    """Réécrit les data/*.json dont le contenu a changé (phase 'save')."""
+    with span("export", "io", files=",".join(names) or "all"), profile_phase("save"):
+        return data_store().export(names or None)
+
+
+def save_profile(profile):
+    """Ajoute un instantané du profil à la base locale et exporte data/rootme.json."""
+    data_store().add_profile(profile)
+    export_data("profile")
+
+
+def load_previous_profile():
+    """Dernier profil connu (base locale, importée de data/rootme.json), ou None."""
+    try:
+        return data_store().profile()
+    except Exception:
+        return None
+
+
+def retry_after_seconds(headers):
+    """Valeur de Retry-After en secondes (None si absente ou non numérique)."""
+    value = headers.get("Retry-After") if headers is not None else None
+    return int(value) if value and str(value).isdigit() else None
+
+
+def host_open(url):
+    """Vrai si le disjoncteur de l'hôte refuserait une requête vers `url` maintenant."""
+    return BREAKERS.for_url(url).is_open()
+
+
+def polite_sleep(seconds, url=None):
+    """Pause de politesse entre requêtes (comptée dans la phase 'sleep', ignorée en rejeu).
+
+    Avec `url`, la pause est sautée si l'hôte est coupé : la requête échouera sans réseau.
+    """
+    if is_replaying() or (url and host_open(url)):
+        return
+    PHASE_TIMINGS["sleep"] += seconds
+    with span("polite_sleep", "sleep", seconds=seconds):
+        time.sleep(seconds)
+
+
+def backoff_sleep(seconds, url=None, attempt=None):
+    """Attente avant un retry (ignorée en rejeu de cassette)."""
+    if is_replaying():
+        return
+    with span("backoff", "retry", seconds=seconds, url=url, attempt=attempt):
+        time.sleep(seconds)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def summarize_request_metrics():
+    """Agrège les métriques par hôte (p50/p95) et par phase."""
+    hosts = {}
+    for m in REQUEST_METRICS:
+        h = hosts.setdefault(m["host"], {"requests": 0, "errors": 0, "attempts": 0, "bytes": 0, "rejected": 0,
+                                         "backoff_s": 0.0, "totals": [], "ttfb": []})
+        if m.get("rejected") and not m["attempts"]:
+            # Refusée par le disjoncteur sans aucun essai réseau : ni requête, ni retry, ni latence
+            h["rejected"] += 1
+            continue
+        h["requests"] += 1
+        h["attempts"] += m["attempts"]
+        h["bytes"] += m["bytes"]
+        h["backoff_s"] += m["backoff_s"]
+        if m["error"] or not m["status"] or m["status"] >= 400:
+            h["errors"] += 1
+        h["totals"].append(m["connect_s"] + m["ttfb_s"] + m["transfer_s"])
+        h["ttfb"].append(m["ttfb_s"])
+    summary = {}
+    for host, h in hosts.items():
+        summary[host] = {
+            "requests": h["requests"],
+            "errors": h["errors"],
+            "retries": h["attempts"] - h["requests"],
+            "rejected": h["rejected"],
+            "bytes": h["bytes"],
+            "backoff_s": h["backoff_s"],
+            "p50_s": percentile(h["totals"], 50),
+            "p95_s": percentile(h["totals"], 95),
+            "ttfb_p50_s": percentile(h["ttfb"], 50),
+            "ttfb_p95_s": percentile(h["ttfb"], 95),
+        }
+    return summary, dict(PHASE_TIMINGS)
+
+
+def read_response_body(response):
+    """Lit le corps brut de la réponse HTTP en gérant IncompleteRead."""
+    try:
+        return response.read()
+    except IncompleteRead as e:
+        return e.partial
+
+
 def read_response_text(response):
     """Lit la réponse HTTP en gérant IncompleteRead et l'encodage."""
     charset = response.headers.get_content_charset() or "utf-8"
-    try:
-        raw = response.read()
-    except IncompleteRead as e:
-        raw = e.partial
-    return raw.decode(charset, errors="replace")
+    return read_response_body(response).decode(charset, errors="replace")
+
 
+def fetch_url_text(url, headers=None, timeout=10, max_retries=3, backoff_base=2.0, debug_label=None, memo=True):
+    """Récupère une URL avec retry (gère 429/5xx + Retry-After), sans insister si l'hôte est coupé.
 
-def fetch_url_text(url, headers=None, timeout=10, max_retries=3, backoff_base=2.0, debug_label=None):
-    """Récupère une URL avec retry (gère 429/5xx + Retry-After)."""
+    Mémoïsé pour le run (REQUEST_MEMO) : une même URL avec les mêmes en-têtes n'est demandée qu'une
+    fois, les appels simultanés attendent le premier. Seules les réponses obtenues sont mémorisées :
+    un échec (timeout, 5xx, hôte coupé) est retenté au prochain appel. `memo=False` pour les pages
+    demandées une seule fois par run (pages de challenge), qui n'ont pas à rester en mémoire.
+    """
     headers = headers or {}
+    if not memo:
+        return _fetch_url_text(url, headers, timeout, max_retries, backoff_base, debug_label)
+    return REQUEST_MEMO.get(
+        request_key(url, headers),
+        lambda: _fetch_url_text(url, headers, timeout, max_retries, backoff_base, debug_label),
+        cache_if=lambda html: html is not None,
+    )
+
+
+def _fetch_url_text(url, headers, timeout, max_retries, backoff_base, debug_label):
     last_error = None
+    backoff = 0.0
+    status = None
+    connect = ttfb = 0.0
     for attempt in range(max_retries + 1):
+        wait_time = None
         try:
             req = urllib.request.Request(url, headers=headers)
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                html = read_response_text(response)
+            response, connect, ttfb = open_timed(req, timeout)
+            with response:
+                start = time.perf_counter()
+                raw = read_response_body(response)
+                transfer = time.perf_counter() - start
+                status = getattr(response, "status", None)
+                charset = response.headers.get_content_charset() or "utf-8"
+                html = raw.decode(charset, errors="replace")
+                record_request("page", url, status=status, attempts=attempt + 1, backoff=backoff,
+                               connect=connect, ttfb=ttfb, transfer=transfer, nbytes=len(raw))
                 if debug_label:
-                    debug_dump("page", debug_label, url, html=html, status=getattr(response, "status", None))
+                    debug_dump("page", debug_label, url, html=html, status=status)
                 return html
+        except CircuitOpenError as e:
+            # Hôte coupé : échec immédiat, ni réseau ni backoff
+            record_request("page", url, status=status, attempts=attempt, backoff=backoff, error=e, rejected=True)
+            return None
         except urllib.error.HTTPError as e:
             last_error = e
+            status = e.code
             body = None
             try:
                 body = e.read()
@@ -1043,49 +1416,36 @@ def fetch_url_text(url, headers=None, timeout=10, max_retries=3, backoff_base=2.
                 debug_dump("error", debug_label, url, html=html, status=e.code, error=str(e))
             elif debug_label:
                 debug_dump("error", debug_label, url, html=None, status=e.code, error=str(e))
-            if e.code in (429, 500, 502, 503, 504):
-                retry_after = e.headers.get("Retry-After")
-                if retry_after and str(retry_after).isdigit():
-                    wait_time = int(retry_after)
-                else:
-                    wait_time = backoff_base * (2 ** attempt) + random.uniform(0.2, 0.8)
-                time.sleep(wait_time)
-                continue
-            return None
-        except (TimeoutError, socket.timeout) as e:
-            last_error = e
-            if debug_label:
-                debug_dump("error", debug_label, url, html=None, status=None, error=str(e))
-            wait_time = backoff_base * (2 ** attempt) + random.uniform(0.2, 0.8)
-            time.sleep(wait_time)
-            continue
-        except urllib.error.URLError as e:
+            if e.code not in (429, 500, 502, 503, 504):
+                record_request("page", url, status=e.code, attempts=attempt + 1, backoff=backoff, error=e)
+                return None
+            wait_time = retry_after_seconds(e.headers)
+        except (TimeoutError, socket.timeout, urllib.error.URLError) as e:
             last_error = e
             if debug_label:
                 debug_dump("error", debug_label, url, html=None, status=None, error=str(e))
-            wait_time = backoff_base * (2 ** attempt) + random.uniform(0.2, 0.8)
-            time.sleep(wait_time)
-            continue
+        if attempt < max_retries:
+            if host_open(url):
+                # Le disjoncteur vient de s'ouvrir : inutile d'attendre pour retenter
+                break
+            if wait_time is None:
+                wait_time = backoff_base * (2 ** attempt) + random.uniform(0.2, 0.8)
+            backoff += wait_time
+            backoff_sleep(wait_time, url, attempt + 1)
+    record_request("page", url, status=status, attempts=attempt + 1, backoff=backoff, error=last_error)
     if last_error:
         print(f"⚠️ Erreur scraping: {last_error}")
     return None
 
 
 def api_request(endpoint):
-    """Effectue une requête vers l'API Root-Me avec retry."""
-    import time
-
-    global API_DISABLED
-    if API_DISABLED:
-        return None
-    
-    url = f"https://api.www.root-me.org{endpoint}"
-    
-    max_retries = 0 # TEMP: Fail fast to trigger scraping
-    for attempt in range(max_retries + 1):
+    """Effectue une requête vers l'API Root-Me avec retry (échec immédiat si l'API est coupée)."""
+    url = f"{ROOTME_API_URL}{endpoint}"
+    backoff = 0.0
+    for attempt in range(API_MAX_RETRIES + 1):
         try:
             # Polite delay
-            time.sleep(2)  # Increased to 2s because pagination is aggressive
+            polite_sleep(API_DELAY, url=url)
             
             req = urllib.request.Request(url)
             
@@ -1097,44 +1457,60 @@ def api_request(endpoint):
 
             req.add_header("User-Agent", "Mozilla/5.0")
             
-            with urllib.request.urlopen(req, timeout=30) as response:
-                return json.loads(response.read().decode("utf-8"))
+            response, connect, ttfb = open_timed(req, 30)
+            with response:
+                start = time.perf_counter()
+                raw = read_response_body(response)
+                transfer = time.perf_counter() - start
+                metric = record_request("api", url, status=getattr(response, "status", None), attempts=attempt + 1,
+                                        backoff=backoff, connect=connect, ttfb=ttfb, transfer=transfer, nbytes=len(raw))
+                start = time.perf_counter()
+                data = json.loads(raw.decode("utf-8"))
+                metric["parse_s"] = time.perf_counter() - start
+                PHASE_TIMINGS["parse"] += metric["parse_s"]
+                return data
+        except CircuitOpenError as e:
+            # API coupée : refus compté par le disjoncteur (résumé), sans pause ni réseau
+            record_request("api", url, attempts=attempt, backoff=backoff, error=e, rejected=True)
+            return None
         except urllib.error.HTTPError as e:
-            if e.code == 401:
-                print(f"⚠️ API 401 détecté. Désactivation des appels API pour ce run.")
-                API_DISABLED = True
+            if e.code in (401, 429):
+                # Le disjoncteur de l'API s'ouvre : scraping en attendant la prochaine sonde
+                record_request("api", url, status=e.code, attempts=attempt + 1, backoff=backoff, error=e)
+                print(f"⚠️ API {e.code} détecté ({endpoint}).")
                 return None
-            if e.code == 429:
-                print(f"⚠️ API 429 détecté. Désactivation des appels API pour ce run.")
-                API_DISABLED = True
+            if e.code >= 500:
+                record_request("api", url, status=e.code, attempts=attempt + 1, backoff=backoff, error=e)
+                if attempt < API_MAX_RETRIES and not host_open(url):
+                    wait_time = (attempt + 1) * 5
+                    print(f"⚠️ Erreur API ({endpoint}): {e.code}. Retry dans {wait_time}s...")
+                    backoff += wait_time
+                    backoff_sleep(wait_time, url, attempt + 1)
+                    continue
                 return None
-            if e.code == 429 or e.code >= 500:
-                wait_time = (attempt + 1) * 5
-                print(f"⚠️ Erreur API ({endpoint}): {e.code}. Retry dans {wait_time}s...")
-                time.sleep(wait_time)
             elif e.code == 404:
+                record_request("api", url, status=e.code, attempts=attempt + 1, backoff=backoff, error=e)
                 print(f"❌ Ressource non trouvée ({endpoint})")
                 return None
             else:
+                record_request("api", url, status=e.code, attempts=attempt + 1, backoff=backoff, error=e)
                 print(f"❌ Erreur API ({endpoint}): {e}")
                 return None
-        except (TimeoutError, socket.timeout) as e:
+        except (TimeoutError, socket.timeout, urllib.error.URLError) as e:
             print(f"❌ Erreur connexion ({endpoint}): {e}")
-            time.sleep(2) # Petit retry reseau
-        except urllib.error.URLError as e:
-            print(f"❌ Erreur connexion ({endpoint}): {e}")
-            time.sleep(2) # Petit retry reseau
+            if attempt < API_MAX_RETRIES and not host_open(url):
+                backoff += 2
+                backoff_sleep(2, url, attempt + 1) # Petit retry reseau
             
-    print(f"❌ Abandon après {max_retries} tentatives pour {endpoint}")
+    record_request("api", url, attempts=API_MAX_RETRIES + 1, backoff=backoff, error="abandon")
+    print(f"❌ Abandon après {API_MAX_RETRIES + 1} tentative(s) pour {endpoint}")
     sys.stdout.flush()
     return None
 
 
 def scrape_profile_html():
     """Scrape le profil HTML en utilisant les cookies si disponibles."""
-    headers = {"User-Agent": "Mozilla/5.0", "Accept-Encoding": "identity"}
-    if ROOTME_COOKIES:
-        headers["Cookie"] = ROOTME_COOKIES
+    headers = profile_headers()
 
     user = ENV.get("ROOTME_USER", "Alexandre-Froissart")
     candidates = []
@@ -1146,47 +1522,57 @@ def scrape_profile_html():
         candidates.append(ROOTME_PROFILE_URL)
     if ROOTME_UID:
         candidates.extend([
-            f"https://www.root-me.org/spip.php?auteur{ROOTME_UID}",
-            f"https://www.root-me.org/?page=info_auteur&id_auteur={ROOTME_UID}",
+            f"{ROOTME_BASE_URL}/spip.php?auteur{ROOTME_UID}",
+            f"{ROOTME_BASE_URL}/?page=info_auteur&id_auteur={ROOTME_UID}",
         ])
     if user and "@" not in user:
         candidates.extend([
-            f"https://www.root-me.org/{user}",
-            f"https://www.root-me.org/fr/{user}",
-            f"https://www.root-me.org/Users/{user}",
-            f"https://www.root-me.org/User/{user}",
-            f"https://www.root-me.org/Membres/{user}",
+            f"{ROOTME_BASE_URL}/{user}",
+            f"{ROOTME_BASE_URL}/fr/{user}",
+            f"{ROOTME_BASE_URL}/Users/{user}",
+            f"{ROOTME_BASE_URL}/User/{user}",
+            f"{ROOTME_BASE_URL}/Membres/{user}",
         ])
+    # Candidats équivalents (ex. pretty_url sans ?lang=fr == /{user}) : une seule tentative
+    candidates = unique_urls(candidates)
 
     scraped = None
     profile_url = None
     score_data = fetch_profile_score_direct(headers)
-    for url in candidates:
-        try:
-            html = fetch_url_text(url, headers=headers, timeout=10, max_retries=2, debug_label="profile")
-            if not html:
-                continue
-            if not is_profile_html(html):
-                continue
-            scraped = parse_profile_html(html)
-            # Si disponible, récupérer le bloc score en AJAX
-            inc_score_url = find_inc_score_url(html, url)
-            if inc_score_url:
-                score_html = fetch_url_text(inc_score_url, headers=headers, timeout=10, max_retries=2, debug_label="profile_score")
-                if score_html and not is_logged_out(score_html):
-                    scraped = parse_profile_score_html(score_html, scraped or {})
-            profile_url = url
-            score_val = scraped.get("score") or 0
-            pos_val = scraped.get("position") or 0
-            chall_val = scraped.get("challenges_resolus") or 0
-            if scraped.get("nom") or score_val > 0 or pos_val > 0 or chall_val > 0:
-                break
-        except urllib.error.HTTPError as e:
-            if e.code == 404:
-                continue
-            print(f"⚠️ Fallback profil HTML échoué sur {url}: {e}")
-        except Exception as e:
-            print(f"⚠️ Fallback profil HTML échoué sur {url}: {e}")
+    with span("profile_candidates", "profile", count=len(candidates)):
+        for url in candidates:
+            with span("profile_candidate", "profile", url=url):
+                try:
+                    html = fetch_url_text(url, headers=headers, timeout=10, max_retries=2, debug_label="profile")
+                    if not html:
+                        continue
+                    if not is_profile_html(html):
+                        continue
+                    with profile_phase("parse"):
+                        parse_start = time.perf_counter()
+                        scraped = parse_profile_html(html)
+                        record_parse(url, time.perf_counter() - parse_start)
+                    # Si disponible, récupérer le bloc score en AJAX
+                    inc_score_url = find_inc_score_url(html, url)
+                    if inc_score_url:
+                        score_html = fetch_url_text(inc_score_url, headers=headers, timeout=10, max_retries=2, debug_label="profile_score")
+                        if score_html and not is_logged_out(score_html):
+                            with profile_phase("parse"):
+                                parse_start = time.perf_counter()
+                                scraped = parse_profile_score_html(score_html, scraped or {})
+                                record_parse(inc_score_url, time.perf_counter() - parse_start)
+                    profile_url = url
+                    score_val = scraped.get("score") or 0
+                    pos_val = scraped.get("position") or 0
+                    chall_val = scraped.get("challenges_resolus") or 0
+                    if scraped.get("nom") or score_val > 0 or pos_val > 0 or chall_val > 0:
+                        break
+                except urllib.error.HTTPError as e:
+                    if e.code == 404:
+                        continue
+                    print(f"⚠️ Fallback profil HTML échoué sur {url}: {e}")
+                except Exception as e:
+                    print(f"⚠️ Fallback profil HTML échoué sur {url}: {e}")
 
     if score_data:
         scraped = scraped or {}
@@ -1223,9 +1609,7 @@ def scrape_profile_html():
             if real_rank:
                 profile["position"] = real_rank
         
-        DATA_DIR.mkdir(parents=True, exist_ok=True)
-        with open(PROFILE_FILE, "w", encoding="utf-8") as f:
-            json.dump(profile, f, indent=2, ensure_ascii=False)
+        save_profile(profile)
         print(f"✅ Profil (HTML): {profile['score']} pts, #{profile['position']}, {profile['challenges_resolus']} challenges")
         return profile
     return None
@@ -1256,37 +1640,27 @@ def fetch_profile():
                 "score": 0,  # Sera mis à jour lors d'une prochaine exécution réussie
                 "position": real_rank,
                 "challenges_resolus": 0,
-                "profil_url": f"https://www.root-me.org/{user}",
+                "profil_url": f"{ROOTME_BASE_URL}/{user}",
                 "derniere_mise_a_jour": datetime.now().strftime("%Y-%m-%d")
             }
             # Essayer de récupérer les anciennes données pour conserver score/challenges
-            if PROFILE_FILE.exists():
-                try:
-                    with open(PROFILE_FILE, "r", encoding="utf-8") as f:
-                        old_data = json.load(f)
-                    if old_data.get("score"):
-                        profile["score"] = old_data["score"]
-                    if old_data.get("challenges_resolus"):
-                        profile["challenges_resolus"] = old_data["challenges_resolus"]
-                    if old_data.get("nom"):
-                        profile["nom"] = old_data["nom"]
-                except Exception:
-                    pass
-            DATA_DIR.mkdir(parents=True, exist_ok=True)
-            with open(PROFILE_FILE, "w", encoding="utf-8") as f:
-                json.dump(profile, f, indent=2, ensure_ascii=False)
+            old_data = load_previous_profile()
+            if old_data:
+                if old_data.get("score"):
+                    profile["score"] = old_data["score"]
+                if old_data.get("challenges_resolus"):
+                    profile["challenges_resolus"] = old_data["challenges_resolus"]
+                if old_data.get("nom"):
+                    profile["nom"] = old_data["nom"]
+            save_profile(profile)
             print(f"✅ Profil (classement public): #{profile['position']}")
             return profile
         
         # Fallback final: conserver les données existantes si aucune récupération n'a réussi
-        if PROFILE_FILE.exists():
-            try:
-                with open(PROFILE_FILE, "r", encoding="utf-8") as f:
-                    old_profile = json.load(f)
-                print(f"⚠️ Utilisation des données existantes: #{old_profile.get('position', 'N/A')}")
-                return old_profile
-            except Exception:
-                pass
+        old_profile = load_previous_profile()
+        if old_profile:
+            print(f"⚠️ Utilisation des données existantes: #{old_profile.get('position', 'N/A')}")
+            return old_profile
         
         return None
     
@@ -1333,9 +1707,7 @@ def fetch_profile():
         if real_rank:
             profile["position"] = real_rank
     
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    with open(PROFILE_FILE, "w", encoding="utf-8") as f:
-        json.dump(profile, f, indent=2, ensure_ascii=False)
+    save_profile(profile)
     
     print(f"✅ Profil: {profile['score']} pts, #{profile['position']}, {profile['challenges_resolus']} challenges")
     return profile
@@ -1452,7 +1824,7 @@ def fetch_challenge(challenge_id, override_url=None, debug_label=None):
     # Scraping complémentaire
     url_challenge = data.get("url_challenge", "")
     if url_challenge and not url_challenge.startswith("http"):
-        url_challenge = f"https://www.root-me.org/{url_challenge}"
+        url_challenge = f"{ROOTME_BASE_URL}/{url_challenge}"
     elif "api.www." in url_challenge:
         url_challenge = url_challenge.replace("api.www.", "www.")
     
@@ -1462,7 +1834,7 @@ def fetch_challenge(challenge_id, override_url=None, debug_label=None):
     if url_challenge:
         try:
             # Polite delay for scrapping
-            time.sleep(random.uniform(*SCRAPE_DELAY_RANGE))
+            polite_sleep(random.uniform(*SCRAPE_DELAY_RANGE), url=url_challenge)
             
             headers = {
                 'User-Agent': 'Mozilla/5.0', 
@@ -1473,11 +1845,15 @@ def fetch_challenge(challenge_id, override_url=None, debug_label=None):
             else:
                 headers['Cookie'] = f"api_key={ROOTME_API_KEY}"
                 
-            html = fetch_url_text(url_challenge, headers=headers, timeout=10, max_retries=3, debug_label=debug_label)
+            html = fetch_url_text(url_challenge, headers=headers, timeout=10, max_retries=3, debug_label=debug_label,
+                                  memo=False)
             if not html:
                 raise urllib.error.HTTPError(url_challenge, 429, "Too Many Requests", hdrs=None, fp=None)
 
-            scraped = parse_challenge_html(html) or {}
+            with profile_phase("parse"):
+                parse_start = time.perf_counter()
+                scraped = parse_challenge_html(html) or {}
+                record_parse(url_challenge, time.perf_counter() - parse_start)
 
             # Titre
             if scraped.get("titre"):
@@ -1518,71 +1894,89 @@ def fetch_challenge(challenge_id, override_url=None, debug_label=None):
         except Exception as e:
             print(f"⚠️ Erreur scraping: {e}")
 
-    return {
-        "id": challenge_id,
-        "titre": data.get("titre", "Titre Inconnu"),
-        "rubrique": rubrique,
-        "auteur": auteur_nom,
-        "date": date_pub if str(date_pub).strip().lower() not in INVALID_DATES else "",
-        "score": data.get("score", 0), 
-        "difficulte": data.get("difficulte", 1), 
-        "validations": real_validations,
-        "note": real_votes, # Contient le pourcentage ex "30%"
-    }
+    # Normalisation unique (types, valeurs inconnues) à la frontière
+    return ChallengeRecord(
+        challenge_id,
+        titre=data.get("titre"),
+        rubrique=rubrique,
+        auteur=auteur_nom,
+        date=date_pub,
+        score=data.get("score"),
+        difficulte=data.get("difficulte"),
+        validations=real_validations,
+        note=real_votes,  # Pourcentage ex "30%"
+    )
+
+
+def discover_challenges():
+    """Lit le frontmatter de content/root-me-challenges et retourne {id: {slug, id, url}}."""
+    discovered_challenges = {}
+    if not CONTENT_DIR.exists():
+        return discovered_challenges
+    md_files = [item / "index.md" for item in sorted(CONTENT_DIR.iterdir()) if (item / "index.md").exists()]
+    # En-têtes seuls (+ début du corps pour le shortcode), lus en parallèle
+    for md_file, fm in front_matter.read_many(md_files, lead=SHORTCODE_LEAD):
+        slug = md_file.parent.name
+        try:
+            rootme_id = fm.get("rootme_id")
+            if rootme_id in (None, ""):
+                continue
+            cid = str(rootme_id)
+            categories = fm.get("categories") or []
+            if isinstance(categories, str):
+                categories = [categories]
+            category_segment = None
+            for cat in categories:
+                if str(cat).strip().lower() == "root-me":
+                    continue
+                category_segment = category_to_segment(str(cat))
+                if category_segment:
+                    break
+            discovered_challenges[cid] = {
+                "slug": slug,
+                "id": cid,
+                "url": f"{ROOTME_BASE_URL}/fr/Challenges/TODO/{slug}" # Sera mis à jour par l'API
+            }
+            # Date du writeup = date de résolution (agrégat "recent" de rootme_stats.json)
+            written = fm.get("date")
+            if written:
+                discovered_challenges[cid]["date"] = str(written)[:10]
+            # Essayer de choper l'URL si présente ou reconstruire
+            url_match = re.search(r'{{< rootme-challenge .* url="([^"]+)"', fm.lead)
+            if url_match:
+                discovered_challenges[cid]["url"] = url_match.group(1)
+            elif category_segment:
+                discovered_challenges[cid]["url"] = f"{ROOTME_BASE_URL}/fr/Challenges/{category_segment}/{slug}"
+        except Exception as e:
+            print(f"⚠️ Erreur lors de la lecture de {md_file}: {e}")
+    return discovered_challenges
+
+
+def resolve_pending_id(real_id):
+    """Édition d'en-tête : rootme_id PENDING_<slug> -> ID réel (une valeur déjà résolue n'est pas touchée)."""
+    def apply(fm):
+        return str(fm.get("rootme_id", "")).startswith("PENDING_") and fm.set_raw("rootme_id", str(real_id))
+    return apply
 
 
 def fetch_all_challenges_with_stats():
     """Récupère les données les challenges présents sur le disque et retourne les stats."""
     print("🔄 Détection dynamique des challenges via frontmatter...")
     
-    discovered_challenges = {}
-    existing_data = {}
-    if CHALLENGES_FILE.exists():
-        try:
-            with open(CHALLENGES_FILE, "r", encoding="utf-8") as f:
-                existing_data = json.load(f)
-        except Exception:
-            existing_data = {}
+    store = data_store()
+    existing_data = load_challenge_records(store.challenges())
     
-    if CONTENT_DIR.exists():
-        for item in CONTENT_DIR.iterdir():
-            if item.is_dir():
-                md_file = item / "index.md"
-                if md_file.exists():
-                    try:
-                        with open(md_file, "r", encoding="utf-8") as f:
-                            content = f.read()
-                            # Recherche de rootme_id dans le frontmatter
-                            m = re.search(r'^rootme_id:\s*"?(\w+)"?', content, re.MULTILINE)
-                            if m:
-                                cid = m.group(1)
-                                categories = parse_frontmatter_categories(content)
-                                category_segment = None
-                                for cat in categories:
-                                    if cat.strip().lower() == "root-me":
-                                        continue
-                                    category_segment = category_to_segment(cat)
-                                    if category_segment:
-                                        break
-                                discovered_challenges[cid] = {
-                                    "slug": item.name,
-                                    "id": cid,
-                                    "url": f"https://www.root-me.org/fr/Challenges/TODO/{item.name}" # Sera mis à jour par l'API
-                                }
-                                # Essayer de choper l'URL si présente ou reconstruire
-                                url_match = re.search(r'{{< rootme-challenge .* url="([^"]+)"', content)
-                                if url_match:
-                                    discovered_challenges[cid]["url"] = url_match.group(1)
-                                elif category_segment:
-                                    discovered_challenges[cid]["url"] = f"https://www.root-me.org/fr/Challenges/{category_segment}/{item.name}"
-                    except Exception as e:
-                        print(f"⚠️ Erreur lors de la lecture de {md_file}: {e}")
+    with span("discovery", "discovery"), profile_phase("discovery"):
+        discovered_challenges = discover_challenges()
 
     active_count = len(discovered_challenges)
     print(f"📂 Challenges trouvés dans le contenu : {list(discovered_challenges.keys())} ({active_count})")
     
     challenges_data = {}
     stats = [] # {id, name, status, info}
+    catalogue = challenge_catalogue_merge(existing_data)
+    # IDs PENDING résolus : écrits en une passe par fichier après la boucle
+    frontmatter_edits = front_matter.Batch()
     
     for challenge_id, info in discovered_challenges.items():
         slug = info.get("slug")
@@ -1613,13 +2007,13 @@ def fetch_all_challenges_with_stats():
                 
                 # Recherche API
                 try:
+                    url = f"{ROOTME_API_URL}/challenges?titre={urllib.parse.quote(search_term)}"
                     # Petite pause
-                    time.sleep(2)
-                    url = f"https://api.www.root-me.org/challenges?titre={urllib.parse.quote(search_term)}"
+                    polite_sleep(2, url=url)
                     headers = {'User-Agent': 'Mozilla/5.0', "Cookie": f"api_key={ROOTME_API_KEY}"}
                     req = urllib.request.Request(url, headers=headers)
                     
-                    with urllib.request.urlopen(req, timeout=10) as response:
+                    with open_timed(req, 10)[0] as response:
                         data = json.loads(response.read().decode("utf-8"))
                         
                         if data:
@@ -1646,17 +2040,10 @@ def fetch_all_challenges_with_stats():
                                     found = True
                                     real_id = str(val['id_challenge'])
                                     print(f"     🎉 ID trouvé : {real_id} ! Mise à jour du fichier...")
-                                    md_path = CONTENT_DIR / slug / "index.md"
-                                    if md_path.exists():
-                                        print(f"     📝 Mise à jour de {md_path.name} avec ID {real_id}...")
-                                        with open(md_path, 'r', encoding='utf-8') as f:
-                                            md_content = f.read()
-                                        
-                                        # Remplacer rootme_id: PENDING_... par rootme_id: real_id
-                                        md_content = re.sub(r'^rootme_id:\s*"?PENDING_[^"\n]+"?', f'rootme_id: {real_id}', md_content, flags=re.MULTILINE)
-                                        
-                                        with open(md_path, 'w', encoding='utf-8') as f:
-                                            f.write(md_content)
+                                    for md_path in (CONTENT_DIR / slug / "index.md", CONTENT_DIR / slug / "index.en.md"):
+                                        if md_path.exists():
+                                            print(f"     📝 {md_path.name} : ID {real_id} en attente d'écriture")
+                                            frontmatter_edits.edit(md_path, resolve_pending_id(real_id), "rootme_id")
                                     
                                     # On met à jour l'info locale pour que la suite du script fonctionne
                                     challenge_id = real_id
@@ -1681,59 +2068,97 @@ def fetch_all_challenges_with_stats():
         
         print(f"   - Challenge {challenge_id} ({info['slug']})...")
         debug_label = info.get("slug") or str(challenge_id)
-        data = fetch_challenge(challenge_id, override_url=info.get("url"), debug_label=debug_label)
+        with span("fetch_challenge", "challenge", id=challenge_id, slug=info.get("slug")), \
+                profile_phase("challenge_fetch"):
+            record = fetch_challenge(challenge_id, override_url=info.get("url"), debug_label=debug_label)
         
-        if data:
-            # Fusion avec cache existant si nécessaire
-            existing = existing_data.get(info["slug"])
-            if existing:
-                data = merge_challenge_data(data, existing)
+        if record:
             # Préserver l'URL définie dans CHALLENGES si elle est valide (pas de TODO)
             if "url" in info and "TODO" not in info["url"]:
-                data["url"] = info["url"]
+                record.url = info["url"]
             
             # S'assurer que le challenge a une URL, sinon fallback sur celle de l'API (qui est partielle "fr/...")
-            if not data.get("url") or not data["url"].startswith("http"):
-                  partial = data.get("url_challenge", "") or data.get("url", "")
+            if not record.url or not record.url.startswith("http"):
+                  partial = (record.extra or {}).get("url_challenge") or record.url
                   if partial:
-                       data["url"] = f"https://www.root-me.org/{partial}"
+                       record.url = f"{ROOTME_BASE_URL}/{partial}"
+            
+            # Fusion avec le cache existant (politiques par champ, diff collecté au passage)
+            with profile_phase("merge"):
+                record = catalogue.add(info["slug"], record)
             
+            data = record.to_dict()
             challenges_data[info["slug"]] = data
-            print(f"     ✅ {data['titre']}: {data['score']} pts, {data.get('validations', '?')} validations")
+            print(f"     ✅ {data['titre']}: {data['score']} pts, {data['validations']} validations")
             stats.append({"id": challenge_id, "name": data['titre'], "status": "OK", "info": f"{data['score']} pts"})
             
-            # SAUVEGARDE INCREMENTALE (Pour ne pas tout perdre si crash/429)
+            # SAUVEGARDE INCREMENTALE (Pour ne pas tout perdre si crash/429) : une ligne upsertée dans la base
             try:
-                 DATA_DIR.mkdir(parents=True, exist_ok=True)
-                 with open(CHALLENGES_FILE, "w", encoding="utf-8") as f:
-                     json.dump(challenges_data, f, indent=2, ensure_ascii=False)
+                 with span("upsert", "io", slug=info["slug"]), profile_phase("save"):
+                     store.upsert_challenges({info["slug"]: data})
                  print(f"     💾 Sauvegardé ({len(challenges_data)} total)")
             except Exception as e:
                  print(f"     ⚠️ Echec sauvegarde incrémentale : {e}")
 
         else:
-             existing = existing_data.get(info["slug"])
+             existing = catalogue.keep(info["slug"])
              if existing:
-                 challenges_data[info["slug"]] = existing
-                 stats.append({"id": challenge_id, "name": existing.get("titre", info['slug']), "status": "CACHED", "info": "Cache used"})
+                 challenges_data[info["slug"]] = existing.to_dict()
+                 stats.append({"id": challenge_id, "name": existing.titre or info['slug'], "status": "CACHED", "info": "Cache used"})
              else:
                  stats.append({"id": challenge_id, "name": info['slug'], "status": "ERROR", "info": "Fetch failed"})
-    
-    # Sauvegarde finale deja faite incrémentalement, mais on repasse
-    print(f"✅ {len(challenges_data)} challenge(s) sauvegardé(s) au total")
-    return challenges_data, stats
+    if len(frontmatter_edits):
+        with span("frontmatter", "io"), profile_phase("save"):
+            for line in frontmatter_edits.apply().lines(root=ROOT_DIR):
+                print(line)
+    # Sauvegarde finale : la base ne garde que les challenges du contenu, export JSON si changement
+    _, diff = catalogue.finish()
+    if not discovered_challenges:
+        # CONTENT_DIR absent ou mal configuré : ne pas vider la base ni data/rootme_challenges.json
+        print("⚠️ Aucun challenge détecté dans le contenu : base et exports laissés intacts")
+        return challenges_data, stats, diff
+    store.retain_challenges(challenges_data)
+    written = export_data("challenges")
+    print(f"✅ {len(challenges_data)} challenge(s) sauvegardé(s) au total"
+          f"{'' if written else ' (data/rootme_challenges.json inchangé)'}")
+    export_stats(challenges_data, {info["slug"]: info["date"] for info in discovered_challenges.values() if info.get("date")})
+    return challenges_data, stats, diff
+
+
+def export_stats(challenges_data, solved_dates):
+    """Agrégats pour les widgets (data/rootme_stats.json), réécrits seulement s'ils changent."""
+    with span("export", "io", files="stats"), profile_phase("save"):
+        path = data_store().export_derived("stats", compute_stats(challenges_data, solved_dates))
+    if path:
+        print(f"📊 {path.name} mis à jour")
 
 def fetch_all_challenges():
-    d, _ = fetch_all_challenges_with_stats()
+    d, _, _ = fetch_all_challenges_with_stats()
     return d
 
 
-def generate_summary(profile, challenges_data, stats_challenges):
+def record_history(profile, challenges_data):
+    """Ajoute le run à l'historique des métriques et met à jour l'export Hugo (jamais bloquant)."""
+    if not HISTORY_ENABLED or is_replaying():
+        return
+    try:
+        import metrics_store
+        with metrics_store.MetricsStore() as store:
+            added = store.record_run(profile, challenges_data)
+            slugs = {str(c.get("id")): slug for slug, c in challenges_data.items()}
+            exported = store.export_hugo(DATA_DIR / "rootme_history.json", challenge_slugs=slugs)
+        print(f"📈 Historique : {added} point(s) ajouté(s){', export mis à jour' if exported else ''}")
+    except Exception as e:
+        print(f"⚠️ Historique non mis à jour : {e}")
+
+
+def generate_summary(profile, challenges_data, stats_challenges, duration=None, diff=None):
     """Génère un résumé complet pour GitHub Actions et stdout."""
     # Stats gloabales
     total = len(stats_challenges)
     success = len([c for c in stats_challenges if c['status'] == 'OK'])
     failed = len([c for c in stats_challenges if c['status'] == 'ERROR'])
+    host_metrics, phases = summarize_request_metrics()
     
     # 1. Output pour stdout (Console lisible)
     print("\n" + "="*50)
@@ -1753,6 +2178,32 @@ def generate_summary(profile, challenges_data, stats_challenges):
         # Alignement pour lisibilité
         print(f"   {icon} [{c['id']}] {c['name']:<30} : {c['info']}")
 
+    if diff is not None:
+        counts = diff.counts()
+        print(f"\n🔀 CHANGEMENTS : {counts['changed']} modifié(s), {counts['added']} ajouté(s), "
+              f"{counts['removed']} retiré(s), {counts['unchanged']} inchangé(s)")
+        for line in diff.lines():
+            print(f"   ~ {line}")
+
+    print(f"\n⏱️ TEMPS" + (f" : {duration:.1f}s au total" if duration is not None else ""))
+    print("   " + " | ".join(f"{name} {secs:.1f}s" for name, secs in phases.items()))
+    for host, h in host_metrics.items():
+        print(f"   🌐 {host:<24} {h['requests']} req ({h['errors']} err, {h['retries']} retries, "
+              f"{h['rejected']} coupée(s)) | "
+              f"p50 {h['p50_s']:.2f}s p95 {h['p95_s']:.2f}s | TTFB p50 {h['ttfb_p50_s']:.2f}s | "
+              f"{h['bytes'] // 1024} Ko | backoff {h['backoff_s']:.1f}s")
+
+    memo = REQUEST_MEMO.summary()
+    if memo["hits"] or memo["joined"]:
+        print(f"   🧠 mémo : {memo['hits']} page(s) servie(s) depuis la mémoire, {memo['joined']} jointe(s) en vol "
+              f"({memo['fetched']} fetch réseau)")
+
+    breakers = BREAKERS.summary()
+    if breakers:
+        print(f"\n🔌 DISJONCTEURS : {BREAKERS.rejected()} requête(s) coupée(s)")
+        for host, b in breakers.items():
+            print(f"   {host:<24} {b['state']} | {b['transitions']} transition(s) | {b['rejected']} coupée(s)")
+
     print("="*50 + "\n")
     
     # 2. Output pour GitHub Actions (Markdown)
@@ -1767,6 +2218,7 @@ def generate_summary(profile, challenges_data, stats_challenges):
         # Section Profil
         md_lines.append("## 👤 Profil")
         if profile:
+             md_lines.append("")
              md_lines.append(f"| Indicateur | Valeur |")
              md_lines.append(f"|---|---|")
              md_lines.append(f"| **Score** | `{profile['score']}` |")
@@ -1782,6 +2234,7 @@ def generate_summary(profile, challenges_data, stats_challenges):
         else:
             md_lines.append(f"⚠️ **{failed} erreurs détectées**")
             
+        md_lines.append("")
         md_lines.append("| ID | Challenge | Statut | Info |")
         md_lines.append("|---|---|---|---|")
         
@@ -1791,6 +2244,61 @@ def generate_summary(profile, challenges_data, stats_challenges):
             name_clean = c['name'].replace("|", "-") # Eviter de casser le markdown table
             info_clean = str(c['info']).replace("|", "-")
             md_lines.append(f"| {c['id']} | {name_clean} | {icon} {status_clean} | {info_clean} |")
+
+        # Section Changements
+        if diff is not None:
+            counts = diff.counts()
+            md_lines.append("")
+            md_lines.append("## 🔀 Changements")
+            md_lines.append(f"**{counts['changed']}** modifié(s), **{counts['added']}** ajouté(s), "
+                            f"**{counts['removed']}** retiré(s), {counts['unchanged']} inchangé(s)")
+            if diff.changed:
+                md_lines.append("")
+                md_lines.append("| Challenge | Champ | Avant | Après |")
+                md_lines.append("|---|---|---|---|")
+                for slug, changes in diff.changed.items():
+                    for field, (old, new) in changes.items():
+                        md_lines.append(f"| {slug} | {field} | `{old}` | `{new}` |")
+
+        # Section Temps
+        md_lines.append("")
+        md_lines.append("## ⏱️ Temps")
+        if duration is not None:
+            md_lines.append(f"**Durée totale** : {duration:.1f}s")
+        memo = REQUEST_MEMO.summary()
+        if memo["hits"] or memo["joined"]:
+            md_lines.append("")
+            md_lines.append(f"**Mémo requêtes** : {memo['hits']} page(s) servie(s) depuis la mémoire, "
+                            f"{memo['joined']} jointe(s) en vol, {memo['fetched']} fetch réseau")
+        md_lines.append("")
+        md_lines.append("| Phase | Total |")
+        md_lines.append("|---|---|")
+        for name, secs in phases.items():
+            md_lines.append(f"| {name} | `{secs:.1f}s` |")
+        if host_metrics:
+            md_lines.append("")
+            md_lines.append("| Hôte | Requêtes | Erreurs | Retries | Coupées | p50 | p95 | TTFB p50 | TTFB p95 | Octets | Backoff |")
+            md_lines.append("|---|---|---|---|---|---|---|---|---|---|---|")
+            for host, h in host_metrics.items():
+                md_lines.append(
+                    f"| {host} | {h['requests']} | {h['errors']} | {h['retries']} | {h['rejected']} | {h['p50_s']:.2f}s | "
+                    f"{h['p95_s']:.2f}s | {h['ttfb_p50_s']:.2f}s | {h['ttfb_p95_s']:.2f}s | {h['bytes']} | "
+                    f"{h['backoff_s']:.1f}s |"
+                )
+
+        # Section Disjoncteurs
+        transitions = BREAKERS.transitions()
+        if transitions:
+            md_lines.append("")
+            md_lines.append("## 🔌 Disjoncteurs")
+            md_lines.append(f"**{BREAKERS.rejected()}** requête(s) coupée(s) sans réseau")
+            md_lines.append("")
+            md_lines.append("| Heure | Hôte | Transition | Raison | Pause |")
+            md_lines.append("|---|---|---|---|---|")
+            for t in transitions:
+                at = datetime.fromtimestamp(t["at"]).strftime("%H:%M:%S")
+                pause = f"{t['cooldown_s']:.0f}s" if t["cooldown_s"] is not None else ""
+                md_lines.append(f"| {at} | {t['host']} | {t['from']} → {t['to']} | {t['reason']} | {pause} |")
             
         try:
             with open(github_step_summary, 'a', encoding='utf-8') as f:
@@ -1799,7 +2307,7 @@ def generate_summary(profile, challenges_data, stats_challenges):
         except Exception as e:
             print(f"⚠️ Impossible d'écrire le résumé GitHub : {e}")
 
-def main():
+def main(diff_path=None):
     print("=" * 50)
     print("🎯 Root-Me Data Fetcher (v2.0 Enhanced)")
     print("=" * 50)
@@ -1814,13 +2322,51 @@ def main():
     print(f"\n🕒 Démarrage cycle unique (CI={is_ci})...")
     sys.stdout.flush()
     
-    profile = fetch_profile()
-    challenges_data, run_stats = fetch_all_challenges_with_stats() 
-    generate_summary(profile, challenges_data, run_stats)
+    if CASSETTE is not None:
+        print(f"📼 Cassette {CASSETTE.mode}: {CASSETTE.path} ({len(CASSETTE.interactions)} échanges)")
+    
+    with span("fetch_profile", "profile"), profile_phase("profile"):
+        profile = fetch_profile()
+    challenges_data, run_stats, diff = fetch_all_challenges_with_stats() 
+    generate_summary(profile, challenges_data, run_stats, duration=time.time() - start_time, diff=diff)
+    if diff_path:
+        print(f"🔀 Diff écrit dans {diff.save(diff_path)}")
+    with span("history", "save"), profile_phase("save"):
+        record_history(profile, challenges_data)
+
+    if CASSETTE is not None and CASSETTE.misses:
+        print(f"⚠️ {CASSETTE.misses} requête(s) absente(s) de la cassette")
 
     print("=" * 50)
     print("✅ Mise à jour terminée!")
 
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Récupère les données Root-Me (profil + challenges)")
+    parser.add_argument("--profile", nargs="?", const=str(ROOT_DIR / ".debug" / "profile" / "fetch-rootme"),
+                        metavar="DOSSIER", help="Profil CPU (cProfile) et mémoire (tracemalloc) par phase")
+    parser.add_argument("--trace", nargs="?", const=str(ROOT_DIR / ".debug" / "trace" / "fetch-rootme.json"),
+                        metavar="FICHIER", help="Exporte la timeline du run au format Chrome trace-event")
+    parser.add_argument("--diff", metavar="FICHIER",
+                        help="Écrit le diff structuré du catalogue (champs modifiés, ajouts, retraits) en JSON")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.profile or args.trace:
+        import profiling
+    if args.trace:
+        TRACER = profiling.TraceRecorder(args.trace, process_name="fetch-rootme")
+    try:
+        with span("main"):
+            if args.profile:
+                PROFILER = profiling.PhaseProfiler(args.profile)
+                profiling.run_profiled(lambda: main(args.diff), PROFILER)
+            else:
+                main(args.diff)
+    finally:
+        if CASSETTE is not None:
+            CASSETTE.close()
+        if TRACER:
+            print(f"🧭 Trace écrite dans {TRACER.save()} (chrome://tracing ou ui.perfetto.dev)")
@@ -0,0 +1,424 @@
+"""
+Lecture et édition du frontmatter YAML des pages Hugo (content/**/*.md).
+
+Seul l'en-tête est lu sur le disque : le fichier est parcouru ligne à ligne
+jusqu'au `---` fermant, le corps n'est jamais chargé. Les valeurs sont
+décodées comme Hugo les verrait pour le sous-ensemble de YAML utilisé par
+le site : chaînes entre guillemets doubles ou simples, listes en ligne
+(`tags: ["FTP", "PCAP"]`) ou en bloc (`- item`), dates, booléens, nombres.
+
+Les modifications (`set`, `remove`) ne touchent que les lignes des clés
+concernées : ordre, commentaires, guillemets et clés imbriquées des autres
+lignes sont conservés à l'identique.
+
+    fm = front_matter.read(path)                 # en-tête seul
+    fm.get("rootme_id"), fm.get("categories", [])
+    fm.set("reading_time", 12)
+    front_matter.write(path, fm)                 # atomique, rien si inchangé
+
+    for path, fm in front_matter.read_many(paths):   # lecture en parallèle
+        ...
+
+    batch = front_matter.Batch()                 # modifications groupées
+    batch.set_raw(path, "date", "2024-01-01", after="title")
+    batch.edit(path, lambda fm: fm.set("draft", False))
+    for line in batch.apply().lines():           # une passe par fichier
+        print(line)
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+
+DELIMITER = "---"
+KEY_LINE = re.compile(r"^([A-Za-z_][\w-]*)\s*:(.*)$")
+DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+DATETIME = re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?$")
+INTEGER = re.compile(r"^[-+]?\d+$")
+FLOAT = re.compile(r"^[-+]?\d*\.\d+$")
+# Chaînes qui doivent être entre guillemets pour rester des chaînes en YAML (indicateurs, booléens, et
+# nombres que YAML reconnaît : sexagésimaux "12:30", exposants "1e5", hexa/octal, .inf/.nan, "1.")
+NEEDS_QUOTES = re.compile(
+    r"^$|^[\s\-?:,\[\]{}#&*!|>'\"%@`]|:\s|\s#|\s$|^(true|false|yes|no|on|off|null|~)$"
+    r"|^[-+]?\d+(:[0-5]?\d)+(\.\d*)?$|^[-+]?(\d+\.?\d*|\.\d+)e[-+]?\d+$|^[-+]?\d+\.$"
+    r"|^0x[0-9a-f]+$|^0o?[0-7]+$|^[-+]?\.(inf|nan)$",
+    re.IGNORECASE,
+)
+READ_WORKERS = 8
+
+
+def _strip_comment(raw):
+    """Retire un commentaire ` # ...` hors guillemets."""
+    quote, escaped = None, False
+    for i, c in enumerate(raw):
+        if escaped:
+            escaped = False
+        elif quote:
+            if c == "\\" and quote == '"':
+                escaped = True
+            elif c == quote:
+                quote = None
+        elif c in "\"'":
+            quote = c
+        elif c == "#" and (i == 0 or raw[i - 1].isspace()):
+            return raw[:i].rstrip()
+    return raw
+
+
+def _split_items(inner):
+    """Éléments d'une liste en ligne, en respectant les guillemets."""
+    items, current, quote, escaped = [], [], None, False
+    for c in inner:
+        if escaped:
+            current.append(c)
+            escaped = False
+        elif quote:
+            current.append(c)
+            if c == "\\" and quote == '"':
+                escaped = True
+            elif c == quote:
+                quote = None
+        elif c in "\"'":
+            quote = c
+            current.append(c)
+        elif c == ",":
+            items.append("".join(current))
+            current = []
+        else:
+            current.append(c)
+    items.append("".join(current))
+    return [item.strip() for item in items if item.strip()]
+
+
+def parse_scalar(raw):
+    raw = raw.strip()
+    if len(raw) >= 2 and raw[0] == raw[-1] == '"':
+        try:
+            return json.loads(raw)
+        except ValueError:
+            return raw[1:-1]
+    if len(raw) >= 2 and raw[0] == raw[-1] == "'":
+        return raw[1:-1].replace("''", "'")
+    lowered = raw.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if lowered in ("null", "~", ""):
+        return None
+    if INTEGER.match(raw):
+        return int(raw)
+    if FLOAT.match(raw):
+        return float(raw)
+    if DATE.match(raw):
+        try:
+            return date.fromisoformat(raw)
+        except ValueError:
+            return raw
+    if DATETIME.match(raw):
+        try:
+            return datetime.fromisoformat(raw.replace("Z", "+00:00"))
+        except ValueError:
+            return raw
+    return raw
+
+
+def parse_value(raw):
+    raw = _strip_comment(raw.strip())
+    if raw.startswith("[") and raw.endswith("]"):
+        return [parse_scalar(item) for item in _split_items(raw[1:-1])]
+    return parse_scalar(raw)
+
+
+def format_scalar(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    text = str(value)
+    if NEEDS_QUOTES.search(text) or DATE.match(text) or DATETIME.match(text) or INTEGER.match(text) or FLOAT.match(text):
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+
+def format_value(value):
+    """Valeur Python -> texte YAML d'une ligne (les listes sont écrites en ligne, éléments entre guillemets)."""
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(json.dumps(item, ensure_ascii=False) if isinstance(item, str) else format_scalar(item)
+                               for item in value) + "]"
+    return format_scalar(value)
+
+
+class Frontmatter:
+    """En-tête d'une page : lignes d'origine + valeurs décodées des clés de premier niveau."""
+
+    def __init__(self, lines=(), present=True, newline="\n", closing=None):
+        self.lines = list(lines)
+        self.present = present
+        self.newline = newline
+        # Fin de la ligne `---` fermante telle que lue ("" si le fichier s'arrête dessus)
+        self.closing = newline if closing is None else closing
+        self.changed = False
+
+    def _spans(self):
+        """{clé: (première ligne, fin exclue)} ; une clé couvre ses lignes indentées (liste en bloc)."""
+        spans, current = {}, None
+        for i, line in enumerate(self.lines):
+            match = KEY_LINE.match(line)
+            if match and not line[:1].isspace():
+                current = match.group(1)
+                spans[current] = [i, i + 1]
+            elif current and (line[:1].isspace() or line.lstrip().startswith("- ")):
+                spans[current][1] = i + 1
+            else:
+                current = None
+        return {key: tuple(span) for key, span in spans.items()}
+
+    def keys(self):
+        return list(self._spans())
+
+    def __contains__(self, key):
+        return key in self._spans()
+
+    def raw(self, key):
+        """Texte brut de la valeur (après `clé:`), ou None."""
+        span = self._spans().get(key)
+        if span is None:
+            return None
+        return KEY_LINE.match(self.lines[span[0]]).group(2).strip()
+
+    def get(self, key, default=None):
+        span = self._spans().get(key)
+        if span is None:
+            return default
+        start, end = span
+        inline = KEY_LINE.match(self.lines[start]).group(2)
+        if _strip_comment(inline).strip() == "" and end > start + 1:
+            items = [line.strip() for line in self.lines[start + 1:end]]
+            if all(item.startswith("-") for item in items if item):
+                return [parse_value(item[1:]) for item in items if item]
+            return None
+        return parse_value(inline)
+
+    def to_dict(self):
+        return {key: self.get(key) for key in self._spans()}
+
+    def set_raw(self, key, raw, after=None):
+        """Écrit `clé: raw` à la place de la clé (ou après `after`, sinon en fin d'en-tête). Retourne True si changé."""
+        line = f"{key}: {raw}"
+        spans = self._spans()
+        if key in spans:
+            start, end = spans[key]
+            if self.lines[start:end] == [line]:
+                return False
+            self.lines[start:end] = [line]
+        elif after in spans:
+            self.lines.insert(spans[after][1], line)
+        else:
+            self.lines.append(line)
+        self.present = True
+        self.changed = True
+        return True
+
+    def set(self, key, value, after=None):
+        """Comme set_raw, mais ne réécrit pas une ligne dont la valeur décodée est déjà `value`."""
+        if key in self and self.get(key) == value:
+            return False
+        return self.set_raw(key, format_value(value), after=after)
+
+    def remove(self, key):
+        span = self._spans().get(key)
+        if span is None:
+            return False
+        del self.lines[span[0]:span[1]]
+        self.changed = True
+        return True
+
+    def render(self):
+        """Bloc d'en-tête complet, délimiteurs et saut de ligne final compris ("" si pas d'en-tête)."""
+        if not self.present:
+            return ""
+        nl = self.newline
+        return DELIMITER + nl + "".join(line + nl for line in self.lines) + DELIMITER + self.closing
+
+
+def split(text):
+    """Texte complet -> (Frontmatter, corps)."""
+    newline = "\r\n" if text.startswith(DELIMITER + "\r\n") else "\n"
+    if not text.startswith(DELIMITER + newline):
+        return Frontmatter(present=False), text
+    lines, offset = [], len(DELIMITER + newline)
+    while True:
+        end = text.find("\n", offset)
+        line = text[offset:] if end == -1 else text[offset:end]
+        if line.rstrip("\r") == DELIMITER:
+            body = "" if end == -1 else text[end + 1:]
+            closing = "" if end == -1 else line[len(DELIMITER):] + "\n"
+            return Frontmatter(lines, newline=newline, closing=closing), body
+        if end == -1:
+            # Pas de délimiteur fermant : pas d'en-tête
+            return Frontmatter(present=False), text
+        lines.append(line.rstrip("\r"))
+        offset = end + 1
+
+
+def read(path, lead=0):
+    """Lit uniquement l'en-tête de `path` ; `lead` octets du corps sont gardés dans `fm.lead` si demandé."""
+    with open(path, "rb") as f:
+        first = f.readline()
+        newline = "\r\n" if first.endswith(b"\r\n") else "\n"
+        if first.rstrip(b"\r\n") != DELIMITER.encode() or not first.endswith(b"\n"):
+            fm = Frontmatter(present=False)
+            fm.lead = (first + f.read(max(0, lead - len(first)))).decode("utf-8", "replace")[:lead] if lead else ""
+            return fm
+        lines = []
+        for raw in f:
+            line = raw.decode("utf-8").rstrip("\r\n")
+            if line == DELIMITER:
+                fm = Frontmatter(lines, newline=newline, closing=raw.decode("utf-8")[len(DELIMITER):])
+                fm.lead = f.read(lead).decode("utf-8", "replace") if lead else ""
+                return fm
+            lines.append(line)
+    fm = Frontmatter(present=False)
+    fm.lead = ""
+    return fm
+
+
+def read_many(paths, lead=0, workers=READ_WORKERS):
+    """[(path, Frontmatter)] pour chaque chemin lisible, en-têtes lus en parallèle (I/O)."""
+    paths = list(paths)
+
+    def safe_read(path):
+        try:
+            return path, read(path, lead=lead)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"⚠️ Frontmatter illisible {path}: {e}")
+            return path, None
+
+    if len(paths) <= 1 or workers <= 1:
+        results = map(safe_read, paths)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(safe_read, paths))
+    return [(path, fm) for path, fm in results if fm is not None]
+
+
+def scan(directory, pattern="*.md", lead=0, workers=READ_WORKERS):
+    """Frontmatter de tous les fichiers `pattern` sous `directory` (récursif)."""
+    return read_many(sorted(Path(directory).rglob(pattern)), lead=lead, workers=workers)
+
+
+def replace_text(text, fm):
+    """Texte complet avec l'en-tête remplacé par `fm` (corps inchangé octet pour octet)."""
+    _, body = split(text)
+    return fm.render() + body
+
+
+def write(path, fm):
+    """Réécrit l'en-tête de `path` (corps conservé), atomiquement ; retourne False si rien ne change."""
+    path = Path(path)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        text = f.read()
+    new_text = replace_text(text, fm)
+    if new_text == text:
+        return False
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.write(new_text)
+    os.replace(tmp, path)
+    return True
+
+
+class BatchResult:
+    """Bilan d'un Batch.apply : fichiers réécrits (avec les clés modifiées), inchangés, absents, en erreur."""
+
+    def __init__(self):
+        self.written = {}
+        self.unchanged = []
+        self.missing = []
+        self.errors = {}
+
+    def lines(self, root=None):
+        def label(path):
+            try:
+                return str(Path(path).relative_to(root)) if root else str(path)
+            except ValueError:
+                return str(path)
+
+        out = [f"📝 Frontmatter : {len(self.written)} fichier(s) réécrit(s), {len(self.unchanged)} inchangé(s)"
+               + (f", {len(self.missing)} absent(s)" if self.missing else "")
+               + (f", {len(self.errors)} erreur(s)" if self.errors else "")]
+        out += [f"   ✏️  {label(path)} ({', '.join(keys)})" for path, keys in self.written.items()]
+        out += [f"   ❌ {label(path)} : {error}" for path, error in self.errors.items()]
+        return out
+
+
+class Batch:
+    """
+    Modifications d'en-tête en attente sur plusieurs fichiers, appliquées en une
+    passe par fichier : une lecture, toutes les modifications dans l'ordre,
+    une écriture atomique seulement si le contenu change.
+    """
+
+    def __init__(self):
+        self._edits = {}
+
+    def __len__(self):
+        return len(self._edits)
+
+    def edit(self, path, func, label=None):
+        """func(fm) modifie l'en-tête ; retourne True (ou la liste des clés) si quelque chose a changé."""
+        self._edits.setdefault(Path(path), []).append((func, label or getattr(func, "__name__", "edit")))
+
+    def set(self, path, key, value, after=None):
+        self.edit(path, lambda fm: fm.set(key, value, after=after), key)
+
+    def set_raw(self, path, key, raw, after=None):
+        self.edit(path, lambda fm: fm.set_raw(key, raw, after=after), key)
+
+    def apply(self, dry_run=False):
+        result = BatchResult()
+        edits, self._edits = self._edits, {}
+        for path, funcs in edits.items():
+            try:
+                with open(path, "r", encoding="utf-8", newline="") as f:
+                    text = f.read()
+            except FileNotFoundError:
+                result.missing.append(path)
+                continue
+            except (OSError, UnicodeDecodeError) as e:
+                result.errors[path] = str(e)
+                continue
+            fm, body = split(text)
+            if not fm.present:
+                result.errors[path] = "pas de frontmatter"
+                continue
+            touched = []
+            try:
+                for func, label in funcs:
+                    changed = func(fm)
+                    if changed:
+                        touched.extend(changed if isinstance(changed, (list, tuple)) else [label])
+            except Exception as e:
+                result.errors[path] = str(e)
+                continue
+            new_text = fm.render() + body
+            if new_text == text:
+                result.unchanged.append(path)
+                continue
+            if not dry_run:
+                tmp = path.with_name(f".{path.name}.tmp")
+                try:
+                    with open(tmp, "w", encoding="utf-8", newline="") as f:
+                        f.write(new_text)
+                    os.replace(tmp, path)
+                except OSError as e:
+                    result.errors[path] = str(e)
+                    continue
+            result.written[path] = list(dict.fromkeys(touched))
+        return result
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Génère un catalogue Root-Me synthétique pour les tests de montée en charge.
+
+Crée dans le dossier de sortie la même arborescence que le site :
+- content/root-me-challenges/<slug>/index.md (+ index.en.md)
+- data/rootme_challenges.json et data/rootme.json
+
+Les données sont déterministes pour une graine donnée (--seed).
+
+Usage:
+    python3 scripts/gen-catalogue.py --size 500
+    python3 scripts/gen-catalogue.py --size 5000 --out /tmp/catalogue --seed 42
+"""
+
+import argparse
+import json
+import random
+import shutil
+import sys
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT_DIR = SCRIPT_DIR.parent
+
+RUBRIQUES = {
+    "Réseau": "Reseau",
+    "Programmation": "Programmation",
+    "Web - Serveur": "Web-Serveur",
+    "Web - Client": "Web-Client",
+    "App - Système": "App-Systeme",
+    "App - Script": "App-Script",
+    "Cryptanalyse": "Cryptanalyse",
+    "Forensic": "Forensic",
+    "Cracking": "Cracking",
+    "Réaliste": "Realiste",
+    "Stéganographie": "Steganographie",
+}
+DIFFICULTES = ["Très facile", "Facile", "Moyen", "Difficile", "Très difficile"]
+WORDS = ["HTTP", "ELF", "x64", "Format", "String", "JWT", "SQL", "Injection", "Buffer", "Overflow",
+         "Hash", "XSS", "Stored", "Race", "Condition", "Padding", "Oracle", "PE", "DotNet", "Trame",
+         "Authentification", "Bypass", "Redirect", "Header", "Cookie", "Logic", "Bug", "Leak"]
+TAGS = ["Linux", "Web", "Python", "Wireshark", "GDB", "Burp", "Crypto", "Forensic", "Reverse", "Pwn"]
+
+BODY = """
+{{{{< rootme-challenge slug="{slug}" >}}}}
+
+---
+
+## Contexte
+
+{paragraph}
+
+---
+
+## Résolution
+
+{paragraph}
+
+```bash
+$ ./exploit.py --target {slug}
+```
+"""
+
+
+def make_challenge(i, rng):
+    rubrique = rng.choice(list(RUBRIQUES))
+    words = rng.sample(WORDS, rng.randint(2, 4))
+    titre = f"{words[0]} - {' '.join(words[1:])}"
+    slug = f"{'-'.join(w.lower() for w in words)}-{i}"
+    level = rng.randint(1, 5)
+    validations = int(rng.paretovariate(1.2) * 200)
+    return slug, {
+        "id": str(1000 + i),
+        "titre": titre,
+        "rubrique": rubrique,
+        "auteur": f"auteur{rng.randint(1, max(2, i // 10 + 1))}",
+        "date": f"{rng.randint(2006, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 12:00:00",
+        "score": [5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 60, 70, 80, 90][rng.randint(0, 13)],
+        "difficulte": DIFFICULTES[level - 1],
+        "validations": validations,
+        "note": f"{rng.randint(1, 99)}%",
+        "url": f"https://www.root-me.org/fr/Challenges/{RUBRIQUES[rubrique]}/{slug}",
+    }
+
+
+def write_index(path, challenge, slug, rng, lang="fr"):
+    tags = rng.sample(TAGS, 3) + [challenge["difficulte"]]
+    paragraph = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+    frontmatter = [
+        "---",
+        f'title: "{challenge["titre"]}"',
+        f"date: {challenge['date'][:10]}",
+        'image: "/img/banners/rootme-banner.png"',
+        "draft: false",
+        f"rootme_id: {challenge['id']}",
+        f'categories: ["Root-Me", "{challenge["rubrique"]}"]',
+        f"tags: [{', '.join(json.dumps(t, ensure_ascii=False) for t in tags)}]",
+        "---",
+    ]
+    if lang == "en":
+        paragraph = f"(en) {paragraph}"
+    path.write_text("\n".join(frontmatter) + "\n" + BODY.format(slug=slug, paragraph=paragraph), encoding="utf-8")
+
+
+def generate(out_dir, size, seed=0, with_en=True):
+    """Écrit un catalogue de `size` challenges dans out_dir ; retourne {slug: données}."""
+    rng = random.Random(seed)
+    out_dir = Path(out_dir)
+    content_dir = out_dir / "content" / "root-me-challenges"
+    data_dir = out_dir / "data"
+    content_dir.mkdir(parents=True, exist_ok=True)
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    challenges = {}
+    for i in range(size):
+        slug, challenge = make_challenge(i, rng)
+        challenges[slug] = challenge
+        (content_dir / slug).mkdir(exist_ok=True)
+        write_index(content_dir / slug / "index.md", challenge, slug, rng)
+        if with_en:
+            write_index(content_dir / slug / "index.en.md", challenge, slug, rng, lang="en")
+
+    with open(data_dir / "rootme_challenges.json", "w", encoding="utf-8") as f:
+        json.dump(challenges, f, indent=2, ensure_ascii=False)
+    with open(data_dir / "rootme.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "nom": "Synthetic User",
+            "score": sum(c["score"] for c in challenges.values()),
+            "position": 1000,
+            "challenges_resolus": size,
+            "profil_url": "https://www.root-me.org/Synthetic-User",
+            "derniere_mise_a_jour": "2026-01-01",
+        }, f, indent=2, ensure_ascii=False)
+    return challenges
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère un catalogue Root-Me synthétique")
+    parser.add_argument("--size", type=int, default=500, help="Nombre de challenges")
+    parser.add_argument("--out", help="Dossier de sortie (défaut: .debug/catalogue-<size>)")
+    parser.add_argument("--seed", type=int, default=0, help="Graine aléatoire")
+    parser.add_argument("--no-en", action="store_true", help="Ne pas générer index.en.md")
+    parser.add_argument("--clean", action="store_true", help="Vide le dossier de sortie avant génération")
+    args = parser.parse_args()
+
+    out_dir = Path(args.out) if args.out else ROOT_DIR / ".debug" / f"catalogue-{args.size}"
+    if out_dir.resolve() == ROOT_DIR.resolve():
+        print("❌ Refus d'écrire le catalogue synthétique dans le dépôt lui-même.")
+        sys.exit(1)
+    if args.clean and out_dir.exists():
+        shutil.rmtree(out_dir)
+
+    generate(out_dir, args.size, seed=args.seed, with_en=not args.no_en)
+    print(f"✅ {args.size} challenges générés dans {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
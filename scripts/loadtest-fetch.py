@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test de charge de fetch-rootme.py contre le stand-in local (rootme-standin.py).
+
+Pour chaque taille de catalogue (10, 100, 1000 challenges par défaut) :
+- génère un arbre content/root-me-challenges temporaire (index.md avec rootme_id)
+- démarre le stand-in avec la latence / le jitter / le taux d'erreurs demandés
+- exécute fetch_profile() puis fetch_all_challenges_with_stats()
+- mesure le temps total, les requêtes servies, les retries et le temps de backoff
+
+Usage:
+    python3 scripts/loadtest-fetch.py
+    python3 scripts/loadtest-fetch.py --sizes 10,100 --latency 30 --jitter 10 --error-rate 0.05
+    python3 scripts/loadtest-fetch.py --keep-delays --sizes 10   # délais de politesse réels
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+
+
+def load_script(name, filename):
+    spec = importlib.util.spec_from_file_location(name, SCRIPT_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_content_tree(root, size, segments):
+    """Crée `size` challenges factices, catégories tournantes."""
+    content_dir = root / "content" / "root-me-challenges"
+    for i in range(size):
+        category = segments[i % len(segments)]
+        slug = f"loadtest-{i:05d}"
+        (content_dir / slug).mkdir(parents=True, exist_ok=True)
+        (content_dir / slug / "index.md").write_text(
+            "---\n"
+            f'title: "Loadtest {i}"\n'
+            f'rootme_id: "{100000 + i}"\n'
+            f'categories: ["Root-Me", "{category}"]\n'
+            "---\n\n"
+            f'{{{{< rootme-challenge id="{100000 + i}" >}}}}\n',
+            encoding="utf-8",
+        )
+    return content_dir
+
+
+def server_stats(base_url):
+    with urllib.request.urlopen(f"{base_url}/__stats", timeout=5) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def run_size(size, args, standin):
+    state = standin.StandinState(
+        corpus_dir=args.corpus,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+    )
+    server, base_url = standin.start_in_thread(state)
+    os.environ["ROOTME_BASE_URL"] = base_url
+    os.environ["ROOTME_API_URL"] = f"{base_url}/api"
+    # Pas de bootstrap venv/pip ni de cookies réels pendant le test
+    os.environ.setdefault("ROOTME_VENV_BOOTSTRAP", "1")
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="rootme-loadtest-") as tmp:
+            root = Path(tmp)
+            fetch = load_script(f"fetch_rootme_{size}", "fetch-rootme.py")
+            fetch.CONTENT_DIR = build_content_tree(root, size, sorted(set(fetch.CATEGORY_TO_SEGMENT.values())))
+            fetch.DATA_DIR = root / "data"
+            fetch.ROOTME_COOKIES = ""
+            if not args.keep_delays:
+                fetch.SCRAPE_DELAY_RANGE = (0.0, 0.0)
+                fetch.API_DELAY = 0.0
+
+            output = io.StringIO()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(output if not args.verbose else sys.stdout):
+                fetch.fetch_profile()
+                challenges_data, _, _ = fetch.fetch_all_challenges_with_stats()
+            wall = time.perf_counter() - start
+    finally:
+        counters = server_stats(base_url)
+        server.shutdown()
+
+    # Requêtes coupées par le disjoncteur sans essai réseau : comptées à part (short_circuited)
+    metrics = [m for m in fetch.REQUEST_METRICS if not (m.get("rejected") and not m["attempts"])]
+    retries = sum(max(0, m.get("attempts", 1) - 1) for m in metrics)
+    totals = [m["connect_s"] + m["ttfb_s"] + m["transfer_s"] for m in metrics]
+    return {
+        "size": size,
+        "wall_s": wall,
+        "fetched": len(challenges_data),
+        "server_requests": counters["requests"],
+        "injected_errors": counters["injected"],
+        "by_kind": counters["by_kind"],
+        "client_requests": len(metrics),
+        "retries": retries,
+        "short_circuited": fetch.BREAKERS.rejected(),
+        "memo": fetch.REQUEST_MEMO.summary(),
+        "backoff_s": fetch.PHASE_TIMINGS["backoff"],
+        "sleep_s": fetch.PHASE_TIMINGS["sleep"],
+        "network_s": fetch.PHASE_TIMINGS["network"],
+        "parse_s": fetch.PHASE_TIMINGS["parse"],
+        "p95_ms": fetch.percentile(totals, 95) * 1000,
+    }
+
+
+def print_report(rows):
+    print(f"\n{'taille':>6} {'temps s':>8} {'ok':>5} {'req srv':>8} {'erreurs':>8} {'retries':>8} "
+          f"{'coupées':>8} {'backoff s':>10} {'réseau s':>9} {'parse s':>8} {'p95 ms':>8}")
+    print("-" * 101)
+    for r in rows:
+        print(f"{r['size']:>6} {r['wall_s']:>8.2f} {r['fetched']:>5} {r['server_requests']:>8} "
+              f"{r['injected_errors']:>8} {r['retries']:>8} "
+              f"{r['short_circuited']:>8} {r['backoff_s']:>10.2f} "
+              f"{r['network_s']:>9.2f} {r['parse_s']:>8.2f} {r['p95_ms']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge de fetch-rootme.py contre un stand-in local")
+    parser.add_argument("--sizes", default="10,100,1000", help="Tailles de catalogue (séparées par des virgules)")
+    parser.add_argument("--corpus", default=str(SCRIPT_DIR.parent / ".debug" / "rootme"),
+                        help="Captures servies par le stand-in")
+    parser.add_argument("--latency", type=float, default=20.0, help="Latence serveur (ms)")
+    parser.add_argument("--jitter", type=float, default=10.0, help="Jitter serveur +/- (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Taux d'erreurs 429/503 injectées")
+    parser.add_argument("--retry-after", type=int, default=0, help="Retry-After renvoyé avec les erreurs (s)")
+    parser.add_argument("--keep-delays", action="store_true", help="Conserve les pauses de politesse")
+    parser.add_argument("--json", help="Écrit les résultats bruts dans ce fichier")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Affiche la sortie de fetch-rootme")
+    args = parser.parse_args()
+
+    standin = load_script("rootme_standin", "rootme-standin.py")
+    rows = []
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        print(f"🔄 Catalogue de {size} challenges...")
+        rows.append(run_size(size, args, standin))
+
+    print_report(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Résultats écrits dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Moteur de fusion déclaratif pour les catalogues (challenges Root-Me, ...).
+
+Chaque champ a une politique nommée dans une table ({champ: politique}) :
+- known    : la nouvelle valeur si elle est connue (non None), sinon l'ancienne
+- positive : la nouvelle valeur si elle est > 0 / non vide, sinon l'ancienne
+- newer    : toujours la nouvelle valeur
+- older    : toujours l'ancienne valeur
+- union    : fusion de dicts (les clés de la nouvelle valeur l'emportent)
+
+Les enregistrements fusionnés sont des objets à __slots__ déjà normalisés
+(voir records.py) : les politiques n'ont pas à re-vérifier les placeholders.
+
+CatalogueMerge fusionne un catalogue entier en une passe et produit un
+CatalogueDiff structuré (ajouts, retraits, champs modifiés avec ancienne et
+nouvelle valeur) réutilisable par le résumé de run ou la décision de commit.
+"""
+
+import json
+import os
+from pathlib import Path
+
+
+def _known(old, new):
+    return new if new is not None else old
+
+
+def _positive(old, new):
+    return new if new else old
+
+
+def _newer(old, new):
+    return new
+
+
+def _older(old, new):
+    return old
+
+
+def _union(old, new):
+    if old and new:
+        return {**old, **new}
+    return new or old or None
+
+
+POLICIES = {
+    "known": _known,
+    "positive": _positive,
+    "newer": _newer,
+    "older": _older,
+    "union": _union,
+}
+
+
+def compile_policies(table):
+    """{champ: nom de politique} -> tuple ((champ, fonction), ...) ; lève ValueError si inconnue."""
+    compiled = []
+    for field, name in table.items():
+        if name not in POLICIES:
+            raise ValueError(f"Politique de fusion inconnue pour {field!r} : {name!r}")
+        compiled.append((field, POLICIES[name]))
+    return tuple(compiled)
+
+
+def merge_fields(old, new, policies, compare=()):
+    """Fusionne deux enregistrements selon `policies` (compilées).
+
+    Retourne (fusionné, changements) où changements = {champ: (ancien, nouveau)}
+    pour les champs de `compare` dont la valeur fusionnée diffère de l'ancienne.
+    """
+    cls = type(new)
+    merged = cls.__new__(cls)
+    for field, policy in policies:
+        setattr(merged, field, policy(getattr(old, field), getattr(new, field)))
+    changes = {}
+    for field in compare:
+        before, after = getattr(old, field), getattr(merged, field)
+        if before != after:
+            changes[field] = (before, after)
+    return merged, changes
+
+
+class CatalogueDiff:
+    """Différences entre l'ancien et le nouveau catalogue, par clé (slug)."""
+
+    def __init__(self):
+        self.added = []
+        self.removed = []
+        self.kept = []
+        self.unchanged = []
+        self.changed = {}
+
+    @property
+    def has_changes(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def counts(self):
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "changed": len(self.changed),
+            "unchanged": len(self.unchanged),
+            "kept": len(self.kept),
+        }
+
+    def field_counts(self):
+        """{champ: nombre d'entrées où il a changé}."""
+        counts = {}
+        for changes in self.changed.values():
+            for field in changes:
+                counts[field] = counts.get(field, 0) + 1
+        return counts
+
+    def to_dict(self):
+        return {
+            "counts": self.counts(),
+            "fields": self.field_counts(),
+            "added": self.added,
+            "removed": self.removed,
+            "kept": self.kept,
+            "changed": {key: {field: {"old": old, "new": new} for field, (old, new) in changes.items()}
+                        for key, changes in self.changed.items()},
+        }
+
+    def lines(self, limit=20):
+        """Lignes lisibles ("slug: champ a -> b") pour la console / le résumé."""
+        lines = []
+        for key, changes in self.changed.items():
+            parts = ", ".join(f"{field} {old!r} → {new!r}" for field, (old, new) in changes.items())
+            lines.append(f"{key}: {parts}")
+        if len(lines) > limit:
+            lines = lines[:limit] + [f"... et {len(lines) - limit} autre(s)"]
+        return lines
+
+    def save(self, path):
+        """Écrit le diff en JSON (écriture atomique)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp, path)
+        return path
+
+
+class CatalogueMerge:
+    """Fusion d'un catalogue {clé: enregistrement} en une passe.
+
+    add() fusionne une entrée fraîche avec l'ancienne, keep() conserve l'ancienne
+    telle quelle (fetch en échec) ; finish() classe les clés jamais vues comme
+    retirées et retourne (catalogue, diff).
+    """
+
+    def __init__(self, existing, policies, compare):
+        self.existing = existing
+        self.policies = policies
+        self.compare = tuple(compare)
+        self.records = {}
+        self.diff = CatalogueDiff()
+
+    def add(self, key, record):
+        old = self.existing.get(key)
+        if old is None:
+            self.diff.added.append(key)
+            merged = record
+        else:
+            merged, changes = merge_fields(old, record, self.policies, self.compare)
+            if changes:
+                self.diff.changed[key] = changes
+            else:
+                self.diff.unchanged.append(key)
+        self.records[key] = merged
+        return merged
+
+    def keep(self, key):
+        old = self.existing.get(key)
+        if old is not None:
+            self.records[key] = old
+            self.diff.kept.append(key)
+        return old
+
+    def finish(self):
+        self.diff.removed = [key for key in self.existing if key not in self.records]
+        return self.records, self.diff
+
+
+def merge_catalogue(existing, fresh, policies, compare):
+    """Fusionne deux catalogues complets ; les clés absentes de `fresh` sont conservées."""
+    merge = CatalogueMerge(existing, policies, compare)
+    for key, record in fresh.items():
+        merge.add(key, record)
+    for key in existing:
+        if key not in fresh:
+            merge.keep(key)
+    return merge.finish()
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Historique des métriques Root-Me (score, rang, validations).
+
+Chaque run de fetch-rootme.py ajoute un point par série dont la valeur a changé
+depuis le dernier point connu : le stockage est append-only (jamais de UPDATE
+ni de DELETE) et compact, une série stable ne coûte rien. La valeur d'une
+série à un instant t est donc celle du dernier point <= t (fonction en
+escalier).
+
+La source de vérité versionnée est un journal texte, history/rootme_metrics.jsonl :
+une ligne JSON par run qui a changé quelque chose ({"ts", "challenges",
+"samples": {série: valeur}}), ajoutée en fin de fichier. Les diffs git restent
+lisibles et se compressent bien. La base SQLite (.store/, non versionnée) n'est
+qu'un index reconstruit depuis le journal : à l'ouverture, seules les lignes
+ajoutées depuis la dernière synchronisation sont rejouées (tout est rejoué si
+le journal a été réécrit, ex. git reset). Une ancienne base
+history/rootme_metrics.sqlite est convertie en journal puis supprimée.
+
+Séries :
+- profile.score, profile.position, profile.challenges_resolus
+- challenge.<id>.validations, challenge.<id>.score
+
+La table samples est indexée par (series, ts) (clé primaire, WITHOUT ROWID) :
+une requête par plage est une lecture d'index. export_hugo() écrit une version
+ré-échantillonnée (un point par pas) pour les graphiques du site.
+
+Usage:
+    python3 scripts/metrics_store.py stats
+    python3 scripts/metrics_store.py query profile.position --since 2025-01-01
+    python3 scripts/metrics_store.py export --step 1d
+    python3 scripts/metrics_store.py rebuild          # reconstruit l'index depuis le journal
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+DEFAULT_LOG = Path(os.environ.get("ROOTME_HISTORY_LOG", str(ROOT_DIR / "history" / "rootme_metrics.jsonl")))
+DEFAULT_DB = Path(os.environ.get("ROOTME_HISTORY_DB", str(ROOT_DIR / ".store" / "rootme_metrics.sqlite")))
+# Ancien emplacement de la base (versionnée en binaire) : convertie en journal au premier run
+LEGACY_DB = ROOT_DIR / "history" / "rootme_metrics.sqlite"
+DEFAULT_EXPORT = ROOT_DIR / "data" / "rootme_history.json"
+
+PROFILE_METRICS = ("score", "position", "challenges_resolus")
+CHALLENGE_METRICS = ("validations", "score")
+STEP_UNITS = {"h": 3600, "d": 86400, "w": 7 * 86400}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    ts INTEGER PRIMARY KEY,
+    challenges INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    series TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (series, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def parse_step(text):
+    """"6h", "1d", "2w" ou un nombre de secondes -> secondes."""
+    text = str(text).strip().lower()
+    if text and text[-1] in STEP_UNITS:
+        return int(float(text[:-1]) * STEP_UNITS[text[-1]])
+    return int(text)
+
+
+def parse_time(text):
+    """Date ISO (2025-01-31 ou 2025-01-31T12:00) ou epoch -> epoch secondes (UTC)."""
+    if text is None:
+        return None
+    if str(text).isdigit():
+        return int(text)
+    dt = datetime.fromisoformat(str(text))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def run_samples(profile, challenges):
+    """{série: valeur entière} pour un run (les valeurs inconnues sont ignorées)."""
+    samples = {}
+    for key in PROFILE_METRICS:
+        value = (profile or {}).get(key)
+        if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+            samples[f"profile.{key}"] = value
+    for challenge in (challenges or {}).values():
+        cid = challenge.get("id")
+        if not cid or not str(cid).isdigit():
+            continue
+        for key in CHALLENGE_METRICS:
+            value = challenge.get(key)
+            if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+                samples[f"challenge.{cid}.{key}"] = value
+    return samples
+
+
+def log_line(ts, challenges, samples):
+    return json.dumps({"ts": int(ts), "challenges": challenges, "samples": samples},
+                      separators=(",", ":"), sort_keys=True) + "\n"
+
+
+class MetricsStore:
+    """Index SQLite de l'historique ; avec `log` (journal JSONL), chaque ajout y est d'abord écrit."""
+
+    def __init__(self, path=DEFAULT_DB, log=DEFAULT_LOG):
+        self.path = Path(path)
+        self.log = Path(log) if log else None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.executescript(SCHEMA)
+        if self.log:
+            if not self.log.exists() and LEGACY_DB.exists() and LEGACY_DB.resolve() != self.path.resolve():
+                migrate_legacy_db(LEGACY_DB, self.log)
+            self.sync()
+
+    def _meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def sync(self):
+        """Rejoue dans l'index les lignes du journal ajoutées depuis la dernière synchronisation."""
+        raw = self.log.read_bytes() if self.log.exists() else b""
+        done = int(self._meta("log_bytes") or 0)
+        if done > len(raw) or hashlib.sha256(raw[:done]).hexdigest() != (self._meta("log_sha256") or
+                                                                         hashlib.sha256(b"").hexdigest()):
+            # Journal réécrit ou remplacé : l'index est reconstruit en entier
+            done = 0
+            with self.db:
+                self.db.execute("DELETE FROM runs")
+                self.db.execute("DELETE FROM samples")
+        end = raw.rfind(b"\n") + 1
+        if end <= done:
+            return 0
+        runs, rows = [], []
+        for line in raw[done:end].decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            runs.append((entry["ts"], entry.get("challenges", 0)))
+            rows.extend((series, entry["ts"], value) for series, value in entry["samples"].items())
+        with self.db:
+            self.db.executemany("INSERT OR IGNORE INTO runs (ts, challenges) VALUES (?, ?)", runs)
+            self.db.executemany("INSERT OR IGNORE INTO samples (series, ts, value) VALUES (?, ?, ?)", rows)
+            self._set_log_position(raw[:end])
+        return len(runs)
+
+    def _set_log_position(self, consumed):
+        self.db.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                            [("log_bytes", str(len(consumed))), ("log_sha256", hashlib.sha256(consumed).hexdigest())])
+
+    def _append_log(self, lines):
+        """Ajoute des lignes au journal, puis avance la position de synchronisation (dans la transaction)."""
+        if not self.log:
+            return
+        self.log.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.log, "a", encoding="utf-8", newline="\n") as f:
+            f.writelines(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self._set_log_position(self.log.read_bytes())
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def latest_values(self):
+        """{série: dernière valeur} en une requête (lecture de l'index par série)."""
+        rows = self.db.execute(
+            "SELECT s.series, s.value FROM samples s "
+            "JOIN (SELECT series, MAX(ts) AS ts FROM samples GROUP BY series) last "
+            "ON s.series = last.series AND s.ts = last.ts"
+        )
+        return dict(rows)
+
+    def append(self, samples, ts=None, challenges=0):
+        """Ajoute les points qui diffèrent de la dernière valeur ; retourne leur nombre.
+
+        Un run plus ancien que le dernier run connu est refusé (ValueError) :
+        l'historique ne se réécrit pas. Un run sans aucun changement n'écrit
+        rien (pas de ligne runs) : la base versionnée dans history/ ne change
+        que si une métrique bouge.
+        """
+        ts = int(ts if ts is not None else time.time())
+        last_run = self.db.execute("SELECT MAX(ts) FROM runs").fetchone()[0]
+        if last_run is not None and ts <= last_run:
+            raise ValueError(f"Run {iso(ts)} antérieur ou égal au dernier run ({iso(last_run)})")
+        latest = self.latest_values()
+        rows = [(series, ts, value) for series, value in samples.items() if latest.get(series) != value]
+        if not rows:
+            return 0
+        with self.db:
+            self.db.execute("INSERT INTO runs (ts, challenges) VALUES (?, ?)", (ts, challenges))
+            self.db.executemany("INSERT INTO samples (series, ts, value) VALUES (?, ?, ?)", rows)
+            self._append_log([log_line(ts, challenges, {series: value for series, _, value in rows})])
+        return len(rows)
+
+    def backfill(self, runs):
+        """Insère des runs historiques [(ts, {série: valeur}, nb challenges)] antérieurs au premier run.
+
+        Seul le passé inconnu est complété (ValueError sinon) : les points déjà
+        stockés ne sont jamais modifiés. Retourne le nombre de points ajoutés.
+        """
+        first_run = self.db.execute("SELECT MIN(ts) FROM runs").fetchone()[0]
+        runs = sorted(runs, key=lambda run: run[0])
+        if runs and first_run is not None and runs[-1][0] >= first_run:
+            raise ValueError(f"Backfill jusqu'à {iso(runs[-1][0])} : doit précéder le premier run ({iso(first_run)})")
+        previous = {}
+        rows = []
+        lines = []
+        for ts, samples, challenges in runs:
+            changed = {}
+            for series, value in samples.items():
+                if previous.get(series) != value:
+                    rows.append((series, int(ts), int(value)))
+                    changed[series] = int(value)
+                    previous[series] = value
+            lines.append(log_line(ts, challenges, changed))
+        with self.db:
+            self.db.executemany("INSERT INTO runs (ts, challenges) VALUES (?, ?)",
+                                [(int(ts), challenges) for ts, _, challenges in runs])
+            self.db.executemany("INSERT INTO samples (series, ts, value) VALUES (?, ?, ?)", rows)
+            # Le journal est un ensemble de runs : l'ordre des lignes n'importe pas au rejeu
+            self._append_log(lines)
+        return len(rows)
+
+    def record_run(self, profile, challenges, ts=None):
+        """Enregistre un run de fetch-rootme (profil + {slug: challenge})."""
+        return self.append(run_samples(profile, challenges), ts=ts, challenges=len(challenges or {}))
+
+    def series(self, prefix=""):
+        rows = self.db.execute(
+            "SELECT DISTINCT series FROM samples WHERE series >= ? AND series < ? ORDER BY series",
+            (prefix, prefix + "\uffff"),
+        )
+        return [row[0] for row in rows]
+
+    def range(self, series, start=None, end=None):
+        """Points [(ts, valeur)] de la série dans [start, end].
+
+        Le dernier point antérieur à start est inclus (ramené à start) pour que
+        la valeur en début de plage soit connue.
+        """
+        points = []
+        if start is not None:
+            before = self.db.execute(
+                "SELECT value FROM samples WHERE series = ? AND ts < ? ORDER BY ts DESC LIMIT 1",
+                (series, start),
+            ).fetchone()
+            if before:
+                points.append((start, before[0]))
+        query = "SELECT ts, value FROM samples WHERE series = ?"
+        params = [series]
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND ts <= ?"
+            params.append(end)
+        points.extend(self.db.execute(query + " ORDER BY ts", params))
+        return points
+
+    def runs(self, start=None, end=None):
+        rows = self.db.execute(
+            "SELECT ts FROM runs WHERE ts >= ? AND ts <= ? ORDER BY ts",
+            (start if start is not None else 0, end if end is not None else 2 ** 62),
+        )
+        return [row[0] for row in rows]
+
+    def downsample(self, series, step, start=None, end=None):
+        """Un point par pas [(ts, valeur)] : la valeur en fin de chaque intervalle."""
+        points = self.range(series, start, end)
+        if not points:
+            return []
+        start = points[0][0] if start is None else start
+        if end is None:
+            end = self.db.execute("SELECT MAX(ts) FROM runs").fetchone()[0] or points[-1][0]
+        first = start - start % step
+        result = []
+        i, value = 0, None
+        bucket = first
+        while bucket <= end:
+            bucket_end = bucket + step - 1
+            while i < len(points) and points[i][0] <= bucket_end:
+                value = points[i][1]
+                i += 1
+            if value is not None:
+                result.append((bucket, value))
+            bucket += step
+        return result
+
+    def stats(self):
+        runs, first, last = self.db.execute("SELECT COUNT(*), MIN(ts), MAX(ts) FROM runs").fetchone()
+        samples, series = self.db.execute("SELECT COUNT(*), COUNT(DISTINCT series) FROM samples").fetchone()
+        return {
+            "runs": runs,
+            "first_run": iso(first) if first else None,
+            "last_run": iso(last) if last else None,
+            "series": series,
+            "samples": samples,
+            "bytes": self.path.stat().st_size if self.path.exists() else 0,
+            "log_bytes": self.log.stat().st_size if self.log and self.log.exists() else 0,
+        }
+
+    def export_hugo(self, path=DEFAULT_EXPORT, step=86400, challenge_slugs=None, since=None,
+                    challenge_step=7 * 86400):
+        """Écrit l'historique ré-échantillonné pour Hugo ; retourne True si le fichier a changé.
+
+        Format : {"step": s, "challenge_step": s, "profile": {métrique: [[date, valeur], ...]},
+        "challenges": {slug: {métrique: [[date, valeur], ...]}}}.
+        Les challenges sont ré-échantillonnés plus grossièrement (challenge_step) :
+        c'est le gros du volume. challenge_slugs ({id: slug}) nomme les challenges ;
+        sans entrée, l'id est utilisé.
+        """
+        def points(series, step):
+            # Les paliers répétés sont omis (sauf le dernier) : le graphique trace en escalier
+            sampled = self.downsample(series, step, start=since)
+            kept = [p for i, p in enumerate(sampled)
+                    if i == 0 or i == len(sampled) - 1 or p[1] != sampled[i - 1][1]]
+            return [[iso(ts)[:10] if step >= 86400 else iso(ts), value] for ts, value in kept]
+
+        data = {"step": step, "challenge_step": challenge_step, "profile": {}, "challenges": {}}
+        for key in PROFILE_METRICS:
+            series = points(f"profile.{key}", step)
+            if series:
+                data["profile"][key] = series
+        slugs = challenge_slugs or {}
+        for name in self.series("challenge."):
+            _, cid, key = name.split(".", 2)
+            series = points(name, challenge_step)
+            if series:
+                data["challenges"].setdefault(slugs.get(cid, cid), {})[key] = series
+
+        path = Path(path)
+        content = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        if path.exists() and path.read_text(encoding="utf-8") == content:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, path)
+        return True
+
+
+def migrate_legacy_db(legacy, log):
+    """Convertit une ancienne base SQLite versionnée en journal JSONL, puis la supprime."""
+    db = sqlite3.connect(str(legacy))
+    try:
+        samples = {}
+        for series, ts, value in db.execute("SELECT series, ts, value FROM samples ORDER BY ts, series"):
+            samples.setdefault(ts, {})[series] = value
+        lines = [log_line(ts, challenges, samples.get(ts, {}))
+                 for ts, challenges in db.execute("SELECT ts, challenges FROM runs ORDER BY ts")]
+    finally:
+        db.close()
+    log.parent.mkdir(parents=True, exist_ok=True)
+    tmp = log.with_suffix(log.suffix + ".tmp")
+    tmp.write_text("".join(lines), encoding="utf-8")
+    os.replace(tmp, log)
+    legacy.unlink()
+    print(f"📦 {legacy.name} converti en {log.name} ({len(lines)} run(s))")
+
+
+def challenge_slugs(data_dir):
+    """{id: slug} depuis la base locale (data_store.py, importée de data/)."""
+    from data_store import DataStore
+    with DataStore(data_dir) as store:
+        data = store.challenges()
+    return {str(c.get("id")): slug for slug, c in data.items() if isinstance(c, dict) and c.get("id")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Historique des métriques Root-Me (SQLite, append-only)")
+    parser.add_argument("--db", default=str(DEFAULT_DB), help="Index SQLite (reconstruit depuis le journal)")
+    parser.add_argument("--log", default=str(DEFAULT_LOG), help="Journal JSONL versionné")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Résumé de la base")
+    sub.add_parser("rebuild", help="Reconstruit l'index SQLite depuis le journal")
+    ls = sub.add_parser("series", help="Liste les séries")
+    ls.add_argument("prefix", nargs="?", default="")
+    query = sub.add_parser("query", help="Points d'une série sur une plage")
+    query.add_argument("series")
+    query.add_argument("--since", help="Début (ISO ou epoch)")
+    query.add_argument("--until", help="Fin (ISO ou epoch)")
+    query.add_argument("--step", help="Ré-échantillonne (6h, 1d, 1w...)")
+    export = sub.add_parser("export", help="Écrit data/rootme_history.json pour Hugo")
+    export.add_argument("--out", default=str(DEFAULT_EXPORT))
+    export.add_argument("--step", default="1d", help="Pas de ré-échantillonnage (défaut: 1d)")
+    export.add_argument("--challenge-step", default="1w", help="Pas pour les challenges (défaut: 1w)")
+    export.add_argument("--since", help="Début (ISO ou epoch)")
+    args = parser.parse_args()
+
+    if args.command not in ("stats", "rebuild") and not Path(args.log).exists() and not LEGACY_DB.exists():
+        print(f"❌ Journal introuvable : {args.log}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.command == "rebuild" and Path(args.db).exists():
+        Path(args.db).unlink()
+    with MetricsStore(args.db, log=args.log) as store:
+        if args.command in ("stats", "rebuild"):
+            s = store.stats()
+            print(f"📈 {s['runs']} run(s) ({s['first_run']} → {s['last_run']}), {s['series']} séries, "
+                  f"{s['samples']} points, journal {s['log_bytes'] / 1024:.1f} KiB, index {s['bytes'] / 1024:.1f} KiB")
+        elif args.command == "series":
+            for name in store.series(args.prefix):
+                print(name)
+        elif args.command == "query":
+            start, end = parse_time(args.since), parse_time(args.until)
+            if args.step:
+                points = store.downsample(args.series, parse_step(args.step), start, end)
+            else:
+                points = store.range(args.series, start, end)
+            for ts, value in points:
+                print(f"{iso(ts)}  {value}")
+        elif args.command == "export":
+            slugs = challenge_slugs(ROOT_DIR / "data")
+            changed = store.export_hugo(args.out, parse_step(args.step), slugs, parse_time(args.since),
+                                        challenge_step=parse_step(args.challenge_step))
+            print(f"{'✅ Export écrit' if changed else '⏭️ Export inchangé'} : {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Génère les variantes optimisées des bannières (static/img/banners/*.png).
+
+Chaque bannière est déclinée en WebP et AVIF à plusieurs largeurs (jamais
+agrandie) dans static/img/banners/optimized/, avec le hash de la source dans
+le nom (<nom>-<largeur>w.<hash>.<ext>) : les URLs changent quand l'image
+change, le cache navigateur peut donc être permanent.
+
+Le manifeste data/banners.json, indexé par le chemin utilisé dans le
+frontmatter (`image: "/img/banners/rootme-banner.png"`), liste les variantes ;
+les partials helper/image et article/components/header en tirent un
+<picture> avec srcset. Une source dont le hash n'a pas changé (et dont les
+variantes existent) n'est pas réencodée ; les sources sont traitées en
+parallèle sur tous les cœurs. Des sources identiques (même hash) partagent
+les variantes de la première. Les variantes orphelines sont supprimées.
+
+--check n'écrit rien et sort en erreur si data/banners.json ou les variantes
+ne correspondent plus aux sources (utilisé par le déploiement).
+
+Usage:
+    python3 scripts/optimize-banners.py
+    python3 scripts/optimize-banners.py --widths 480,800,1200 --jobs 4
+    python3 scripts/optimize-banners.py --force   # réencode tout
+    python3 scripts/optimize-banners.py --check   # manifeste à jour ? (sans Pillow)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+SCRIPT_DIR = Path(__file__).parent
+ROOT_DIR = SCRIPT_DIR.parent
+STATIC_DIR = ROOT_DIR / "static"
+BANNERS_DIR = STATIC_DIR / "img" / "banners"
+OUTPUT_DIR = BANNERS_DIR / "optimized"
+MANIFEST_PATH = ROOT_DIR / "data" / "banners.json"
+
+SOURCE_SUFFIXES = (".png", ".jpg", ".jpeg")
+DEFAULT_WIDTHS = (480, 800, 1200)
+# Ordre de préférence dans <picture> : le navigateur prend le premier supporté
+FORMATS = {
+    "avif": {"quality": 55, "speed": 6},
+    "webp": {"quality": 80, "method": 6},
+}
+FALLBACK_FORMAT = "webp"
+HASH_LENGTH = 10
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def site_path(path):
+    """static/img/banners/x.png -> /img/banners/x.png (chemin du frontmatter)."""
+    return "/" + path.relative_to(STATIC_DIR).as_posix()
+
+
+def target_widths(width, widths):
+    """Largeurs demandées inférieures à la source, plus la largeur d'origine si elle est plus petite que la plus grande."""
+    selected = [w for w in sorted(set(widths)) if w < width]
+    if not selected or width <= max(widths):
+        selected.append(width)
+    return selected
+
+
+def variant_name(source, width, digest, fmt):
+    return f"{source.stem}-{width}w.{digest[:HASH_LENGTH]}.{fmt}"
+
+
+def encode(source, digest, widths, formats):
+    """Encode toutes les variantes d'une source (exécuté dans un processus du pool)."""
+    started = time.perf_counter()
+    with Image.open(source) as image:
+        image.load()
+        width, height = image.size
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        entry = {"sha256": digest, "width": width, "height": height, "variants": {}}
+        for target in target_widths(width, widths):
+            resized = image if target == width else image.resize(
+                (target, round(height * target / width)), Image.Resampling.LANCZOS)
+            for fmt in formats:
+                name = variant_name(source, target, digest, fmt)
+                tmp = OUTPUT_DIR / f".{name}.tmp"
+                resized.save(tmp, format=fmt.upper(), **FORMATS[fmt])
+                os.replace(tmp, OUTPUT_DIR / name)
+                entry["variants"].setdefault(fmt, []).append({
+                    "width": target,
+                    "height": resized.height,
+                    "src": site_path(OUTPUT_DIR / name),
+                    "bytes": (OUTPUT_DIR / name).stat().st_size,
+                })
+    finish_entry(entry)
+    return source, entry, time.perf_counter() - started
+
+
+def finish_entry(entry):
+    """Champs prêts à l'emploi pour les templates : srcset par format et image de repli."""
+    entry["srcset"] = {
+        fmt: ", ".join(f"{v['src']} {v['width']}w" for v in variants)
+        for fmt, variants in entry["variants"].items()
+    }
+    fallback = entry["variants"][FALLBACK_FORMAT][-1]
+    entry["fallback"] = fallback["src"]
+    entry["fallback_width"] = fallback["width"]
+    entry["fallback_height"] = fallback["height"]
+
+
+def is_fresh(entry, digest, widths, formats):
+    if not entry or entry.get("sha256") != digest:
+        return False
+    if set(entry.get("variants", {})) != set(formats):
+        return False
+    expected = target_widths(entry["width"], widths)
+    for variants in entry["variants"].values():
+        if [v["width"] for v in variants] != expected:
+            return False
+        if not all((STATIC_DIR / v["src"].lstrip("/")).exists() for v in variants):
+            return False
+    return True
+
+
+def load_manifest():
+    try:
+        return json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def write_manifest(manifest):
+    """Écrit data/banners.json seulement si son contenu change."""
+    raw = json.dumps(manifest, indent=2, ensure_ascii=False, sort_keys=True)
+    if MANIFEST_PATH.exists() and MANIFEST_PATH.read_text(encoding="utf-8") == raw:
+        return False
+    tmp = MANIFEST_PATH.with_suffix(".json.tmp")
+    tmp.write_text(raw, encoding="utf-8")
+    os.replace(tmp, MANIFEST_PATH)
+    return True
+
+
+def remove_orphans(manifest):
+    referenced = {
+        v["src"].rsplit("/", 1)[-1]
+        for entry in manifest.values()
+        for variants in entry["variants"].values()
+        for v in variants
+    }
+    removed = []
+    for path in OUTPUT_DIR.iterdir():
+        if path.is_file() and path.name not in referenced:
+            path.unlink()
+            removed.append(path.name)
+    return removed
+
+
+def banner_sources():
+    """[(chemin du frontmatter, source, sha256)] des bannières, triées par nom."""
+    return [(site_path(source), source, file_sha256(source)) for source in sorted(BANNERS_DIR.iterdir())
+            if source.is_file() and source.suffix.lower() in SOURCE_SUFFIXES]
+
+
+def plan(previous, widths, formats, force=False):
+    """(manifeste des entrées à jour, sources à encoder, [(doublon, original)])."""
+    manifest, pending, duplicates = {}, [], []
+    originals = {}
+    for key, source, digest in banner_sources():
+        if digest in originals:
+            duplicates.append((key, originals[digest]))
+            continue
+        originals[digest] = key
+        if not force and is_fresh(previous.get(key), digest, widths, formats):
+            manifest[key] = previous[key]
+        else:
+            pending.append((source, digest))
+    return manifest, pending, duplicates
+
+
+def check(widths):
+    """0 si data/banners.json et les variantes correspondent aux sources, 1 sinon (rien n'est écrit)."""
+    previous = load_manifest()
+    formats = [fmt for fmt in FORMATS if Image is None or features.check(fmt)]
+    manifest, pending, duplicates = plan(previous, widths, formats)
+    for key, original in duplicates:
+        if original in manifest:
+            manifest[key] = manifest[original]
+    stale = sorted({site_path(source) for source, _ in pending}
+                   | {key for key in set(previous) | set(manifest) if previous.get(key) != manifest.get(key)})
+    if stale:
+        print(f"⚠️ {MANIFEST_PATH.name} obsolète pour {len(stale)} bannière(s) : {', '.join(stale)}")
+        print("   Lancer python3 scripts/optimize-banners.py puis commiter data/ et static/img/banners/optimized/")
+        return 1
+    print(f"✅ {MANIFEST_PATH.name} à jour ({len(manifest)} bannière(s))")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Variantes WebP/AVIF des bannières et manifeste data/banners.json")
+    parser.add_argument("--widths", default=",".join(map(str, DEFAULT_WIDTHS)), help="Largeurs générées (px)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Processus d'encodage en parallèle")
+    parser.add_argument("--force", action="store_true", help="Réencode même les sources inchangées")
+    parser.add_argument("--check", action="store_true",
+                        help="N'écrit rien ; code de sortie 1 si le manifeste ou les variantes sont à régénérer")
+    args = parser.parse_args()
+    widths = [int(w) for w in args.widths.split(",") if w.strip()]
+    if args.check:
+        sys.exit(check(widths))
+
+    if Image is None:
+        print("❌ Pillow est requis : pip install pillow", file=sys.stderr)
+        sys.exit(1)
+    formats = [fmt for fmt in FORMATS if features.check(fmt)]
+    if FALLBACK_FORMAT not in formats:
+        print(f"❌ Pillow est compilé sans support {FALLBACK_FORMAT.upper()}", file=sys.stderr)
+        sys.exit(1)
+    for fmt in FORMATS:
+        if fmt not in formats:
+            print(f"⚠️ Pillow est compilé sans support {fmt.upper()}, format ignoré")
+
+    started = time.perf_counter()
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    previous = load_manifest()
+    manifest, pending, duplicates = plan(previous, widths, formats, force=args.force)
+
+    if pending:
+        print(f"🖼️  {len(pending)} bannière(s) à encoder ({', '.join(formats)} ; {args.jobs} processus)")
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            futures = [pool.submit(encode, source, digest, widths, formats) for source, digest in pending]
+            for future in futures:
+                source, entry, elapsed = future.result()
+                manifest[site_path(source)] = entry
+                source_bytes = source.stat().st_size
+                fallback = entry["variants"][FALLBACK_FORMAT][-1]["bytes"]
+                print(f"   ✅ {source.name}: {source_bytes / 1024:.0f} Ko -> {fallback / 1024:.0f} Ko "
+                      f"({FALLBACK_FORMAT} {entry['fallback_width']}px) en {elapsed:.1f}s")
+
+    for key, original in duplicates:
+        manifest[key] = manifest[original]
+        print(f"   🔁 {key.rsplit('/', 1)[-1]} identique à {original.rsplit('/', 1)[-1]} : variantes partagées")
+    removed = remove_orphans(manifest)
+    changed = write_manifest(manifest)
+    print(f"✅ {len(manifest)} bannière(s), {len(pending)} encodée(s), {len(manifest) - len(pending)} inchangée(s)"
+          f"{f', {len(removed)} variante(s) orpheline(s) supprimée(s)' if removed else ''}"
+          f"{'' if changed else ' (data/banners.json inchangé)'} en {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Profilage par phase pour fetch-rootme.py et add-challenge.py (option --profile).
+
+Chaque phase nommée (profil, découverte, fetch challenge, parse, merge, save...)
+a son propre cProfile ; une phase imbriquée suspend celle qui l'englobe, si bien
+que chaque profil ne contient que le temps propre à sa phase. tracemalloc suit
+les allocations sur tout le run.
+
+Fichiers écrits dans le dossier de sortie :
+- <phase>.prof / <phase>.txt : profil pstats brut et top des fonctions
+- allocations.txt            : principaux sites d'allocation en fin de run
+- summary.json               : appels, temps et mémoire nette par phase
+
+TraceRecorder (option --trace) exporte les spans d'un run au format Chrome
+trace-event, lisible dans chrome://tracing ou https://ui.perfetto.dev.
+"""
+
+import cProfile
+import contextlib
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 25
+
+
+class PhaseProfiler:
+    def __init__(self, out_dir):
+        self.out_dir = Path(out_dir)
+        self.profiles = {}
+        self.phases = {}
+        self.stack = []
+
+    def start(self):
+        tracemalloc.start(25)
+        self.start_time = time.perf_counter()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        if self.stack:
+            self.profiles[self.stack[-1]].disable()
+        profile = self.profiles.setdefault(name, cProfile.Profile())
+        stats = self.phases.setdefault(name, {"calls": 0, "wall_s": 0.0, "alloc_kib": 0.0})
+        self.stack.append(name)
+        mem_before = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            stats["calls"] += 1
+            stats["wall_s"] += time.perf_counter() - start
+            if tracemalloc.is_tracing():
+                stats["alloc_kib"] += (tracemalloc.get_traced_memory()[0] - mem_before) / 1024
+            self.stack.pop()
+            if self.stack:
+                self.profiles[self.stack[-1]].enable()
+
+    def finish(self):
+        """Écrit les profils et retourne le résumé (à appeler une seule fois)."""
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        total = time.perf_counter() - self.start_time
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        _, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        tracemalloc.stop()
+
+        hot = []
+        for name, profile in self.profiles.items():
+            stats = pstats.Stats(profile)
+            if not stats.stats:
+                continue
+            safe = name.replace("/", "_")
+            stats.dump_stats(self.out_dir / f"{safe}.prof")
+            buffer = io.StringIO()
+            pstats.Stats(profile, stream=buffer).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            (self.out_dir / f"{safe}.txt").write_text(buffer.getvalue(), encoding="utf-8")
+            self.phases[name]["self_s"] = sum(row[2] for row in stats.stats.values())
+            for (filename, line, func), row in stats.stats.items():
+                hot.append({"phase": name, "function": f"{Path(filename).name}:{line}({func})",
+                            "calls": row[1], "self_s": row[2], "cumulative_s": row[3]})
+        hot.sort(key=lambda item: item["self_s"], reverse=True)
+
+        allocations = []
+        if snapshot is not None:
+            snapshot = snapshot.filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ])
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                frame = stat.traceback[0]
+                allocations.append({"site": f"{frame.filename}:{frame.lineno}",
+                                    "kib": stat.size / 1024, "count": stat.count})
+            with open(self.out_dir / "allocations.txt", "w", encoding="utf-8") as f:
+                for item in allocations:
+                    f.write(f"{item['kib']:>10.1f} KiB {item['count']:>8} blocs  {item['site']}\n")
+
+        summary = {
+            "total_s": total,
+            "peak_kib": peak / 1024,
+            "phases": self.phases,
+            "hot_functions": hot[:TOP_FUNCTIONS],
+            "allocations": allocations,
+        }
+        with open(self.out_dir / "summary.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        return summary
+
+
+def print_report(summary, out_dir, top=8):
+    print("\n" + "=" * 50)
+    print(f"🔬 PROFIL ({summary['total_s']:.2f}s, pic mémoire {summary['peak_kib'] / 1024:.1f} MiB)")
+    print("=" * 50)
+    print(f"{'phase':<18} {'appels':>7} {'total s':>9} {'propre s':>9} {'mém KiB':>9}")
+    for name, stats in sorted(summary["phases"].items(), key=lambda item: item[1]["wall_s"], reverse=True):
+        print(f"{name:<18} {stats['calls']:>7} {stats['wall_s']:>9.3f} {stats.get('self_s', 0.0):>9.3f} "
+              f"{stats['alloc_kib']:>9.1f}")
+    if summary["hot_functions"]:
+        print("\n🔥 Fonctions les plus coûteuses (temps propre) :")
+        for item in summary["hot_functions"][:top]:
+            print(f"   {item['self_s']:>7.3f}s  {item['calls']:>6}x  [{item['phase']}] {item['function']}")
+    if summary["allocations"]:
+        print("\n🧠 Principaux sites d'allocation :")
+        for item in summary["allocations"][:top]:
+            print(f"   {item['kib']:>9.1f} KiB  {item['site']}")
+    print(f"\n💾 Profils écrits dans {out_dir}")
+
+
+def run_profiled(func, profiler, phase="main"):
+    """Exécute func() dans la phase `phase` puis écrit et affiche le rapport."""
+    profiler.start()
+    try:
+        with profiler.phase(phase):
+            return func()
+    finally:
+        print_report(profiler.finish(), profiler.out_dir)
+
+
+class TraceRecorder:
+    """Collecte des spans (événements "X") et les écrit en JSON trace-event."""
+
+    def __init__(self, path, process_name="run"):
+        self.path = Path(path)
+        self.process_name = process_name
+        self.pid = os.getpid()
+        self.origin = time.perf_counter()
+        self.events = []
+        self.threads = {}
+        self.lock = threading.Lock()
+
+    def _now_us(self):
+        return (time.perf_counter() - self.origin) * 1_000_000
+
+    def _tid(self):
+        thread = threading.current_thread()
+        self.threads.setdefault(thread.ident, thread.name)
+        return thread.ident
+
+    @contextlib.contextmanager
+    def span(self, name, cat="run", args=None):
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            event = {"name": name, "cat": cat, "ph": "X", "ts": start, "dur": self._now_us() - start,
+                     "pid": self.pid, "tid": self._tid()}
+            if args:
+                event["args"] = {k: v if isinstance(v, (int, float, bool)) or v is None else str(v)
+                                 for k, v in args.items()}
+            with self.lock:
+                self.events.append(event)
+
+    def save(self):
+        """Écrit le fichier (écriture atomique) et retourne son chemin."""
+        meta = [{"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0,
+                 "args": {"name": self.process_name}}]
+        for tid, name in self.threads.items():
+            meta.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}})
+        with self.lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        return self.path
@@ -0,0 +1,220 @@
+"""
+Enregistrements compacts (__slots__) pour les challenges Root-Me et les
+scénarios SadServers.
+
+Les valeurs sont normalisées une seule fois, à la construction : entiers pour
+score/validations, libellé pour la difficulté, None pour les valeurs inconnues
+("?", "Inconnu", "0%", dates invalides...). Les fusions et exports n'ont plus à
+re-vérifier les types. to_dict() produit exactement le format de
+data/rootme_challenges.json et data/sadservers_scenarios.json.
+"""
+
+import re
+import sys
+
+from merge_engine import CatalogueMerge, compile_policies, merge_fields
+
+DIFFICULTY_LABELS = {
+    1: "Très facile",
+    2: "Facile",
+    3: "Moyen",
+    4: "Difficile",
+    5: "Très difficile",
+}
+PLACEHOLDERS = {"", "?", "inconnu", "titre inconnu", "unknown"}
+INVALID_DATES = {"", "-1", "0", "inconnu", "unknown"}
+
+# Valeurs écrites dans le JSON quand un champ est inconnu (format historique)
+CHALLENGE_DEFAULTS = {
+    "titre": "Titre Inconnu",
+    "rubrique": "Autre",
+    "auteur": "Inconnu",
+    "date": "",
+    "score": 0,
+    "difficulte": "Inconnu",
+    "validations": 0,
+    "note": "0%",
+}
+
+# Politiques de fusion (merge_engine) : les compteurs ne sont repris que s'ils sont > 0
+CHALLENGE_MERGE_POLICIES = {
+    "id": "known",
+    "titre": "known",
+    "rubrique": "known",
+    "auteur": "known",
+    "date": "known",
+    "score": "positive",
+    "difficulte": "known",
+    "validations": "positive",
+    "note": "known",
+    "url": "known",
+    "extra": "union",
+}
+
+
+def _text(value):
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        value = str(value)
+    text = " ".join(value.split())
+    if text.lower() in PLACEHOLDERS:
+        return None
+    return value if text == value else text
+
+
+def _label(value):
+    """Texte court très répété (rubrique, auteur, difficulté) : une seule copie en mémoire."""
+    text = _text(value)
+    return sys.intern(text) if text is not None else None
+
+
+def _int(value):
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    digits = re.sub(r"[^\d]", "", str(value))
+    return int(digits) if digits else None
+
+
+def _first_int(value):
+    """Premier nombre d'un texte ("15-20 min" -> 15), comme la lecture d'origine de time_to_solve."""
+    match = re.search(r"\d+", str(value)) if value is not None else None
+    return int(match.group()) if match else None
+
+
+def _difficulty(value):
+    if isinstance(value, (int, float)) and int(value) in DIFFICULTY_LABELS:
+        return DIFFICULTY_LABELS[int(value)]
+    text = _label(value)
+    if text and text.isdigit() and int(text) in DIFFICULTY_LABELS:
+        return DIFFICULTY_LABELS[int(text)]
+    return text
+
+
+def _note(value):
+    text = _text(value)
+    return None if text in (None, "0%") else text
+
+
+def _date(value):
+    text = _text(value)
+    return None if text is None or text.lower() in INVALID_DATES else text
+
+
+class ChallengeRecord:
+    __slots__ = ("id", "titre", "rubrique", "auteur", "date", "score", "difficulte",
+                 "validations", "note", "url", "extra")
+
+    FIELDS = ("id", "titre", "rubrique", "auteur", "date", "score", "difficulte", "validations", "note", "url")
+
+    def __init__(self, id, titre=None, rubrique=None, auteur=None, date=None, score=None,
+                 difficulte=None, validations=None, note=None, url=None, extra=None):
+        if isinstance(rubrique, dict):
+            rubrique = rubrique.get("titre")
+        self.id = str(id) if id is not None else None
+        self.titre = _text(titre)
+        self.rubrique = _label(rubrique)
+        self.auteur = _label(auteur)
+        self.date = _date(date)
+        self.score = _int(score)
+        self.difficulte = _difficulty(difficulte)
+        self.validations = _int(validations) if not isinstance(validations, (list, dict)) else None
+        self.note = _note(note)
+        self.url = _text(url)
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data):
+        extra = None
+        if not _CHALLENGE_KEYS.issuperset(data):
+            extra = {k: v for k, v in data.items() if k not in _CHALLENGE_KEYS}
+        return cls(
+            data.get("id"), data.get("titre"), data.get("rubrique"), data.get("auteur"), data.get("date"),
+            data.get("score"), data.get("difficulte"), data.get("validations"), data.get("note"),
+            data.get("url"), extra,
+        )
+
+    def to_dict(self):
+        data = {
+            "id": self.id,
+            "titre": self.titre or CHALLENGE_DEFAULTS["titre"],
+            "rubrique": self.rubrique or CHALLENGE_DEFAULTS["rubrique"],
+            "auteur": self.auteur or CHALLENGE_DEFAULTS["auteur"],
+            "date": self.date or CHALLENGE_DEFAULTS["date"],
+            "score": self.score if self.score is not None else CHALLENGE_DEFAULTS["score"],
+            "difficulte": self.difficulte or CHALLENGE_DEFAULTS["difficulte"],
+            "validations": self.validations if self.validations is not None else CHALLENGE_DEFAULTS["validations"],
+            "note": self.note or CHALLENGE_DEFAULTS["note"],
+        }
+        if self.url:
+            data["url"] = self.url
+        if self.extra:
+            for key, value in self.extra.items():
+                data.setdefault(key, value)
+        return data
+
+    def merged(self, newer):
+        """Nouvel enregistrement fusionné selon CHALLENGE_MERGE_POLICIES (`newer` l'emporte)."""
+        return merge_fields(self, newer, _CHALLENGE_POLICIES)[0]
+
+    def __eq__(self, other):
+        if not isinstance(other, ChallengeRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"ChallengeRecord(id={self.id!r}, titre={self.titre!r}, score={self.score!r})"
+
+
+# "display" est dérivé (display.py) et recalculé à l'export : jamais conservé dans extra
+_CHALLENGE_KEYS = frozenset(ChallengeRecord.FIELDS + ("display",))
+_CHALLENGE_POLICIES = compile_policies(CHALLENGE_MERGE_POLICIES)
+
+
+class ScenarioRecord:
+    __slots__ = ("url", "titre", "niveau", "type", "tags", "access", "description",
+                 "root_access", "test", "time_to_solve", "minutes")
+
+    FIELDS = ("url", "titre", "niveau", "type", "tags", "access", "description",
+              "root_access", "test", "time_to_solve")
+
+    def __init__(self, url, titre=None, niveau=None, type=None, tags=None, access=None, description=None,
+                 root_access=None, test=None, time_to_solve=None):
+        self.url = url
+        self.titre = _text(titre)
+        self.niveau = _label(niveau)
+        self.type = _label(type)
+        self.tags = list(dict.fromkeys(t for t in (tags or []) if t)) or None
+        self.access = _text(access)
+        self.description = _text(description)
+        if isinstance(root_access, str):
+            root_access = root_access.strip().lower() == "true"
+        self.root_access = root_access
+        self.test = _text(test)
+        self.time_to_solve = _text(time_to_solve)
+        self.minutes = _first_int(self.time_to_solve)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{k: data.get(k) for k in cls.FIELDS})
+
+    def to_dict(self):
+        """Format de sadservers_scenarios.json : les champs inconnus sont omis."""
+        return {name: getattr(self, name) for name in self.FIELDS if getattr(self, name) is not None}
+
+    def __repr__(self):
+        return f"ScenarioRecord(url={self.url!r}, titre={self.titre!r})"
+
+
+def challenge_catalogue_merge(existing):
+    """CatalogueMerge des challenges : diff sur les champs publiés (FIELDS)."""
+    return CatalogueMerge(existing, _CHALLENGE_POLICIES, ChallengeRecord.FIELDS)
+
+
+def load_challenge_records(data):
+    """{slug: dict} (JSON) -> {slug: ChallengeRecord}."""
+    return {slug: ChallengeRecord.from_dict(item) for slug, item in data.items() if isinstance(item, dict)}
@@ -0,0 +1,106 @@
+"""
+Mémoïsation des requêtes HTTP le temps d'un run, avec dédoublonnage en vol.
+
+Un même run demande plusieurs fois les mêmes ressources : la page de profil
+(candidats d'URL qui se recoupent, second scrape_profile_html quand l'API
+échoue, recherche du rang), le bloc score AJAX... La clé est la requête
+normalisée (schéma et hôte en minuscules, port par défaut retiré, paramètres
+triés, fragment ignoré) plus ses en-têtes (noms en minuscules, triés) :
+- une requête déjà servie est rendue depuis la mémoire, sans réseau ;
+- des requêtes identiques simultanées n'en font qu'une (single-flight) : la
+  première part sur le réseau, les suivantes attendent son résultat.
+
+Une exception n'est pas mémorisée (un appel suivant retente) ; `cache_if`
+permet au même titre d'écarter un résultat (ex. None d'une requête échouée).
+
+    memo = RequestMemo()                     # un par run
+    html = memo.get(request_key(url, headers), lambda: fetch(url, headers))
+"""
+
+import threading
+from concurrent.futures import Future
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url):
+    """Forme canonique d'une URL (les variantes équivalentes donnent la même chaîne)."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def request_key(url, headers=None, method="GET"):
+    """Clé de mémoïsation : méthode, URL normalisée et en-têtes normalisés."""
+    normalized = tuple(sorted((name.lower(), str(value).strip()) for name, value in (headers or {}).items()))
+    return method.upper(), normalize_url(url), normalized
+
+
+def unique_urls(urls):
+    """Retire les URLs équivalentes d'une liste de candidats (ordre conservé)."""
+    seen = set()
+    unique = []
+    for url in urls:
+        key = normalize_url(url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(url)
+    return unique
+
+
+class RequestMemo:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.results = {}
+        self.in_flight = {}
+        self.misses = 0
+        self.hits = 0
+        self.joined = 0
+
+    def get(self, key, fetch, cache_if=None):
+        """Résultat de `fetch()` pour `key`, calculé au plus une fois à la fois (et mémorisé si `cache_if` l'accepte)."""
+        with self.lock:
+            if key in self.results:
+                self.hits += 1
+                return self.results[key]
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = Future()
+                self.misses += 1
+            else:
+                self.joined += 1
+        if not leader:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self.lock:
+                del self.in_flight[key]
+            future.set_exception(e)
+            raise
+        with self.lock:
+            del self.in_flight[key]
+            if cache_if is None or cache_if(value):
+                self.results[key] = value
+        future.set_result(value)
+        return value
+
+    def peek(self, key, default=None):
+        """Résultat déjà mémorisé pour `key` (sans réseau ni attente)."""
+        with self.lock:
+            return self.results.get(key, default)
+
+    def clear(self):
+        with self.lock:
+            self.results.clear()
+
+    def summary(self):
+        with self.lock:
+            return {"fetched": self.misses, "hits": self.hits, "joined": self.joined, "cached": len(self.results)}
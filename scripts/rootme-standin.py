@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Serveur local qui imite Root-Me (pages challenge, profil, inc=score, API JSON)
+pour tester fetch-rootme.py sans toucher root-me.org.
+
+Les pages sont servies depuis les captures de debug_dump (.debug/rootme :
+stockage captures/ et anciens fichiers page_*.html) et l'API renvoie un JSON construit à partir du slug. Latence, jitter, erreurs
+429/503 et en-tête Retry-After sont configurables.
+
+Usage:
+    python3 scripts/rootme-standin.py --port 8765 --latency 50 --jitter 20 --error-rate 0.05
+    ROOTME_BASE_URL=http://127.0.0.1:8765 ROOTME_API_URL=http://127.0.0.1:8765/api \\
+        python3 scripts/fetch-rootme.py
+
+Routes de contrôle : GET /__stats (compteurs JSON), GET /__reset.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_CORPUS = SCRIPT_DIR.parent / ".debug" / "rootme"
+
+URL_HEADER = re.compile(r"^<!-- url: (\S+) status: (\S+) -->\n?")
+
+PROFILE_TEMPLATE = """<!DOCTYPE html>
+<html lang="fr"><head><title>{name} [Root Me : plateforme d'apprentissage]</title>
+<meta property="og:title" content="{name}" /></head>
+<body><h1>{name}</h1>
+<a href="user?inc=score&amp;lang=fr">Score</a> <a href="user?inc=valid">Validations</a>
+<div><img src="squelettes/img/classement.svg" />&nbsp;{position}</div>
+<div><span class="gras">Points</span><h3>{score}</h3></div>
+<div><span class="gras">Challenges</span><h3>{solved}</h3></div>
+</body></html>
+"""
+
+SCORE_TEMPLATE = """<!DOCTYPE html>
+<html lang="fr"><head><title>{name} : Score</title></head>
+<body><h1><span class="txt_6forum">{name}</span></h1>
+<div><h3><img src="squelettes/img/classement.svg" />&nbsp;{position}</h3></div>
+<div><h3><img src="squelettes/img/valid.svg" />&nbsp;{score}</h3></div>
+<div><h3><img src="squelettes/img/rubon5.svg" />&nbsp;{solved}</h3></div>
+</body></html>
+"""
+
+
+def challenge_slug(url):
+    if "/Challenges/" not in url:
+        return None
+    return url.rstrip("/").split("/")[-1].lower()
+
+
+def load_captures(corpus_dir):
+    """Indexe les captures de pages challenge par slug (minuscule)."""
+    captures = {}
+    for path in sorted(Path(corpus_dir).glob("page_*.html")):
+        raw = path.read_text(encoding="utf-8", errors="replace")
+        m = URL_HEADER.match(raw)
+        slug = challenge_slug(m.group(1)) if m else None
+        if slug:
+            captures[slug] = raw[m.end():]
+    if (Path(corpus_dir) / "captures" / "index.json").exists():
+        from capture_store import CaptureStore
+        store = CaptureStore(Path(corpus_dir) / "captures")
+        for url, entry in store.latest_by_url(kind="page").items():
+            slug = challenge_slug(url)
+            if slug and entry["status"] == 200:
+                captures[slug] = store.read(entry)
+    return captures
+
+
+class StandinState:
+    """Configuration et compteurs partagés entre les threads du serveur."""
+
+    def __init__(self, corpus_dir=DEFAULT_CORPUS, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_codes=(429, 503), retry_after=1, profile=None):
+        self.captures = load_captures(corpus_dir)
+        self.default_page = next(iter(self.captures.values()), "<html><title>Challenge</title></html>")
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_codes = tuple(error_codes)
+        self.retry_after = retry_after
+        self.profile = profile or {"name": "Alexandre Froissart", "score": 30, "position": 238324, "solved": 3}
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = {"requests": 0, "injected": 0, "by_kind": {}, "by_status": {}}
+
+    def count(self, kind, status, injected=False):
+        with self.lock:
+            self.counters["requests"] += 1
+            self.counters["by_kind"][kind] = self.counters["by_kind"].get(kind, 0) + 1
+            self.counters["by_status"][str(status)] = self.counters["by_status"].get(str(status), 0) + 1
+            if injected:
+                self.counters["injected"] += 1
+
+    def stats(self):
+        with self.lock:
+            return json.loads(json.dumps(self.counters))
+
+
+def api_challenge(challenge_id, slug=None):
+    slug = slug or f"challenge-{challenge_id}"
+    return [{
+        "id_challenge": str(challenge_id),
+        "titre": slug.replace("-", " ").title(),
+        "rubrique": "Réseau",
+        "url_challenge": f"fr/Challenges/Reseau/{slug}",
+        "score": "10",
+        "difficulte": "2",
+        "auteurs": {"0": {"nom": "standin"}},
+        "date_publication": "2020-01-01 00:00:00",
+        "validations": [],
+    }]
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    state = None  # StandinState, injecté par make_server
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _classify(self, path, query):
+        if path.startswith("/api/"):
+            return "api"
+        if query.get("inc") == ["score"]:
+            return "score"
+        if "/Challenges/" in path:
+            return "challenge"
+        return "profile"
+
+    def do_GET(self):
+        state = self.state
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+
+        if parts.path == "/__stats":
+            return self._send(200, json.dumps(state.stats()), "application/json")
+        if parts.path == "/__reset":
+            state.reset()
+            return self._send(200, "{}", "application/json")
+
+        kind = self._classify(parts.path, query)
+        delay = state.latency + random.uniform(-state.jitter, state.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        if state.error_rate and random.random() < state.error_rate:
+            code = random.choice(state.error_codes)
+            state.count(kind, code, injected=True)
+            return self._send(code, f"Erreur simulée {code}", headers={"Retry-After": str(state.retry_after)})
+
+        if kind == "api":
+            return self._serve_api(parts.path, query)
+        p = state.profile
+        if kind == "score":
+            state.count(kind, 200)
+            return self._send(200, SCORE_TEMPLATE.format(**p))
+        if kind == "challenge":
+            slug = parts.path.rstrip("/").split("/")[-1].lower()
+            state.count(kind, 200)
+            return self._send(200, state.captures.get(slug, state.default_page))
+        state.count(kind, 200)
+        return self._send(200, PROFILE_TEMPLATE.format(**p))
+
+    def _serve_api(self, path, query):
+        state = self.state
+        m = re.match(r"^/api/challenges/(\w+)$", path)
+        if m:
+            state.count("api", 200)
+            return self._send(200, json.dumps(api_challenge(m.group(1))), "application/json")
+        if path == "/api/challenges" and query.get("titre"):
+            slug = re.sub(r"[^a-z0-9]+", "-", query["titre"][0].lower()).strip("-")
+            state.count("api", 200)
+            return self._send(200, json.dumps(api_challenge(abs(hash(slug)) % 100000, slug)), "application/json")
+        m = re.match(r"^/api/auteurs/(\w+)$", path)
+        if m:
+            p = state.profile
+            body = [{"nom": p["name"], "score": str(p["score"]), "position": str(p["position"]),
+                     "validations": [{}] * p["solved"]}]
+            state.count("api", 200)
+            return self._send(200, json.dumps(body), "application/json")
+        state.count("api", 404)
+        return self._send(404, "[]", "application/json")
+
+
+def make_server(state, host="127.0.0.1", port=0):
+    """Crée le serveur (port 0 = port libre) ; à lancer avec serve_forever()."""
+    handler = type("BoundStandinHandler", (StandinHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(state, host="127.0.0.1", port=0):
+    """Démarre le serveur en arrière-plan et retourne (server, base_url)."""
+    server = make_server(state, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur local imitant Root-Me pour les tests de charge")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="Captures de pages challenge")
+    parser.add_argument("--latency", type=float, default=0.0, help="Latence ajoutée (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Jitter +/- (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probabilité d'injecter une erreur")
+    parser.add_argument("--error-codes", default="429,503", help="Codes injectés (séparés par des virgules)")
+    parser.add_argument("--retry-after", type=int, default=1, help="Valeur de l'en-tête Retry-After (s)")
+    args = parser.parse_args()
+
+    state = StandinState(
+        corpus_dir=args.corpus,
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        error_rate=args.error_rate,
+        error_codes=[int(c) for c in args.error_codes.split(",") if c.strip()],
+        retry_after=args.retry_after,
+    )
+    server = make_server(state, args.host, args.port)
+    print(f"🧪 Stand-in Root-Me sur http://{args.host}:{args.port} ({len(state.captures)} captures)")
+    print(f"   ROOTME_BASE_URL=http://{args.host}:{args.port} ROOTME_API_URL=http://{args.host}:{args.port}/api")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Arrêt du serveur")
+
+
+if __name__ == "__main__":
+    main()
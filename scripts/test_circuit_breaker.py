@@ -0,0 +1,116 @@
+"""
+Tests du disjoncteur (circuit_breaker.py) avec une horloge injectée.
+
+    python3 -m pytest scripts/test_circuit_breaker.py
+    cd scripts && python3 -m unittest test_circuit_breaker
+"""
+
+import unittest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker("example.org", failure_threshold=2, cooldown=10, max_cooldown=40,
+                                      clock=self.clock)
+
+    def trip(self):
+        for _ in range(self.breaker.failure_threshold):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure("timeout")
+
+    def test_closed_open_half_open_closed(self):
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_status(503)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.breaker.record_status(503)
+        self.assertEqual(self.breaker.state, OPEN)
+
+        # Pendant le refroidissement : refus sans réseau, comptés
+        self.assertFalse(self.breaker.allow())
+        self.assertTrue(self.breaker.is_open())
+        self.assertAlmostEqual(self.breaker.retry_in(), 10)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.check()
+        self.assertEqual(self.breaker.rejected, 2)
+
+        # Fin du refroidissement : une seule sonde
+        self.clock.advance(10)
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.record_status(200)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual([(t["from"], t["to"]) for t in self.breaker.transitions],
+                         [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)])
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure("timeout")
+        self.breaker.record_status(404)
+        self.breaker.record_failure("timeout")
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_failed_probe_doubles_cooldown(self):
+        self.trip()
+        for expected in (20, 40, 40):
+            self.clock.advance(self.breaker.cooldown)
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure("timeout")
+            self.assertEqual(self.breaker.state, OPEN)
+            self.assertEqual(self.breaker.cooldown, expected)
+        self.clock.advance(40)
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.cooldown, 10)
+
+    def test_retry_after_extends_cooldown(self):
+        self.breaker.record_status(429, retry_after=30)
+        self.breaker.record_status(429, retry_after=30)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.clock.advance(29)
+        self.assertFalse(self.breaker.allow())
+        self.clock.advance(1)
+        self.assertTrue(self.breaker.allow())
+
+    def test_trip_status_opens_immediately(self):
+        breaker = CircuitBreaker("api.example.org", trip_statuses=(401,), clock=self.clock)
+        breaker.record_status(401)
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_release_frees_the_probe(self):
+        self.trip()
+        self.clock.advance(10)
+        self.assertTrue(self.breaker.allow())
+        self.breaker.release()
+        self.assertTrue(self.breaker.allow())
+
+
+class BreakerRegistryTest(unittest.TestCase):
+    def test_one_breaker_per_host(self):
+        clock = FakeClock()
+        registry = BreakerRegistry(hosts={"a.org": {"failure_threshold": 1}}, clock=clock)
+        self.assertIs(registry.for_url("https://A.org/x"), registry.for_url("https://a.org/y?z=1"))
+        registry.for_url("https://a.org/").record_failure("timeout")
+        self.assertFalse(registry.for_url("https://a.org/").allow())
+        self.assertTrue(registry.for_url("https://b.org/").allow())
+        self.assertEqual(registry.rejected(), 1)
+        self.assertEqual(list(registry.summary()), ["a.org"])
+
+
+if __name__ == "__main__":
+    unittest.main()
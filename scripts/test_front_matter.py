@@ -0,0 +1,227 @@
+"""
+Tests du frontmatter (front_matter.py) : aller-retour octet pour octet, typage des valeurs écrites, Batch.
+
+    python3 -m pytest scripts/test_front_matter.py
+    cd scripts && python3 -m unittest test_front_matter
+"""
+
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+import front_matter
+
+PAGE = (
+    "---\n"
+    'title: "Challenge : FTP"\n'
+    "date: 2024-01-01\n"
+    "rootme_id: 42  # identifiant Root-Me\n"
+    "# commentaire seul\n"
+    "tags:\n"
+    "  - FTP\n"
+    "  - \"PCAP\"\n"
+    "params:\n"
+    "  nested: 'oui'\n"
+    "draft: false\n"
+    "---\n"
+    "\n"
+    "Corps de la page.\n"
+)
+
+
+class RoundTripTest(unittest.TestCase):
+    def assertRoundTrip(self, text):
+        fm, body = front_matter.split(text)
+        self.assertEqual(fm.render() + body, text)
+        self.assertEqual(front_matter.replace_text(text, fm), text)
+
+    def test_lf_page_with_comments_and_block_lists(self):
+        self.assertRoundTrip(PAGE)
+        fm, _ = front_matter.split(PAGE)
+        self.assertEqual(fm.get("title"), "Challenge : FTP")
+        self.assertEqual(fm.get("date"), date(2024, 1, 1))
+        self.assertEqual(fm.get("rootme_id"), 42)
+        self.assertEqual(fm.get("tags"), ["FTP", "PCAP"])
+        self.assertIs(fm.get("draft"), False)
+
+    def test_crlf_page(self):
+        self.assertRoundTrip(PAGE.replace("\n", "\r\n"))
+
+    def test_file_ending_at_closing_delimiter(self):
+        for text in ("---\ntitle: x\n---", "---\r\ntitle: x\r\n---", "---\ntitle: x\n---\n"):
+            with self.subTest(text=text):
+                self.assertRoundTrip(text)
+
+    def test_no_frontmatter(self):
+        for text in ("Pas d'en-tête\n", "---\ntitle: x\n", ""):
+            with self.subTest(text=text):
+                fm, body = front_matter.split(text)
+                self.assertFalse(fm.present)
+                self.assertEqual(body, text)
+                self.assertRoundTrip(text)
+
+    def test_edit_only_touches_its_key(self):
+        fm, body = front_matter.split(PAGE.replace("\n", "\r\n"))
+        self.assertTrue(fm.set("draft", True))
+        self.assertEqual(fm.render() + body, PAGE.replace("draft: false", "draft: true").replace("\n", "\r\n"))
+
+    def test_set_block_list_replaces_indented_lines(self):
+        fm, _ = front_matter.split(PAGE)
+        self.assertFalse(fm.set("tags", ["FTP", "PCAP"]))
+        self.assertTrue(fm.set("tags", ["FTP"]))
+        self.assertEqual(fm.raw("tags"), '["FTP"]')
+        self.assertEqual(fm.get("params"), None)
+        self.assertIn("  nested: 'oui'", fm.lines)
+
+
+class SetValueTest(unittest.TestCase):
+    def reparse(self, value):
+        fm, _ = front_matter.split("---\ntitle: x\n---\n")
+        fm.set("value", value)
+        fm, _ = front_matter.split(fm.render())
+        return fm.raw("value"), fm.get("value")
+
+    def test_strings_that_look_like_other_types_stay_strings(self):
+        for text in ("42", "-7", "1.5", "1.", "1e5", "12:30", "0x1F", "0o17", "017", ".inf", "-.nan",
+                     "2024-01-01", "2024-01-01T10:00:00Z", "true", "no", "null", "~", "", " x", "x ",
+                     "a: b", "a #b", "#x", "- x", "[x]", "'x'", '"x"', "*x", "&x", "!x", "|", ">"):
+            with self.subTest(text=text):
+                raw, value = self.reparse(text)
+                self.assertEqual(value, text)
+                self.assertTrue(raw.startswith('"'), raw)
+
+    def test_plain_strings_stay_unquoted(self):
+        for text in ("FTP", "Très facile", "C'est ça", "a:b", "a#b", "v1.2.3"):
+            with self.subTest(text=text):
+                self.assertEqual(self.reparse(text), (text, text))
+
+    def test_typed_values(self):
+        for value, raw in ((12, "12"), (1.5, "1.5"), (True, "true"), (None, "null"),
+                           (date(2024, 1, 1), "2024-01-01"), (["a", 1], '["a", 1]')):
+            with self.subTest(value=value):
+                self.assertEqual(self.reparse(value), (raw, value))
+
+    def test_unchanged_value_keeps_original_line(self):
+        fm, _ = front_matter.split("---\nid: '42'\nn: 0012\n---\n")
+        self.assertFalse(fm.set("id", "42"))
+        self.assertFalse(fm.set("n", 12))
+        self.assertFalse(fm.changed)
+        self.assertEqual(fm.lines, ["id: '42'", "n: 0012"])
+
+
+class PagesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+
+    def page(self, name, text):
+        path = self.dir / name
+        path.write_bytes(text.encode("utf-8"))
+        return path
+
+
+class ReadTest(PagesTest):
+    def test_read_matches_split(self):
+        for name, text in (("lf.md", PAGE), ("crlf.md", PAGE.replace("\n", "\r\n")), ("eof.md", "---\na: 1\n---")):
+            with self.subTest(name=name):
+                fm = front_matter.read(self.page(name, text))
+                expected, _ = front_matter.split(text)
+                self.assertEqual(fm.render(), expected.render())
+                self.assertEqual(fm.closing, expected.closing)
+
+    def test_read_lead(self):
+        path = self.page("page.md", PAGE)
+        self.assertEqual(front_matter.read(path).lead, "")
+        self.assertEqual(front_matter.read(path, lead=8).lead, "\nCorps d")
+        self.assertEqual(front_matter.read(path, lead=1000).lead, "\nCorps de la page.\n")
+
+    def test_read_lead_without_frontmatter(self):
+        path = self.page("plain.md", "Pas d'en-tête ici\n")
+        fm = front_matter.read(path, lead=6)
+        self.assertFalse(fm.present)
+        self.assertEqual(fm.lead, "Pas d'")
+
+    def test_write_only_when_changed(self):
+        path = self.page("crlf.md", PAGE.replace("\n", "\r\n"))
+        fm = front_matter.read(path)
+        self.assertFalse(front_matter.write(path, fm))
+        fm.set("rootme_id", 43)
+        self.assertTrue(front_matter.write(path, fm))
+        self.assertEqual(path.read_bytes().decode("utf-8"),
+                         PAGE.replace("rootme_id: 42  # identifiant Root-Me", "rootme_id: 43").replace("\n", "\r\n"))
+        self.assertEqual([p.name for p in self.dir.iterdir()], ["crlf.md"])
+
+
+class BatchTest(PagesTest):
+    def test_one_pass_per_file(self):
+        path = self.page("page.md", PAGE)
+        batch = front_matter.Batch()
+        batch.set(path, "draft", True)
+        batch.set_raw(path, "lastmod", "2024-02-01", after="date")
+        batch.edit(path, lambda fm: fm.remove("params") and ["params"])
+        self.assertEqual(len(batch), 1)
+
+        result = batch.apply()
+        self.assertEqual(result.written, {path: ["draft", "lastmod", "params"]})
+        self.assertEqual(len(batch), 0)
+        text = path.read_text(encoding="utf-8")
+        self.assertIn("date: 2024-01-01\nlastmod: 2024-02-01\n", text)
+        self.assertNotIn("nested", text)
+        self.assertTrue(text.endswith("---\n\nCorps de la page.\n"))
+        self.assertEqual([p.name for p in self.dir.iterdir()], ["page.md"])
+
+    def test_unchanged_file_is_not_rewritten(self):
+        path = self.page("crlf.md", PAGE.replace("\n", "\r\n"))
+        before = path.stat().st_mtime_ns
+        batch = front_matter.Batch()
+        batch.set(path, "rootme_id", 42)
+        batch.set(path, "draft", True)
+        batch.set(path, "draft", False)
+
+        result = batch.apply()
+        self.assertEqual(result.written, {})
+        self.assertEqual(result.unchanged, [path])
+        self.assertEqual(path.stat().st_mtime_ns, before)
+        self.assertEqual(path.read_bytes(), PAGE.replace("\n", "\r\n").encode("utf-8"))
+
+    def test_dry_run_reports_without_writing(self):
+        path = self.page("page.md", PAGE)
+        batch = front_matter.Batch()
+        batch.set(path, "draft", True)
+        result = batch.apply(dry_run=True)
+        self.assertEqual(result.written, {path: ["draft"]})
+        self.assertEqual(path.read_text(encoding="utf-8"), PAGE)
+
+    def test_missing_and_error_files(self):
+        good = self.page("good.md", PAGE)
+        plain = self.page("plain.md", "Pas d'en-tête\n")
+        broken = self.page("broken.md", PAGE)
+        missing = self.dir / "absent.md"
+
+        def fail(fm):
+            raise ValueError("valeur invalide")
+
+        batch = front_matter.Batch()
+        batch.set(missing, "draft", True)
+        batch.set(plain, "draft", True)
+        batch.set(broken, "draft", True)
+        batch.edit(broken, fail)
+        batch.set(good, "draft", True)
+
+        result = batch.apply()
+        self.assertEqual(result.missing, [missing])
+        self.assertEqual(result.errors, {plain: "pas de frontmatter", broken: "valeur invalide"})
+        self.assertEqual(result.written, {good: ["draft"]})
+        self.assertEqual(broken.read_text(encoding="utf-8"), PAGE)
+        self.assertEqual(plain.read_text(encoding="utf-8"), "Pas d'en-tête\n")
+
+        lines = result.lines(root=self.dir)
+        self.assertEqual(lines[0], "📝 Frontmatter : 1 fichier(s) réécrit(s), 0 inchangé(s), 1 absent(s), 2 erreur(s)")
+        self.assertIn("   ✏️  good.md (draft)", lines)
+        self.assertIn("   ❌ broken.md : valeur invalide", lines)
+
+
+if __name__ == "__main__":
+    unittest.main()
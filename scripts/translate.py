@@ -5,137 +5,606 @@ using AI (OpenAI/DeepL/Google Translate).
 
 Usage:
     python3 translate.py                    # Translate all content
-    python3 translate.py --dry-run          # Show what would be translated
+    python3 translate.py --dry-run          # Plan segments/requests/cost per provider
     python3 translate.py --file path/to.md  # Translate specific file
     python3 translate.py --provider deepl   # Use DeepL instead of OpenAI
+    python3 translate.py --restart          # Drop the checkpoint log of an interrupted run
 """
 
 import os
 import sys
 import re
 import argparse
+import json
+import time
+import random
+import hashlib
 from pathlib import Path
 
+import front_matter
+
 # Content directory relative to this script
 CONTENT_DIR = Path(__file__).parent.parent / "content"
+# Checkpoint log of the current translation job (resumable runs)
+JOB_FILE = Path(__file__).parent.parent / ".translate" / "job.json"
+
+# Default per-provider quotas: characters per minute, requests per second
+PROVIDER_QUOTAS = {
+    "openai": {"chars_per_minute": 150000, "requests_per_second": 3.0},
+    "deepl": {"chars_per_minute": 100000, "requests_per_second": 5.0},
+    "google": {"chars_per_minute": 60000, "requests_per_second": 2.0},
+}
+# Rough seconds per request and USD per million characters, used by the --dry-run
+# planner when no latency has been measured yet
+PROVIDER_LATENCY = {"openai": 6.0, "deepl": 1.5, "google": 1.0}
+PROVIDER_COST_PER_MILLION_CHARS = {"openai": 0.2, "deepl": 25.0, "google": 0.0}
+
+def parse_frontmatter(content: str) -> tuple[front_matter.Frontmatter, str]:
+    """Split markdown content into its frontmatter header and stripped body."""
+    frontmatter, body = front_matter.split(content)
+    return frontmatter, body.strip()
 
-def parse_frontmatter(content: str) -> tuple[dict, str]:
-    """Parse YAML frontmatter and body from markdown content."""
-    if not content.startswith("---"):
-        return {}, content
-    
-    parts = content.split("---", 2)
-    if len(parts) < 3:
-        return {}, content
-    
-    frontmatter_text = parts[1].strip()
-    body = parts[2].strip()
-    
-    # Simple YAML parsing
-    frontmatter = {}
-    for line in frontmatter_text.split("\n"):
-        if ":" in line:
-            key, value = line.split(":", 1)
-            key = key.strip()
-            value = value.strip().strip('"').strip("'")
-            # Handle arrays
-            if value.startswith("["):
-                value = value
-            frontmatter[key] = value
-    
-    return frontmatter, body
-
-def rebuild_markdown(frontmatter: dict, body: str, original_content: str) -> str:
-    """Rebuild markdown file preserving original frontmatter format."""
-    # Extract original frontmatter section
-    parts = original_content.split("---", 2)
-    if len(parts) < 3:
+def rebuild_markdown(frontmatter: front_matter.Frontmatter, body: str) -> str:
+    """Rebuild a markdown file, keeping the source frontmatter byte for byte."""
+    if not frontmatter.present:
         return body
-    
-    original_fm = parts[1]
-    return f"---{original_fm}---\n\n{body}"
+    return f"{frontmatter.render()}\n{body}"
 
-def translate_with_openai(text: str, api_key: str) -> str:
-    """Translate text using OpenAI GPT-4."""
-    try:
-        import openai
-        client = openai.OpenAI(api_key=api_key)
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are a professional translator specializing in technical content.
+SYSTEM_PROMPT = """You are a professional translator specializing in technical content.
 Translate the following French markdown content to English.
 - Keep all markdown formatting intact (headers, code blocks, links, images)
 - Do NOT translate code within code blocks
 - Keep technical terms accurate
 - Maintain the same tone and style
 - Return ONLY the translated text, no explanations"""
-                },
+
+BATCH_PROMPT = """The user message is a JSON array of French markdown segments.
+Translate every segment and return ONLY a JSON array of the translated strings,
+in the same order and with exactly the same number of items."""
+
+CODE_FENCE = re.compile(r"^(```|~~~)")
+# Paragraphs made only of a Hugo shortcode or a horizontal rule
+VERBATIM_SEGMENT = re.compile(r"^\s*(\{\{[<%].*[>%]\}\}|-{3,}|\*{3,})\s*$", re.DOTALL)
+
+
+def segment_markdown(body: str) -> list[tuple[str, bool]]:
+    """Split a markdown body into (segment, translatable) pairs.
+
+    Segments are blank-line separated paragraphs. Fenced code blocks, lone
+    shortcodes and rules are kept whole and flagged as non-translatable so
+    they never reach a provider.
+    """
+    segments = []
+    current = []
+    fence = None
+    for line in body.split("\n"):
+        m = CODE_FENCE.match(line.strip())
+        if fence:
+            current.append(line)
+            if m and line.strip().startswith(fence):
+                segments.append(("\n".join(current), False))
+                current = []
+                fence = None
+            continue
+        if m:
+            if current:
+                text = "\n".join(current)
+                segments.append((text, not VERBATIM_SEGMENT.match(text)))
+            current = [line]
+            fence = m.group(1)
+            continue
+        if not line.strip():
+            if current:
+                text = "\n".join(current)
+                segments.append((text, not VERBATIM_SEGMENT.match(text)))
+                current = []
+            continue
+        current.append(line)
+    if current:
+        # Unterminated fence: keep it verbatim as well
+        text = "\n".join(current)
+        segments.append((text, fence is None and not VERBATIM_SEGMENT.match(text)))
+    return segments
+
+
+def pack_segments(texts: list[str], max_chars: int, max_items: int) -> list[list[int]]:
+    """Group segment indexes into requests bounded by size and item count."""
+    batches = []
+    current = []
+    size = 0
+    for i, text in enumerate(texts):
+        if current and (size + len(text) + 2 > max_chars or len(current) >= max_items):
+            batches.append(current)
+            current = []
+            size = 0
+        current.append(i)
+        size += len(text) + 2
+    if current:
+        batches.append(current)
+    return batches
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+TRANSIENT_ERROR = re.compile(r"429|too many|rate.?limit|timed? ?out|temporar|unavailable|50[234]|connection", re.IGNORECASE)
+# Account quota used up (DeepL QuotaExceededException, OpenAI insufficient_quota): retrying cannot help
+QUOTA_EXHAUSTED_ERROR = re.compile(r"quota.?exceeded|insufficient.?quota|character limit", re.IGNORECASE)
+
+
+class QuotaExhausted(Exception):
+    """The provider account is out of quota; the run must stop and keep its checkpoint."""
+
+
+class SplitBatch(Exception):
+    """A batch came back in the wrong shape; its segments must be requested one by one."""
+
+
+def is_quota_exhausted(error: Exception) -> bool:
+    return bool(QUOTA_EXHAUSTED_ERROR.search(f"{type(error).__name__} {error}"))
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Rate limits and network failures are worth retrying; anything else is not."""
+    if isinstance(error, (SplitBatch, QuotaExhausted)) or is_quota_exhausted(error):
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return bool(TRANSIENT_ERROR.search(f"{type(error).__name__} {error}"))
+
+
+def retry_after_seconds(error: Exception):
+    """Server-requested delay: `retry_after` attribute, else the Retry-After header of `error.response`."""
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        if headers is not None:
+            value = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    return seconds if seconds > 0 else None
+
+
+class QuotaScheduler:
+    """Token buckets for characters/minute and requests/second, with adaptive backoff.
+
+    Every request waits until both buckets can pay for it. A transient error
+    halves the effective rate and sleeps with exponential backoff (or the
+    server's Retry-After); successes slowly bring the rate back.
+    """
+
+    def __init__(self, chars_per_minute: float, requests_per_second: float,
+                 max_retries: int = 5, backoff_base: float = 2.0):
+        self.chars_per_minute = chars_per_minute
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.slowdown = 1.0
+        self.char_tokens = chars_per_minute
+        self.request_tokens = max(1.0, requests_per_second)
+        self.last_refill = time.monotonic()
+        self.waited = 0.0
+        self.backoff_slept = 0.0
+        self.retries = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.char_tokens = min(self.chars_per_minute,
+                               self.char_tokens + elapsed * self.chars_per_minute / 60 / self.slowdown)
+        self.request_tokens = min(max(1.0, self.requests_per_second),
+                                  self.request_tokens + elapsed * self.requests_per_second / self.slowdown)
+
+    def acquire(self, chars: int):
+        """Block until the quota allows a request of `chars` characters."""
+        # A single oversized request may use the whole bucket but no more
+        chars = min(chars, self.chars_per_minute)
+        while True:
+            self._refill()
+            if self.char_tokens >= chars and self.request_tokens >= 1:
+                self.char_tokens -= chars
+                self.request_tokens -= 1
+                return
+            wait_chars = (chars - self.char_tokens) * 60 / self.chars_per_minute * self.slowdown
+            wait_requests = (1 - self.request_tokens) / self.requests_per_second * self.slowdown
+            wait = max(wait_chars, wait_requests, 0.01)
+            self.waited += wait
+            time.sleep(wait)
+
+    def run(self, func, chars: int):
+        """Call `func()` within quota, retrying transient errors with backoff."""
+        for attempt in range(self.max_retries + 1):
+            self.acquire(chars)
+            try:
+                result = func()
+            except Exception as e:
+                if is_quota_exhausted(e):
+                    raise QuotaExhausted(f"{type(e).__name__}: {e}") from e
+                if attempt >= self.max_retries or not is_transient_error(e):
+                    raise
+                self.slowdown = min(self.slowdown * 2, 32.0)
+                retry_after = retry_after_seconds(e)
+                if retry_after:
+                    wait = retry_after
+                else:
+                    wait = self.backoff_base * (2 ** attempt) + random.uniform(0.2, 0.8)
+                print(f"  ⏳ {type(e).__name__}: retry {attempt + 1}/{self.max_retries} in {wait:.1f}s")
+                self.retries += 1
+                self.backoff_slept += wait
+                time.sleep(wait)
+                continue
+            self.slowdown = max(1.0, self.slowdown * 0.8)
+            return result
+
+
+class TranslationJob:
+    """Checkpoint log of a translation run.
+
+    Completed segments are stored by content hash (per provider) and files by
+    source hash, so rerunning after a failure skips everything already done.
+    The log is rewritten atomically after every request.
+    """
+
+    def __init__(self, path: Path, provider: str):
+        self.path = path
+        self.provider = provider
+        self.data = {"files": {}, "segments": {}}
+        if path.exists():
+            try:
+                self.data = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                print(f"⚠️  Unreadable job log {path}, starting a new job")
+        self.data.setdefault("files", {})
+        self.segments = self.data.setdefault("segments", {}).setdefault(provider, {})
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def cached(self, text: str):
+        return self.segments.get(text_hash(text))
+
+    def cache_for(self, provider: str) -> dict:
+        return self.data["segments"].get(provider, {})
+
+    def record_latency(self, provider: str, seconds: float):
+        if seconds > 0:
+            self.data.setdefault("latency", {})[provider] = round(seconds, 3)
+            self.save()
+
+    def latency_for(self, provider: str) -> float:
+        return self.data.get("latency", {}).get(provider) or PROVIDER_LATENCY[provider]
+
+    def record(self, texts: list[str], translated: list[str]):
+        for text, result in zip(texts, translated):
+            self.segments[text_hash(text)] = result
+        self.save()
+
+    def file_done(self, key: str, source_hash: str) -> bool:
+        entry = self.data["files"].get(key)
+        return bool(entry) and entry.get("status") == "done" and entry.get("source") == source_hash
+
+    def mark_file(self, key: str, source_hash: str, status: str):
+        self.data["files"][key] = {"source": source_hash, "status": status, "provider": self.provider}
+        self.save()
+
+    def pending_files(self) -> list[str]:
+        return [k for k, v in self.data["files"].items() if v.get("status") != "done"]
+
+    def finish(self):
+        """Close the job once every file succeeded; the segment cache is kept."""
+        if not self.pending_files():
+            self.data["files"] = {}
+            self.save()
+
+
+class TranslationProvider:
+    """Long-lived translation client with batching and per-call latency metrics.
+
+    Subclasses create their client once (lazily) and implement
+    `_translate_request`, which receives a list of segments and must return
+    the translated list in the same order, or raise SplitBatch so that each
+    segment is scheduled as its own request.
+    """
+
+    name = "base"
+    max_chars = 4500
+    max_items = 50
+
+    def __init__(self, api_key: str = None, scheduler: QuotaScheduler = None):
+        self.api_key = api_key
+        self.scheduler = scheduler
+        self._client = None
+        self.calls = []
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self):
+        raise NotImplementedError
+
+    def _translate_request(self, texts: list[str]) -> list[str]:
+        raise NotImplementedError
+
+    def translate_batch(self, texts: list[str], on_batch=None) -> list[str]:
+        """Translate many segments, packing them into as few requests as possible.
+
+        `on_batch(chunk, translated)` is called after every request so callers
+        can checkpoint progress.
+        """
+        results = [None] * len(texts)
+        for batch in pack_segments(texts, self.max_chars, self.max_items):
+            chunk = [texts[i] for i in batch]
+            try:
+                requests = [(batch, self._scheduled_request(chunk))]
+            except SplitBatch as e:
+                # Each fallback call takes its own quota slot, is retried and checkpointed on its own
+                print(f"  ↪️  {e}: {len(chunk)} single-segment requests")
+                requests = (([i], self._scheduled_request([texts[i]])) for i in batch)
+            for indices, translated in requests:
+                if on_batch:
+                    on_batch([texts[i] for i in indices], translated)
+                for i, text in zip(indices, translated):
+                    results[i] = text
+        return results
+
+    def _scheduled_request(self, texts: list[str]) -> list[str]:
+        if self.scheduler:
+            return self.scheduler.run(lambda: self._timed_request(texts), sum(len(t) for t in texts))
+        return self._timed_request(texts)
+
+    def _timed_request(self, texts: list[str]) -> list[str]:
+        start = time.perf_counter()
+        ok = False
+        try:
+            translated = self._translate_request(texts)
+            if len(translated) != len(texts):
+                raise ValueError(f"{self.name} returned {len(translated)} segments for {len(texts)}")
+            ok = True
+            return translated
+        finally:
+            self.calls.append({
+                "segments": len(texts),
+                "chars": sum(len(t) for t in texts),
+                "seconds": time.perf_counter() - start,
+                "ok": ok,
+            })
+
+    def translate(self, body: str, job: TranslationJob = None) -> str:
+        """Translate a markdown body, leaving fenced code blocks untouched.
+
+        With a job, segments already checkpointed are reused and new ones are
+        recorded as soon as their request completes.
+        """
+        segments = segment_markdown(body)
+        parts = [text for text, _ in segments]
+        todo = []
+        for i, (text, translatable) in enumerate(segments):
+            if not translatable:
+                continue
+            cached = job.cached(text) if job else None
+            if cached is not None:
+                parts[i] = cached
+            else:
+                todo.append(i)
+        translated = self.translate_batch([segments[i][0] for i in todo], on_batch=job.record if job else None)
+        for i, text in zip(todo, translated):
+            parts[i] = text
+        return "\n\n".join(parts)
+
+    def stats(self) -> dict:
+        latencies = [c["seconds"] for c in self.calls]
+        return {
+            "provider": self.name,
+            "requests": len(self.calls),
+            "failed": sum(1 for c in self.calls if not c["ok"]),
+            "segments": sum(c["segments"] for c in self.calls),
+            "chars": sum(c["chars"] for c in self.calls),
+            "total_s": sum(latencies),
+            "p50_s": percentile(latencies, 50),
+            "p95_s": percentile(latencies, 95),
+            "max_s": max(latencies, default=0.0),
+        }
+
+
+class OpenAIProvider(TranslationProvider):
+    """OpenAI GPT-4o-mini; segments are sent as one JSON array per request."""
+
+    name = "openai"
+    max_chars = 12000
+    max_items = 40
+
+    def _create_client(self):
+        try:
+            import openai
+        except ImportError:
+            print("Error: openai package not installed. Run: pip install openai")
+            sys.exit(1)
+        return openai.OpenAI(api_key=self.api_key)
+
+    def _complete(self, system: str, text: str) -> str:
+        response = self.client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": system},
                 {"role": "user", "content": text}
             ],
             temperature=0.3
         )
         return response.choices[0].message.content
-    except ImportError:
-        print("Error: openai package not installed. Run: pip install openai")
-        sys.exit(1)
 
-def translate_with_deepl(text: str, api_key: str) -> str:
-    """Translate text using DeepL API."""
-    try:
-        import deepl
-        translator = deepl.Translator(api_key)
-        result = translator.translate_text(text, source_lang="FR", target_lang="EN-US")
-        return result.text
-    except ImportError:
-        print("Error: deepl package not installed. Run: pip install deepl")
-        sys.exit(1)
+    def _translate_request(self, texts: list[str]) -> list[str]:
+        if len(texts) == 1:
+            return [self._complete(SYSTEM_PROMPT, texts[0])]
+        raw = self._complete(SYSTEM_PROMPT + "\n\n" + BATCH_PROMPT, json.dumps(texts, ensure_ascii=False))
+        try:
+            translated = json.loads(raw.strip().removeprefix("```json").strip("`\n "))
+        except ValueError:
+            translated = None
+        if isinstance(translated, list) and len(translated) == len(texts):
+            return [str(t) for t in translated]
+        # The model did not keep the array shape: fall back to one call per segment
+        raise SplitBatch(f"{self.name} did not return a {len(texts)}-item array")
+
+
+class DeepLProvider(TranslationProvider):
+    """DeepL API; `translate_text` accepts a list, so each request carries many segments."""
+
+    name = "deepl"
+    max_chars = 100000
+    max_items = 50
+
+    def _create_client(self):
+        try:
+            import deepl
+        except ImportError:
+            print("Error: deepl package not installed. Run: pip install deepl")
+            sys.exit(1)
+        return deepl.Translator(self.api_key)
+
+    def _translate_request(self, texts: list[str]) -> list[str]:
+        results = self.client.translate_text(texts, source_lang="FR", target_lang="EN-US")
+        return [r.text for r in results]
+
+
+class GoogleProvider(TranslationProvider):
+    """Google Translate through deep-translator (free, no API key needed).
+
+    The endpoint takes a single text of at most 5000 characters, so segments
+    are joined by blank lines into one request and split back afterwards.
+    """
+
+    name = "google"
+    max_chars = 4500
+    max_items = 100
+
+    def _create_client(self):
+        try:
+            from deep_translator import GoogleTranslator
+        except ImportError:
+            print("Error: deep-translator package not installed. Run: pip install deep-translator")
+            sys.exit(1)
+        return GoogleTranslator(source='fr', target='en')
+
+    def _translate_request(self, texts: list[str]) -> list[str]:
+        if len(texts) == 1:
+            return [self.client.translate(texts[0])]
+        if not any("\n\n" in t for t in texts):
+            translated = self.client.translate("\n\n".join(texts))
+            parts = [p for p in re.split(r"\n\s*\n", translated or "")]
+            if len(parts) == len(texts):
+                return parts
+        # Paragraph boundaries were not preserved: one request per segment
+        raise SplitBatch(f"{self.name} did not keep the {len(texts)} paragraph boundaries")
 
-def translate_with_google(text: str, api_key: str = None) -> str:
-    """Translate text using Google Translate (free, no API key needed).
-    Uses deep-translator library which is compatible with modern Python."""
-    try:
-        from deep_translator import GoogleTranslator
-        
-        # deep-translator has a 5000 char limit per request, so we split long texts
-        max_chars = 4500
-        if len(text) <= max_chars:
-            return GoogleTranslator(source='fr', target='en').translate(text)
-        
-        # Split by paragraphs for long texts
-        paragraphs = text.split('\n\n')
-        translated_parts = []
-        current_chunk = ""
-        
-        for para in paragraphs:
-            if len(current_chunk) + len(para) + 2 <= max_chars:
-                current_chunk += para + '\n\n'
-            else:
-                if current_chunk:
-                    translated = GoogleTranslator(source='fr', target='en').translate(current_chunk.strip())
-                    translated_parts.append(translated)
-                current_chunk = para + '\n\n'
-        
-        if current_chunk:
-            translated = GoogleTranslator(source='fr', target='en').translate(current_chunk.strip())
-            translated_parts.append(translated)
-        
-        return '\n\n'.join(translated_parts)
-    except ImportError:
-        print("Error: deep-translator package not installed. Run: pip install deep-translator")
-        sys.exit(1)
 
-def get_translator(provider: str):
-    """Get the appropriate translation function."""
-    translators = {
-        "openai": translate_with_openai,
-        "deepl": translate_with_deepl,
-        "google": translate_with_google
+PROVIDERS = {
+    "openai": OpenAIProvider,
+    "deepl": DeepLProvider,
+    "google": GoogleProvider,
+}
+
+
+def get_provider(provider: str, api_key: str = None, scheduler: QuotaScheduler = None) -> TranslationProvider:
+    """Instantiate the provider once per run so its client is reused across files."""
+    return PROVIDERS.get(provider, OpenAIProvider)(api_key, scheduler)
+
+
+def print_provider_stats(provider: TranslationProvider):
+    s = provider.stats()
+    if not s["requests"]:
+        return
+    print(f"\n⏱️  {s['provider']}: {s['requests']} requests ({s['failed']} failed), "
+          f"{s['segments']} segments, {s['chars']} chars")
+    print(f"   latency total {s['total_s']:.2f}s | p50 {s['p50_s']:.2f}s | "
+          f"p95 {s['p95_s']:.2f}s | max {s['max_s']:.2f}s")
+    if provider.scheduler:
+        sched = provider.scheduler
+        print(f"   quota wait {sched.waited:.1f}s | {sched.retries} retries, backoff {sched.backoff_slept:.1f}s")
+
+def english_path(file_path: Path) -> Path:
+    if file_path.name == "index.md":
+        return file_path.parent / "index.en.md"
+    return file_path.with_name(file_path.stem + ".en.md")
+
+
+def plan_body(body: str, provider_cls, cache: dict) -> dict:
+    """Run the real segmenter and packer for one provider without calling it."""
+    texts = [text for text, translatable in segment_markdown(body) if translatable]
+    todo = [t for t in texts if text_hash(t) not in cache]
+    return {
+        "segments": len(texts),
+        "cached": len(texts) - len(todo),
+        "requests": len(pack_segments(todo, provider_cls.max_chars, provider_cls.max_items)),
+        "chars": sum(len(t) for t in todo),
     }
-    return translators.get(provider, translate_with_openai)
+
+
+def effective_quota(provider: str, chars_per_minute: float = None,
+                    requests_per_second: float = None) -> dict:
+    """Provider quota with the --chars-per-minute / --requests-per-second overrides applied."""
+    quota = PROVIDER_QUOTAS[provider]
+    return {
+        "chars_per_minute": chars_per_minute or quota["chars_per_minute"],
+        "requests_per_second": requests_per_second or quota["requests_per_second"],
+    }
+
+
+def estimate_wall_time(plan: dict, quota: dict, latency: float, concurrency: int) -> float:
+    """Wall time is bounded by request latency and by the provider quotas."""
+    latency_bound = plan["requests"] * latency / max(1, concurrency)
+    chars_bound = plan["chars"] * 60 / quota["chars_per_minute"]
+    requests_bound = plan["requests"] / quota["requests_per_second"]
+    return max(latency_bound, chars_bound, requests_bound)
+
+
+def plan_translation(files: list[Path], job: TranslationJob, concurrency: int = 1,
+                     quotas: dict = None):
+    """Print per file and total segments/requests/characters for every provider.
+
+    `quotas` maps provider names to effective quotas (defaults to PROVIDER_QUOTAS).
+    """
+    quotas = {**PROVIDER_QUOTAS, **(quotas or {})}
+    totals = {name: {"segments": 0, "cached": 0, "requests": 0, "chars": 0} for name in PROVIDERS}
+    for file_path in files:
+        print(f"📄 {file_path.relative_to(CONTENT_DIR)}")
+        _, body = parse_frontmatter(file_path.read_text(encoding="utf-8"))
+        if not body.strip():
+            print("  ⏭️  No content to translate")
+            continue
+        print(f"  📝 Would create: {english_path(file_path).relative_to(CONTENT_DIR)}")
+        for name, provider_cls in PROVIDERS.items():
+            plan = plan_body(body, provider_cls, job.cache_for(name))
+            for k, v in plan.items():
+                totals[name][k] += v
+            print(f"  {name:<7} {plan['segments']:>4} segments ({plan['cached']} cached) | "
+                  f"{plan['requests']:>3} requests | {plan['chars']:>6} chars")
+
+    print(f"\n📊 Plan ({len(files)} files, concurrency {concurrency})")
+    print(f"   {'provider':<8} {'segments':>8} {'cached':>7} {'requests':>8} {'chars':>8} {'wall time':>10} {'cost':>8}")
+    for name, plan in totals.items():
+        wall = estimate_wall_time(plan, quotas[name], job.latency_for(name), concurrency)
+        cost = plan["chars"] / 1_000_000 * PROVIDER_COST_PER_MILLION_CHARS[name]
+        print(f"   {name:<8} {plan['segments']:>8} {plan['cached']:>7} {plan['requests']:>8} "
+              f"{plan['chars']:>8} {wall:>9.1f}s {cost:>7.2f}$")
+
 
 def find_untranslated_files(force: bool = False) -> list[Path]:
     """Find all French markdown files without English translations (or all if force=True)."""
@@ -151,18 +620,15 @@ def find_untranslated_files(force: bool = False) -> list[Path]:
             continue
         
         # Check if English version exists
-        en_file = md_file.with_name(md_file.stem + ".en.md")
-        if md_file.name == "index.md":
-            en_file = md_file.parent / "index.en.md"
-        
-        if force or not en_file.exists():
+        if force or not english_path(md_file).exists():
             untranslated.append(md_file)
     
     return untranslated
 
-def translate_file(file_path: Path, provider: str, api_key: str, dry_run: bool = False) -> bool:
+def translate_file(file_path: Path, provider: TranslationProvider, job: TranslationJob = None) -> bool:
     """Translate a single markdown file."""
-    print(f"📄 Processing: {file_path.relative_to(CONTENT_DIR)}")
+    key = str(file_path.relative_to(CONTENT_DIR))
+    print(f"📄 Processing: {key}")
     
     content = file_path.read_text(encoding="utf-8")
     frontmatter, body = parse_frontmatter(content)
@@ -170,29 +636,34 @@ def translate_file(file_path: Path, provider: str, api_key: str, dry_run: bool =
     if not body.strip():
         print("  ⏭️  Skipping: No content to translate")
         return False
-    
-    # Determine output path
-    if file_path.name == "index.md":
-        en_file = file_path.parent / "index.en.md"
-    else:
-        en_file = file_path.with_name(file_path.stem + ".en.md")
-    
-    if dry_run:
-        print(f"  📝 Would create: {en_file.relative_to(CONTENT_DIR)}")
-        print(f"  📊 Content length: {len(body)} characters")
+
+    source_hash = text_hash(content)
+    if job and job.file_done(key, source_hash):
+        print("  ⏭️  Skipping: Already translated in this job")
         return True
     
+    en_file = english_path(file_path)
+    
     # Translate
-    translate_func = get_translator(provider)
     try:
-        translated_body = translate_func(body, api_key)
+        translated_body = provider.translate(body, job=job)
+    except QuotaExhausted:
+        if job:
+            job.mark_file(key, source_hash, "failed")
+            print(f"  💾 Completed segments checkpointed in {JOB_FILE.relative_to(CONTENT_DIR.parent)}")
+        raise
     except Exception as e:
         print(f"  ❌ Translation error: {e}")
+        if job:
+            job.mark_file(key, source_hash, "failed")
+            print(f"  💾 Completed segments checkpointed in {JOB_FILE.relative_to(CONTENT_DIR.parent)}")
         return False
     
     # Rebuild and save
-    translated_content = rebuild_markdown(frontmatter, translated_body, content)
+    translated_content = rebuild_markdown(frontmatter, translated_body)
     en_file.write_text(translated_content, encoding="utf-8")
+    if job:
+        job.mark_file(key, source_hash, "done")
     print(f"  ✅ Created: {en_file.relative_to(CONTENT_DIR)}")
     
     return True
@@ -204,6 +675,10 @@ def main():
     parser.add_argument("--force", action="store_true", help="Re-translate all files, even if English version exists")
     parser.add_argument("--provider", choices=["openai", "deepl", "google"], default="google", help="Translation provider (default: google - free & unlimited)")
     parser.add_argument("--api-key", type=str, help="API key (or set OPENAI_API_KEY/DEEPL_API_KEY env var)")
+    parser.add_argument("--restart", action="store_true", help="Discard the job checkpoint log and start from scratch")
+    parser.add_argument("--chars-per-minute", type=float, help="Override the provider character quota")
+    parser.add_argument("--requests-per-second", type=float, help="Override the provider request quota")
+    parser.add_argument("--concurrency", type=int, default=1, help="Parallel requests assumed by the --dry-run planner (default: 1, the translator is sequential)")
     
     args = parser.parse_args()
     
@@ -222,6 +697,10 @@ def main():
         print(f"❌ Error: No API key provided. Set {env_vars[args.provider]} or use --api-key")
         sys.exit(1)
     
+    if args.restart and JOB_FILE.exists() and not args.dry_run:
+        JOB_FILE.unlink()
+    job = TranslationJob(JOB_FILE, args.provider)
+    
     # Find files to translate
     if args.file:
         files = [Path(args.file)]
@@ -240,12 +719,28 @@ def main():
     else:
         print()
     
+    quota = effective_quota(args.provider, args.chars_per_minute, args.requests_per_second)
+    if args.dry_run:
+        plan_translation(files, job, args.concurrency, quotas={args.provider: quota})
+        return
+    
+    scheduler = QuotaScheduler(quota["chars_per_minute"], quota["requests_per_second"])
+    provider = get_provider(args.provider, api_key, scheduler)
     translated = 0
-    for file_path in files:
-        if translate_file(file_path, args.provider, api_key, args.dry_run):
-            translated += 1
+    try:
+        for file_path in files:
+            if translate_file(file_path, provider, job=job):
+                translated += 1
+    except QuotaExhausted as e:
+        print(f"  ❌ Provider quota exhausted, stopping: {e}")
     
-    print(f"\n{'📋 Would translate' if args.dry_run else '✅ Translated'}: {translated}/{len(files)} files")
+    print(f"\n✅ Translated: {translated}/{len(files)} files")
+    print_provider_stats(provider)
+    job.record_latency(args.provider, provider.stats()["p50_s"])
+    pending = job.pending_files()
+    if pending:
+        print(f"⚠️  {len(pending)} file(s) incomplete, rerun to resume: {', '.join(pending)}")
+    job.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file